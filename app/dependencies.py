@@ -1,8 +1,9 @@
 from loguru import logger
 from currencyexplorer import config
-from fastapi import HTTPException, status, Query, WebSocketException, Depends, Header
+from fastapi import HTTPException, status, Query, WebSocketException, Depends, Header, Request, WebSocket
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials, APIKeyHeader
 from app.scrapers import EXCHANGERS_MAPPING
+from app.utils.admission_control import admission_controller
 from currencyexplorer.core.exchangers_scraping import ExplorerPairInvalidFormatException
 
 
@@ -19,6 +20,20 @@ async def get_auth_api_token(credentials: HTTPAuthorizationCredentials = Depends
     return str(credentials.credentials)
 
 
+async def get_admin_auth_api_token(credentials: HTTPAuthorizationCredentials = Depends(api_key_header)):
+    """
+        FastAPI Depend for admin api token auth validation (HEADER)
+            Admin endpoint's are disabled if API_ADMIN_AUTHENTICATION_TOKEN not defined
+    """
+    if config.API_ADMIN_AUTHENTICATION_TOKEN is None:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail='admin api is disabled')
+    if credentials is None or str(credentials.credentials) != config.API_ADMIN_AUTHENTICATION_TOKEN:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail='could validate admin api key')
+    return str(credentials.credentials)
+
+
 async def validate_ws_auth_api_token(authorization: str | None = Header(...)):
     """
         FastAPI Depend for HEADER api token basic auth validation in WebSocket connection
@@ -31,6 +46,41 @@ async def validate_ws_auth_api_token(authorization: str | None = Header(...)):
     return param
 
 
+async def http_admission_control(request: Request):
+    """
+        FastAPI Depend for API requests admission control (see. AdmissionController)
+            503 while event loop is overloaded, 429 if too many concurrent requests of same client
+                (API token is shared by all clients, so client is identified by address and token)
+    """
+    client_key = "{} {}".format(
+        request.client.host if request.client is not None else "", request.headers.get("authorization", ""))
+    rejection_reason = admission_controller.admit_request(client_key)
+    if rejection_reason == "loop_lag":
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail='service is overloaded, try again later',
+            headers={"Retry-After": "1"})
+    if rejection_reason is not None:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail='too many concurrent requests',
+            headers={"Retry-After": "1"})
+    try:
+        yield
+    finally:
+        admission_controller.release_request(client_key)
+
+
+async def websocket_admission_control(websocket: WebSocket):
+    """
+        FastAPI Depend for WebSocket connections admission control (see. AdmissionController)
+    """
+    if admission_controller.admit_websocket() is not None:
+        raise WebSocketException(code=status.WS_1013_TRY_AGAIN_LATER)
+    try:
+        yield
+    finally:
+        admission_controller.release_websocket()
+
+
 async def get_query_currency_pair(
         pair: str | None = Query(default=None, example="USDT_BTC")) -> str | None:
     """ Extract and validate pair string from request param """
@@ -39,6 +89,32 @@ async def get_query_currency_pair(
     return ExplorerPairInvalidFormatException.explorer_pair_format_validator(pair)
 
 
+async def get_query_base_asset(
+        base: str | None = Query(default=None, example="USDT", description="Filter pairs by base asset")
+        ) -> str | None:
+    """ Extract and validate base asset (COIN1 of COIN1_COIN2 pair) from request param """
+    if base is None:
+        return
+    return validate_asset(base)
+
+
+async def get_query_quote_asset(
+        quote: str | None = Query(default=None, example="BTC", description="Filter pairs by quote asset")
+        ) -> str | None:
+    """ Extract and validate quote asset (COIN2 of COIN1_COIN2 pair) from request param """
+    if quote is None:
+        return
+    return validate_asset(quote)
+
+
+def validate_asset(asset: str) -> str:
+    if len(asset) == 0 or "_" in asset:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail='asset should be single coin name without "_"')
+    return str(asset).upper()
+
+
 async def get_query_exchange(
         exchange: str | None = Query(default=None, example="binance")) -> str | None:
     """ Extract and validate exchange uniq name from request param """
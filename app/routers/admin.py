@@ -0,0 +1,41 @@
+import asyncio
+from fastapi import Query, HTTPException, status
+from fastapi.responses import PlainTextResponse
+from app.utils.base_router import make_base_router
+from app.dependencies import get_admin_auth_api_token
+from currencyexplorer import config
+from currencyexplorer.core.monitoring import SamplingProfiler
+
+
+router = make_base_router(
+    "Admin", basic_auth=False, admission_control=False, prefix="/admin",
+    dependencies=[get_admin_auth_api_token])
+
+profiler_session_lock = asyncio.Lock()
+
+
+@router.get("/profiler", response_class=PlainTextResponse)
+async def run_sampling_profiler(
+        seconds: float = Query(default=10, gt=0),
+        sampling_interval: float = Query(default=0.005, ge=0.001, le=1)) -> PlainTextResponse:
+    """ Run sampling profiler against the live event loop for N seconds.
+            Returns profile in folded stacks format (flamegraph.pl/inferno/speedscope compatible)
+    """
+    if seconds > config.MAX_PROFILER_DURATION:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail='max aviable profiler duration is {} seconds'.format(config.MAX_PROFILER_DURATION))
+    if profiler_session_lock.locked():
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail='profiler session already running')
+    async with profiler_session_lock:
+        # Endpoint coroutine is executed in event loop thread, so profiler target is current thread
+        profiler = SamplingProfiler(sampling_interval=sampling_interval)
+        profiler.start()
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            await asyncio.get_running_loop().run_in_executor(None, profiler.stop)
+    return PlainTextResponse(
+        profiler.to_folded_stacks(),
+        headers={"X-Profiler-Samples": str(profiler.samples_count)})
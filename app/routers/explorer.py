@@ -1,14 +1,19 @@
 import traceback
 import asyncio
 import time
+from typing import Literal
 from websockets.exceptions import ConnectionClosed
 from loguru import logger
-from fastapi import WebSocket, Depends, WebSocketDisconnect, Query
+from fastapi import WebSocket, Depends, WebSocketDisconnect, Query, Response, HTTPException, status
 from app.utils.base_router import make_base_router
-from app.dependencies import get_query_currency_pair, get_query_exchange
-from app.schemas.explorer import GetExplorerInfoResponse
+from app.dependencies import (
+    get_query_currency_pair, get_query_exchange, get_query_base_asset, get_query_quote_asset)
+from app.schemas.explorer import GetExplorerInfoResponse, GetRateHistoryResponse, GetTopMoversResponse
 from app.utils.explorer import ScraperManagerGetter
-from currencyexplorer import config
+from app.utils.admission_control import admission_controller
+from currencyexplorer import config, rate_history, top_movers
+from currencyexplorer.core.exchangers_scraping import ExplorerPairInvalidFormatException
+from currencyexplorer.core.monitoring import WEBSOCKET_CONNECTIONS, WEBSOCKET_SEND_SECONDS, phase_span
 
 
 router = make_base_router("Currency Explorer")
@@ -18,9 +23,67 @@ ws_router = make_base_router("Currency Explorer Socket", basic_auth=False, ws_au
 @router.get("/currency")
 async def get_currency_info(
         exchange: str | None = Depends(get_query_exchange),
-        pair: str | None = Depends(get_query_currency_pair)) -> GetExplorerInfoResponse:
-    """ Get current currency rates from one or multiple exchanges """
-    return await ScraperManagerGetter(exchange=exchange, pair=pair).get()
+        pair: str | None = Depends(get_query_currency_pair),
+        base: str | None = Depends(get_query_base_asset),
+        quote: str | None = Depends(get_query_quote_asset)) -> GetExplorerInfoResponse:
+    """ Get current currency rates from one or multiple exchanges
+            (optional filters: exact pair, pairs with base asset and/or quote asset)
+    """
+    data = await ScraperManagerGetter(exchange=exchange, pair=pair, base=base, quote=quote).get()
+    with phase_span("serialize"):
+        return Response(content=data.model_dump_json(), media_type="application/json")
+
+
+@router.get("/currency/history")
+async def get_currency_history(
+        pair: str = Query(..., example="USDT_BTC"),
+        exchange: str | None = Depends(get_query_exchange),
+        resolution: float = Query(default=60, ge=1, le=86400, description="Bucket size in seconds"),
+        since: float | None = Query(default=None, description="Unix-time timestamp of history start"),
+        until: float | None = Query(default=None, description="Unix-time timestamp of history end")
+        ) -> GetRateHistoryResponse:
+    """ Get OHLC buckets of recent currency rates history from one or multiple exchanges """
+    if rate_history is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="rate history is disabled")
+    pair = ExplorerPairInvalidFormatException.explorer_pair_format_validator(pair)
+    exchanges = [exchange] if exchange is not None else rate_history.get_exchanges(pair)
+    candles_mapping = {}
+    for exchange_name in exchanges:
+        candles = rate_history.get_candles(exchange_name, pair, resolution, since=since, until=until)
+        if candles is not None:
+            candles_mapping[exchange_name] = candles
+    with phase_span("serialize"):
+        data = GetRateHistoryResponse.from_candles_mapping(pair, resolution, candles_mapping)
+        return Response(content=data.model_dump_json(), media_type="application/json")
+
+
+@router.get("/currency/top_movers")
+async def get_top_movers(
+        window: Literal["1m", "5m", "1h"] = Query(default="5m", description="Rate change window"),
+        limit: int = Query(default=10, ge=1, le=500, description="Count of pairs")) -> GetTopMoversResponse:
+    """ Get exchange pairs with biggest absolute rate change over window """
+    if top_movers is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="top movers leaderboard is disabled")
+    with phase_span("serialize"):
+        data = GetTopMoversResponse.from_top_movers(window, top_movers.top(window, limit=limit))
+        return Response(content=data.model_dump_json(), media_type="application/json")
+
+
+def get_websocket_frequency_timeout(frequency_timeout: float | None) -> float:
+    """ Limit requested WebSocket listener frequency timeout by config limits """
+    current_frequency_timeout = float(
+        config.DEFAULT_WEBSOCKET_UPDATER_FREQUENCY_TIMEOUT) if frequency_timeout is None else float(
+            frequency_timeout)
+    if current_frequency_timeout < config.MIN_WEBSOCKET_UPDATER_FREQUENCY_TIMEOUT:
+        current_frequency_timeout = float(config.MIN_WEBSOCKET_UPDATER_FREQUENCY_TIMEOUT)
+    elif current_frequency_timeout > config.MAX_WEBSOCKET_UPDATER_FREQUENCY_TIMEOUT:
+        current_frequency_timeout = float(config.MAX_WEBSOCKET_UPDATER_FREQUENCY_TIMEOUT)
+    return current_frequency_timeout
+
+
+def is_websocket_connection_timeout_reached(connected_timestamp: float) -> bool:
+    return config.WEBSOCKET_UPDATER_CONNECTION_TIMEOUT_LIMIT not in (0, None, ) and (
+        (time.time() - connected_timestamp) >= config.WEBSOCKET_UPDATER_CONNECTION_TIMEOUT_LIMIT)
 
 
 @ws_router.websocket("/currency_listener")
@@ -28,6 +91,8 @@ async def connect_to_currency_listener(
         websocket: WebSocket,
         exchange: str | None = Depends(get_query_exchange),
         pair: str | None = Depends(get_query_currency_pair),
+        base: str | None = Depends(get_query_base_asset),
+        quote: str | None = Depends(get_query_quote_asset),
         frequency_timeout: float | None = Query(...)) -> GetExplorerInfoResponse:
     """ WebSocket listener for currency one or multiple exchange rates
             Params works exactly like `get_currency_info` endpoint method
@@ -36,31 +101,70 @@ async def connect_to_currency_listener(
     connected_timestamp = time.time()
     
     # Limiter for frequency timeout
-    current_frequency_timeout = float(
-        config.DEFAULT_WEBSOCKET_UPDATER_FREQUENCY_TIMEOUT) if frequency_timeout is None else float(
-            frequency_timeout)
-    if current_frequency_timeout < config.MIN_WEBSOCKET_UPDATER_FREQUENCY_TIMEOUT:
-        current_frequency_timeout = float(config.MIN_WEBSOCKET_UPDATER_FREQUENCY_TIMEOUT)
-    elif current_frequency_timeout > config.MAX_WEBSOCKET_UPDATER_FREQUENCY_TIMEOUT:
-        current_frequency_timeout = float(config.MAX_WEBSOCKET_UPDATER_FREQUENCY_TIMEOUT)
+    current_frequency_timeout = get_websocket_frequency_timeout(frequency_timeout)
     
     logger.info("Accepted new websocket listener!")
-    response_getter = ScraperManagerGetter(exchange=exchange, pair=pair)
+    WEBSOCKET_CONNECTIONS.inc()
+    response_getter = ScraperManagerGetter(exchange=exchange, pair=pair, base=base, quote=quote)
     data = None
     try:
         while True:
-            if config.WEBSOCKET_UPDATER_CONNECTION_TIMEOUT_LIMIT not in (0, None, ) and (
-                    (time.time() - connected_timestamp
-                        ) >= config.WEBSOCKET_UPDATER_CONNECTION_TIMEOUT_LIMIT):
+            if is_websocket_connection_timeout_reached(connected_timestamp):
                 break
+            if admission_controller.is_overloaded:
+                # Updates are skipped while event loop is overloaded (ingestion has priority)
+                await asyncio.sleep(current_frequency_timeout)
+                continue
             try:
                 data = await response_getter.get()
             except Exception as e:
                 logger.error(traceback.format_exc())
             else:
-                await websocket.send_json(data.model_dump())
+                with WEBSOCKET_SEND_SECONDS.time():
+                    await websocket.send_json(data.model_dump())
+            await asyncio.sleep(current_frequency_timeout)
+    except (ConnectionClosed, WebSocketDisconnect):
+        pass
+    except Exception as e:
+        await websocket.close()
+    finally:
+        WEBSOCKET_CONNECTIONS.dec()
+
+
+@ws_router.websocket("/top_movers_listener")
+async def connect_to_top_movers_listener(
+        websocket: WebSocket,
+        window: Literal["1m", "5m", "1h"] = Query(default="5m"),
+        limit: int = Query(default=10, ge=1, le=500),
+        frequency_timeout: float | None = Query(default=None)) -> GetTopMoversResponse:
+    """ WebSocket listener for top movers leaderboard
+            Leaderboard is checked every frequency_timeout seconds, message is sent only if ranking changed
+                (params works exactly like `get_top_movers` endpoint method)
+    """
+    if top_movers is None:
+        await websocket.close()
+        return
+    await websocket.accept()
+    connected_timestamp = time.time()
+    current_frequency_timeout = get_websocket_frequency_timeout(frequency_timeout)
+    WEBSOCKET_CONNECTIONS.inc()
+    sent_ranking = None
+    try:
+        while not is_websocket_connection_timeout_reached(connected_timestamp):
+            if admission_controller.is_overloaded:
+                await asyncio.sleep(current_frequency_timeout)
+                continue
+            movers = top_movers.top(window, limit=limit)
+            ranking = [(mover.exchanger_uniq_name, mover.pair_title) for mover in movers]
+            if ranking != sent_ranking:
+                sent_ranking = ranking
+                with WEBSOCKET_SEND_SECONDS.time():
+                    await websocket.send_json(GetTopMoversResponse.from_top_movers(window, movers).model_dump())
             await asyncio.sleep(current_frequency_timeout)
     except (ConnectionClosed, WebSocketDisconnect):
         pass
     except Exception as e:
+        logger.error(traceback.format_exc())
         await websocket.close()
+    finally:
+        WEBSOCKET_CONNECTIONS.dec()
@@ -0,0 +1,15 @@
+from fastapi.responses import PlainTextResponse
+from app.utils.base_router import make_base_router
+from currencyexplorer.core.monitoring import metrics_registry
+
+
+router = make_base_router("Monitoring", admission_control=False)
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics() -> PlainTextResponse:
+    """ Application metrics in Prometheus text exposition format
+            (ingestion counters, storage latency, API fan-out stats)
+    """
+    return PlainTextResponse(
+        metrics_registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
@@ -1,9 +1,10 @@
 from fastapi import APIRouter, Depends
 from fastapi import Header, Body
-from currencyexplorer import config
+from currencyexplorer import config, scrapers_manager
 from app.utils.base_router import make_base_router
 from app.scrapers import EXCHANGERS_MAPPING
-from app.schemas.root import AviableExchangesResponse
+from app.schemas.root import (
+    AviableExchangesResponse, UpstreamRateLimitsResponse, UpstreamCircuitBreakersResponse)
 
 
 router = make_base_router("Root")
@@ -12,3 +13,15 @@ router = make_base_router("Root")
 @router.get("/aviable_exchanges")
 async def get_aviable_exchanges_list() -> AviableExchangesResponse:
     return AviableExchangesResponse(result=list(EXCHANGERS_MAPPING.keys()))
+
+
+@router.get("/rate_limits")
+async def get_upstream_rate_limits() -> UpstreamRateLimitsResponse:
+    """ Remaining upstream API request budget of each exchange """
+    return UpstreamRateLimitsResponse(result=scrapers_manager.get_rate_limits())
+
+
+@router.get("/circuit_breakers")
+async def get_upstream_circuit_breakers() -> UpstreamCircuitBreakersResponse:
+    """ Upstream circuit breaker state of each exchange (exchanges without upstream requests are not listed) """
+    return UpstreamCircuitBreakersResponse(result=scrapers_manager.get_circuit_breakers())
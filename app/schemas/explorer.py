@@ -1,4 +1,4 @@
-from typing import Optional, List
+from typing import Optional, List, Dict
 from currencyexplorer.core.exchangers_scraping import ScraperStorageBackendPairData
 from pydantic import BaseModel, Field
 
@@ -43,6 +43,7 @@ class GetExplorerInfoResponse(BaseModel):
             CLS, pair_data_list: List[ScraperStorageBackendPairData]) -> "GetExplorerInfoResponse":
         """
             Make explorer info response object from list of scrapers response object
+                Storage data is already validated, so response models are constructed without validation
         """
         result = []
         exchange_data_map = {}
@@ -50,7 +51,7 @@ class GetExplorerInfoResponse(BaseModel):
         # Group exchange data by currency pair
         for pair_data in pair_data_list:
             exchanges = exchange_data_map.setdefault(pair_data.currency_pair_title, [])
-            exchanges.append(ExplorerInfoExchangesNestedBlock(
+            exchanges.append(ExplorerInfoExchangesNestedBlock.model_construct(
                 exchange=pair_data.exchanger_uniq_name,
                 currency_rate=pair_data.currency_rate,
                 last_update_timestamp=pair_data.last_update
@@ -58,9 +59,75 @@ class GetExplorerInfoResponse(BaseModel):
 
         # Create ExplorerInfoPairsNestedBlock for each currency pair
         for pair_name, exchanges in exchange_data_map.items():
-            result.append(ExplorerInfoPairsNestedBlock(
+            result.append(ExplorerInfoPairsNestedBlock.model_construct(
                 pair_name=pair_name,
                 exchanges=exchanges
             ))
 
-        return GetExplorerInfoResponse(result=result)
\ No newline at end of file
+        return GetExplorerInfoResponse.model_construct(result=result)
+
+class RateHistoryCandleBlock(BaseModel):
+    timestamp: float = Field(description="Bucket start Unix-time timestamp", example=1712448780.0)
+    open: float = Field(description="First rate in bucket", example=0.000015)
+    high: float = Field(description="Max rate in bucket", example=0.0000152)
+    low: float = Field(description="Min rate in bucket", example=0.0000149)
+    close: float = Field(description="Last rate in bucket", example=0.0000151)
+    ticks_count: int = Field(description="Count of rate updates in bucket", example=60)
+
+
+class RateHistoryExchangeBlock(BaseModel):
+    exchange: str = Field(description="Exchange source name", example="binance")
+    pair_name: str = Field(description="Currency pair name", example="USDT_BTC")
+    resolution: float = Field(description="Bucket size in seconds", example=60)
+    candles: List[RateHistoryCandleBlock] = Field(default=[])
+
+
+class GetRateHistoryResponse(BaseModel):
+    result: List[RateHistoryExchangeBlock] = Field(default=[])
+
+    @classmethod
+    def from_candles_mapping(
+            CLS, pair_name: str, resolution: float,
+            candles_mapping: Dict[str, "RateHistoryCandles"]) -> "GetRateHistoryResponse":
+        """
+            Make rate history response from candles of each exchange: {exchange: RateHistoryCandles}
+        """
+        result = []
+        for exchange, candles in candles_mapping.items():
+            result.append(RateHistoryExchangeBlock.model_construct(
+                exchange=exchange, pair_name=pair_name, resolution=resolution,
+                candles=[
+                    RateHistoryCandleBlock.model_construct(
+                        timestamp=timestamp, open=open_rate, high=high, low=low, close=close,
+                        ticks_count=ticks_count)
+                    for timestamp, open_rate, high, low, close, ticks_count in zip(
+                        candles.timestamps.tolist(), candles.open.tolist(), candles.high.tolist(),
+                        candles.low.tolist(), candles.close.tolist(), candles.ticks_count.tolist())]))
+        return GetRateHistoryResponse.model_construct(result=result)
+
+
+class TopMoverBlock(BaseModel):
+    exchange: str = Field(description="Exchange source name", example="binance")
+    pair_name: str = Field(description="Currency pair name", example="USDT_BTC")
+    change: float = Field(description="Relative rate change over window", example=-0.012)
+    open_rate: float = Field(description="Rate at window start", example=0.0000152)
+    currency_rate: float = Field(description="Current rate", example=0.00001502)
+    last_update_timestamp: float = Field(
+        description="Unix-time timestamp when last updated", example=1712448799.8908942)
+
+
+class GetTopMoversResponse(BaseModel):
+    window: str = Field(description="Change window", example="5m")
+    result: List[TopMoverBlock] = Field(default=[])
+
+    @classmethod
+    def from_top_movers(CLS, window: str, top_movers: List["TopMover"]) -> "GetTopMoversResponse":
+        """
+            Make top movers response from leaderboard query result
+        """
+        return GetTopMoversResponse.model_construct(window=window, result=[
+            TopMoverBlock.model_construct(
+                exchange=mover.exchanger_uniq_name, pair_name=mover.pair_title, change=mover.change,
+                open_rate=mover.open_rate, currency_rate=mover.currency_rate,
+                last_update_timestamp=mover.last_update)
+            for mover in top_movers])
@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Dict, Optional
 from pydantic import BaseModel
 
 
@@ -9,4 +9,40 @@ class AviableExchangesResponse(BaseModel):
         "json_schema_extra": {
             "example": {"result": ["binance", "kraken"]}
         }
-    }
\ No newline at end of file
+    }
+
+
+class UpstreamRateLimitInfo(BaseModel):
+    remaining: float
+    capacity: float
+    refill_per_second: float
+
+
+class UpstreamRateLimitsResponse(BaseModel):
+    result: Dict[str, UpstreamRateLimitInfo]
+
+    model_config = {
+        "json_schema_extra": {
+            "example": {"result": {
+                "binance": {"remaining": 1118.0, "capacity": 1200.0, "refill_per_second": 80.0},
+                "kraken": {"remaining": 9.0, "capacity": 10.0, "refill_per_second": 1.0}}}
+        }
+    }
+
+
+class UpstreamCircuitBreakerInfo(BaseModel):
+    state: str
+    consecutive_failures: int
+    hedge_delay: Optional[float] = None
+
+
+class UpstreamCircuitBreakersResponse(BaseModel):
+    result: Dict[str, UpstreamCircuitBreakerInfo]
+
+    model_config = {
+        "json_schema_extra": {
+            "example": {"result": {
+                "binance": {"state": "closed", "consecutive_failures": 0, "hedge_delay": 0.21},
+                "kraken": {"state": "open", "consecutive_failures": 5, "hedge_delay": None}}}
+        }
+    }
@@ -1,22 +1,23 @@
 from enum import Enum
-from currencyexplorer.core.exchangers_scraping import AbstractExchangerScraper
+from currencyexplorer.core.exchangers_scraping import ScraperPluginsRegistry
 from typing import Dict
 
 
 #############################################
-# All modules containing child classes for AbstractExchangerScraper must be imported here.  #
-#   After that new parser will immediately available in the system  #
+# All child classes for AbstractExchangerScraper must be registered in this manifest  #
+#   ({EXCHANGER_UNIQ_NAME: "module.path:ClassName"}) or by package entry point in  #
+#       "currencyexplorer.scrapers" group. After that new parser will immediately available in the system  #
+#   Scraper modules are imported only when scraper is requested first time  #
 
-from .binance import BinanceExchangerCurrencyScraper
-from .kraken import KrakenExchangerCurrencyScraper
+SCRAPERS_MANIFEST: Dict[str, str] = {
+    "binance": "app.scrapers.binance:BinanceExchangerCurrencyScraper",
+    "kraken": "app.scrapers.kraken:KrakenExchangerCurrencyScraper",
+}
 
 #############################################
 
 
-EXCHANGERS_MAPPING: Dict[str, AbstractExchangerScraper] = {
-    scraper.EXCHANGER_UNIQ_NAME:
-        scraper for scraper in AbstractExchangerScraper.__subclasses__() if hasattr(
-                scraper, "EXCHANGER_UNIQ_NAME")
-}
+EXCHANGERS_MAPPING: ScraperPluginsRegistry = ScraperPluginsRegistry(
+    SCRAPERS_MANIFEST, entry_points_group="currencyexplorer.scrapers")
 EXCHANGERS_MAPPING_ENUM: Enum = Enum(
-    'ExchangersMappingEnum', EXCHANGERS_MAPPING.copy())
+    'ExchangersMappingEnum', {uniq_name: uniq_name for uniq_name in EXCHANGERS_MAPPING})
@@ -1,10 +1,13 @@
 import asyncio
+import json
 import time
-from typing import Optional, Union, List, AsyncIterator, Dict
-from binance import BinanceSocketManager
-from currencyexplorer import binance_async_client
+from contextlib import aclosing
+from typing import Optional, Union, List, AsyncIterator, Dict, Any, Tuple, ClassVar
+from currencyexplorer import config
 from currencyexplorer.core.exchangers_scraping import (
-    AbstractExchangerScraper, ScraperStorageBackendPairData)
+    AbstractExchangerScraper, ScraperStorageBackendPairData, ExchangeSymbolIndex,
+    ExplorerPairInvalidFormatException)
+from currencyexplorer.core.monitoring import SCRAPER_PARSE_SECONDS
 
 
 
@@ -13,6 +16,57 @@ class BinanceExchangerCurrencyScraper(
     AbstractExchangerScraper,
     EXCHANGER_UNIQ_NAME="binance", DEFAULT_LISTNER_TIMEOUT=0, LISTNER_AUTO_START=True):
 
+    # Binance REST API limit is 6000 request weight per minute (we use 80% of it)
+    RATE_LIMIT_CAPACITY: ClassVar[float] = 1200
+    RATE_LIMIT_REFILL_PER_SECOND: ClassVar[float] = 80
+    TICKER_SYMBOL_REQUEST_WEIGHT: ClassVar[float] = 2
+    TICKER_ALL_REQUEST_WEIGHT: ClassVar[float] = 80
+    # Ticker request weight by count of requested symbols: ((max_symbols_count, weight), ...)
+    TICKER_SYMBOLS_REQUEST_WEIGHTS: ClassVar[Tuple[Tuple[int, float], ...]] = ((20, 2), (100, 40))
+    MAX_PAIRS_PER_REQUEST: ClassVar[int] = 100
+    # Binance API error code of unknown symbol (whole `symbols` request is rejected with it)
+    INVALID_SYMBOL_ERROR_CODE: ClassVar[int] = -1121
+    EXCHANGE_INFO_REQUEST_WEIGHT: ClassVar[float] = 20
+
+    COMBINED_STREAM_URL: ClassVar[str] = "wss://stream.binance.com:9443/stream"
+    # Parser kwargs for each supported per-symbol stream type
+    DEMAND_STREAM_PARSE_KWARGS: ClassVar[Dict[str, Dict[str, Any]]] = {
+        "bookTicker": dict(
+            use_binance_average_price=False,
+            message_title_mapping={"askPrice": "a", "bidPrice": "b", "symbol": "s"}),
+        "miniTicker": dict(
+            use_binance_average_price=True,
+            message_title_mapping={"WeightedAvgPrice": "c", "symbol": "s"}),
+    }
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._binance_async_client = None
+
+    async def _get_binance_client(self):
+        """ GET python-binance AsyncClient (SDK is imported and client is created on first usage) """
+        if self._binance_async_client is None:
+            from binance import AsyncClient
+            self._binance_async_client = AsyncClient()
+            if config.BINANCE_API_URL is not None:
+                self._binance_async_client.API_URL = config.BINANCE_API_URL.rstrip("/")
+        return self._binance_async_client
+
+    async def fetch_symbol_index(self) -> ExchangeSymbolIndex:
+        """ Make symbol index from trading markets of exchangeInfo """
+        await self._acquire_upstream_request(self.EXCHANGE_INFO_REQUEST_WEIGHT)
+        binance_async_client = await self._get_binance_client()
+        exchange_info = await binance_async_client.get_exchange_info()
+        return ExchangeSymbolIndex(self.EXCHANGER_UNIQ_NAME, markets=[
+            (market["symbol"], market["baseAsset"], market["quoteAsset"])
+            for market in exchange_info["symbols"] if market.get("status") == "TRADING"])
+
+    def _symbol_to_pair_title(self, symbol: str) -> Optional[str]:
+        """ Pair title for binance symbol (None if symbol index loaded and market not found) """
+        if self.symbol_index is not None:
+            return self.symbol_index.pair_title_for(symbol)
+        return ExplorerPairInvalidFormatException.explorer_pair_format_validator(f"{symbol[0:3]}_{symbol[4:]}")
+
     async def _ticker_response_to_data_list(
             self,
             ticker_data: dict,
@@ -24,74 +78,247 @@ class BinanceExchangerCurrencyScraper(
         """
             util for make list of scraper data objects from binance response
         """
+        parse_started_at = time.perf_counter()
         if not isinstance(ticker_data, (tuple, list, )):
             ticker_data = [ticker_data]
         data_list = []
         for ticker in ticker_data:
-            symbol = str(ticker[message_title_mapping.get("symbol", "symbol")])
             if pair_title is not None:
                 symbol= str(pair_title)
             else:
-                symbol = f"{symbol[0:3]}_{symbol[4:]}"
+                symbol = self._symbol_to_pair_title(str(ticker[message_title_mapping.get("symbol", "symbol")]))
+                if symbol is None:
+                    continue
             avr_price = None
             if use_binance_average_price is not True:
                 ask_price = ticker[message_title_mapping.get("askPrice", "askPrice")]
                 bid_price = ticker[message_title_mapping.get("bidPrice", "bidPrice")]
                 avr_price = (float(ask_price) + float(bid_price)) / 2
             else:
-                avr_price = ticker[message_title_mapping.get("WeightedAvgPrice", "WeightedAvgPrice")]
+                avr_price = float(ticker[message_title_mapping.get("WeightedAvgPrice", "WeightedAvgPrice")])
+            # Stream event time in milliseconds (REST ticker and bookTicker stream have no event time)
+            event_time = ticker.get(message_title_mapping.get("eventTime", "E"))
             new_data = ScraperStorageBackendPairData(
                 exchanger_uniq_name=self.EXCHANGER_UNIQ_NAME,
                 currency_pair_title=symbol,
                 currency_rate=avr_price if (not swap_price or avr_price == 0) else 1 / avr_price,
-                last_update=time.time()
+                last_update=time.time(),
+                event_time=None if event_time is None else event_time / 1000
             )
             data_list.append(new_data)
+        SCRAPER_PARSE_SECONDS.observe(
+            time.perf_counter() - parse_started_at, exchange=self.EXCHANGER_UNIQ_NAME)
         return data_list
 
     async def get_currency(
             self, pair_title: Optional[str] = None) -> Union[
                 List[ScraperStorageBackendPairData], ScraperStorageBackendPairData]:
+        await self.load_symbol_index()
         kwargs = {}
         swap_price = False
         if pair_title is not None:
-            pair_list = str(pair_title).split("_")
-            kwargs["symbol"] = "".join(
-                (pair_list[1], pair_list[0],) if pair_list[0] == "USDT" else pair_list)
-            swap_price = pair_list[0] == "USDT"
+            symbol_mapping = self._pair_to_symbol(pair_title)
+            if symbol_mapping is None:
+                # Binance has no market for this pair
+                return []
+            kwargs["symbol"], swap_price = symbol_mapping
 
+        await self._acquire_upstream_request(
+            self.TICKER_SYMBOL_REQUEST_WEIGHT if "symbol" in kwargs else self.TICKER_ALL_REQUEST_WEIGHT)
+        binance_async_client = await self._get_binance_client()
         ticker_data = await binance_async_client.get_ticker(**kwargs)
-        return await self._ticker_response_to_data_list(
-            ticker_data,
+        parse_kwargs = dict(
             swap_price=swap_price,
             pair_title=pair_title,
             message_title_mapping={}, use_binance_average_price=False)
+        self._record_upstream_payload(ticker_data, "fetch", **parse_kwargs)
+        return await self._ticker_response_to_data_list(ticker_data, **parse_kwargs)
 
-    async def attach_currency_listener(
-            self, *args,
-            delay_seconds: Optional[float] = None, max_update_iteration: Optional[int] = None,
-            **kwargs) -> AsyncIterator[List[ScraperStorageBackendPairData] | ScraperStorageBackendPairData]:
-        current_iteration_count = 0
-        self._worker_running_status = True
-        bm = BinanceSocketManager(binance_async_client)
+    def _ticker_symbols_request_weight(self, symbols_count: int) -> float:
+        for max_symbols_count, weight in self.TICKER_SYMBOLS_REQUEST_WEIGHTS:
+            if symbols_count <= max_symbols_count:
+                return weight
+        return self.TICKER_ALL_REQUEST_WEIGHT
+
+    async def get_currencies(self, pair_titles: List[str]) -> List[ScraperStorageBackendPairData]:
+        """ Fetch several pairs by one ticker request (`symbols` parameter).
+                Only markets from symbol index are batched: without index pair can be mapped
+                    to non-existent symbol and Binance rejects whole request, so pairs are fetched one by one
+        """
+        await self.load_symbol_index()
+        if self.symbol_index is None:
+            return await self._get_currencies_one_by_one(pair_titles)
+        # {symbol: [(pair_title, swap_price)]} - same market can be requested in both directions
+        requested_symbols: Dict[str, List[Tuple[str, bool]]] = {}
+        for pair_title in pair_titles:
+            symbol_mapping = self._pair_to_symbol(pair_title)
+            if symbol_mapping is not None:
+                symbol, swap_price = symbol_mapping
+                requested_symbols.setdefault(symbol, []).append((pair_title, swap_price))
+        if len(requested_symbols) == 0:
+            return []
+
+        await self._acquire_upstream_request(self._ticker_symbols_request_weight(len(requested_symbols)))
+        binance_async_client = await self._get_binance_client()
+        ticker_data = await binance_async_client.get_ticker(
+            symbols=json.dumps(list(requested_symbols), separators=(",", ":")))
+        data_list = []
+        for ticker in ticker_data:
+            for pair_title, swap_price in requested_symbols.get(ticker["symbol"], []):
+                parse_kwargs = dict(
+                    swap_price=swap_price,
+                    pair_title=pair_title,
+                    message_title_mapping={}, use_binance_average_price=False)
+                self._record_upstream_payload(ticker, "fetch", **parse_kwargs)
+                data_list.extend(await self._ticker_response_to_data_list(ticker, **parse_kwargs))
+        return data_list
+
+    async def _get_currencies_one_by_one(self, pair_titles: List[str]) -> List[ScraperStorageBackendPairData]:
+        """ Fetch pairs by separate ticker requests, pairs without Binance market are skipped """
+        from binance.exceptions import BinanceAPIException
+        responses = await asyncio.gather(*[
+            self.get_currency(pair_title=pair_title) for pair_title in pair_titles], return_exceptions=True)
+        data_list = []
+        for response in responses:
+            if isinstance(response, BinanceAPIException) and response.code == self.INVALID_SYMBOL_ERROR_CODE:
+                continue
+            if isinstance(response, BaseException):
+                raise response
+            data_list.extend(response)
+        return data_list
+
+    async def parse_recorded_payload(
+            self, payload: Any, **parse_kwargs: Any) -> List[ScraperStorageBackendPairData]:
+        return await self._ticker_response_to_data_list(payload, **parse_kwargs)
+
+    def _pair_to_symbol(self, pair_title: str) -> Optional[Tuple[str, bool]]:
+        """ Return binance symbol for pair and swap price flag (pair is reversed binance market).
+                Return None if symbol index loaded and binance has no market for pair
+        """
+        if self.symbol_index is not None:
+            return self.symbol_index.native_symbol_for(pair_title)
+        pair_list = str(pair_title).split("_")
+        swap_price = pair_list[0] == "USDT"
+        return "".join((pair_list[1], pair_list[0], ) if swap_price else pair_list), swap_price
+
+    def _desired_demand_streams(self) -> Optional[Dict[str, Tuple[str, bool]]]:
+        """ Streams for pairs requested by clients: {stream_name: (pair_title, swap_price)}.
+                Return None if demand streams can't be used (disabled, no demand or too many pairs),
+                    in this case all-market ticker stream should be used.
+        """
+        if config.BINANCE_DEMAND_STREAMS_ENABLED is not True or self.pair_demand_tracker is None:
+            return None
+        hot_pairs = self.pair_demand_tracker.hot_pairs(self.EXCHANGER_UNIQ_NAME)
+        if len(hot_pairs) == 0 or len(hot_pairs) > config.BINANCE_MAX_DEMAND_STREAMS:
+            return None
+        streams = {}
+        for pair_title in hot_pairs:
+            symbol_mapping = self._pair_to_symbol(pair_title)
+            if symbol_mapping is None:
+                continue
+            symbol, swap_price = symbol_mapping
+            streams["{}@{}".format(symbol.lower(), config.BINANCE_DEMAND_STREAM_TYPE)] = (
+                pair_title, swap_price)
+        if len(streams) == 0:
+            return None
+        return streams
+
+    async def _all_market_listener(
+            self, delay_seconds: Optional[float] = None
+            ) -> AsyncIterator[List[ScraperStorageBackendPairData]]:
+        """ Listener of all-market ticker stream (`!ticker@arr`).
+                Stops when demand streams can be used instead
+        """
+        from binance import BinanceSocketManager
+        bm = BinanceSocketManager(await self._get_binance_client())
+        if config.BINANCE_STREAM_URL is not None:
+            bm.STREAM_URL = config.BINANCE_STREAM_URL.rstrip("/") + "/"
         ts = bm.ticker_socket()
+        next_demand_check_at = time.monotonic() + config.BINANCE_DEMAND_SYNC_INTERVAL
 
         async with ts as tscm:
+            # Listener is ready only after socket connection established
+            self._worker_running_status = True
             while not self._worker_stop_signal:
-                if isinstance(max_update_iteration, int) and max_update_iteration is not None:
-                    current_iteration_count += 1
                 if self.DEFAULT_LISTNER_TIMEOUT != 0:
                     await asyncio.sleep(
                         delay_seconds if delay_seconds is not None else self.DEFAULT_LISTNER_TIMEOUT)
                 ticker_data = await tscm.recv()
-                data = await self._ticker_response_to_data_list(
-                    ticker_data,
+                parse_kwargs = dict(
                     use_binance_average_price=True,
                     message_title_mapping={
                         "WeightedAvgPrice": "x", "symbol": "s"})
-                yield data
-                if isinstance(max_update_iteration, int) and current_iteration_count >= max_update_iteration:
-                    break
+                self._record_upstream_payload(ticker_data, "listener", **parse_kwargs)
+                yield await self._ticker_response_to_data_list(ticker_data, **parse_kwargs)
+                if time.monotonic() >= next_demand_check_at:
+                    next_demand_check_at = time.monotonic() + config.BINANCE_DEMAND_SYNC_INTERVAL
+                    if self._desired_demand_streams() is not None:
+                        return
+
+    async def _demand_streams_listener(self) -> AsyncIterator[List[ScraperStorageBackendPairData]]:
+        """ Listener of combined per-symbol streams for requested pairs only.
+                Subscriptions are added/dropped on the open connection when demand changes.
+                    Stops when all-market stream should be used instead (see. _desired_demand_streams)
+        """
+        import websockets
+        stream_type_parse_kwargs = self.DEMAND_STREAM_PARSE_KWARGS[config.BINANCE_DEMAND_STREAM_TYPE]
+        subscribed_streams: Dict[str, Tuple[str, bool]] = {}
+        request_id = 0
+        next_sync_at = 0
+
+        combined_stream_url = self.COMBINED_STREAM_URL if config.BINANCE_STREAM_URL is None else (
+            config.BINANCE_STREAM_URL.rstrip("/") + "/stream")
+        async with websockets.connect(combined_stream_url) as ws:
+            self._worker_running_status = True
+            while not self._worker_stop_signal:
+                if time.monotonic() >= next_sync_at:
+                    next_sync_at = time.monotonic() + config.BINANCE_DEMAND_SYNC_INTERVAL
+                    desired_streams = self._desired_demand_streams()
+                    if desired_streams is None:
+                        return
+                    for method, streams in (
+                            ("SUBSCRIBE", [s for s in desired_streams if s not in subscribed_streams]),
+                            ("UNSUBSCRIBE", [s for s in subscribed_streams if s not in desired_streams])):
+                        if len(streams) == 0:
+                            continue
+                        request_id += 1
+                        await ws.send(json.dumps({"method": method, "params": streams, "id": request_id}))
+                    subscribed_streams = desired_streams
+                try:
+                    message = json.loads(await asyncio.wait_for(
+                        ws.recv(), timeout=config.BINANCE_DEMAND_SYNC_INTERVAL))
+                except asyncio.TimeoutError:
+                    continue
+                stream_pair = subscribed_streams.get(message.get("stream"))
+                if stream_pair is None:
+                    # Subscription response or message from already dropped stream
+                    continue
+                pair_title, swap_price = stream_pair
+                parse_kwargs = dict(swap_price=swap_price, pair_title=pair_title, **stream_type_parse_kwargs)
+                self._record_upstream_payload(message["data"], "listener", **parse_kwargs)
+                yield await self._ticker_response_to_data_list(message["data"], **parse_kwargs)
+
+    async def attach_currency_listener(
+            self, *args,
+            delay_seconds: Optional[float] = None, max_update_iteration: Optional[int] = None,
+            **kwargs) -> AsyncIterator[List[ScraperStorageBackendPairData] | ScraperStorageBackendPairData]:
+        """ Uses combined per-symbol streams for requested pairs if BINANCE_DEMAND_STREAMS_ENABLED,
+                all-market ticker stream is used as a fallback (no demand or too many requested pairs)
+        """
+        await self.load_symbol_index()
+        current_iteration_count = 0
+        while not self._worker_stop_signal:
+            if self._desired_demand_streams() is not None:
+                listener = self._demand_streams_listener()
+            else:
+                listener = self._all_market_listener(delay_seconds=delay_seconds)
+            async with aclosing(listener):
+                async for data in listener:
+                    current_iteration_count += 1
+                    yield data
+                    if isinstance(max_update_iteration, int) and current_iteration_count >= max_update_iteration:
+                        self._worker_running_status = False
+                        return
         self._worker_running_status = False
     
     async def stop_currency_listener(self) -> None:
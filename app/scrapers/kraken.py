@@ -1,35 +1,89 @@
+import asyncio
 import time
 import traceback
-from httpx import AsyncClient
 from random import randint
 from loguru import logger
-from typing import Optional, Union, List, Dict
+from typing import Optional, Union, List, Dict, Any, Tuple, ClassVar, AsyncIterator
+from currencyexplorer import config
 from currencyexplorer.core.exchangers_scraping import (
-    AbstractExchangerScraper, ScraperStorageBackendPairData)
+    AbstractExchangerScraper, ScraperStorageBackendPairData, ExchangeSymbolIndex,
+    ExplorerPairInvalidFormatException, UpstreamUnavailableException)
+from currencyexplorer.core.monitoring import SCRAPER_PARSE_SECONDS
 
 
 class KrakenExchangerCurrencyScraper(
         AbstractExchangerScraper,
         EXCHANGER_UNIQ_NAME="kraken",
-        DEFAULT_LISTNER_TIMEOUT=30, LISTNER_AUTO_START=False):
+        DEFAULT_LISTNER_TIMEOUT=30, LISTNER_AUTO_START=False,
+        ADAPTIVE_POLLING_REQUESTS_PER_MINUTE=30):
     
-    TICKER_URL: str = "https://api.kraken.com/0/public/Ticker"
+    API_URL: str = "https://api.kraken.com/0/public"
+    # Kraken legacy asset codes -> common asset codes
+    ASSET_ALIASES: ClassVar[Dict[str, str]] = {"XBT": "BTC", "XDG": "DOGE"}
+    # Kraken public API allows about 1 request per second
+    RATE_LIMIT_CAPACITY: ClassVar[float] = 10
+    RATE_LIMIT_REFILL_PER_SECOND: ClassVar[float] = 1
+    MAX_PAIRS_PER_REQUEST: ClassVar[int] = 50
+    # Kraken error for pair without market (not upstream failure)
+    UNKNOWN_PAIR_ERROR: ClassVar[str] = "EQuery:Unknown asset pair"
 
-    async def _get_ticker_data(self, pair: str | None =  None):
-        """ GET ticker data object from Kraken API """
-        response_data = {}
+    def _api_method_url(self, method: str) -> str:
+        """ Public API method url (KRAKEN_API_URL base is used if defined) """
+        api_url = self.API_URL if config.KRAKEN_API_URL is None else config.KRAKEN_API_URL
+        return "{}/{}".format(api_url.rstrip("/"), method)
+
+    async def _get_ticker_data(self, pair: str | None =  None) -> Dict[str, dict]:
+        """ GET ticker data object from Kraken API (empty dict if Kraken has no market for pair).
+                Transport errors, HTTP error statuses and Kraken API errors are raised as
+                    UpstreamUnavailableException (so they are counted by upstream circuit breaker)
+        """
         params = {}
         if pair is not None:
             params["pair"] = pair
+        await self._acquire_upstream_request(1)
+        from httpx import AsyncClient, HTTPError
         try:
             async with AsyncClient() as client:
-                response = await client.get(self.TICKER_URL, params=params)
+                response = await client.get(self._api_method_url("Ticker"), params=params)
+                response.raise_for_status()
                 response_data = response.json()
-        except Exception as e:
-            logger.info(traceback.format_exc())
-        else:
-            response_data = response_data.get("result", {})
-        return response_data
+        except (HTTPError, ValueError) as e:
+            raise UpstreamUnavailableException(
+                description="{} Ticker request failed: {!r}".format(self.EXCHANGER_UNIQ_NAME, e)) from e
+        errors = response_data.get("error") or []
+        if len(errors) != 0:
+            if all(str(error).startswith(self.UNKNOWN_PAIR_ERROR) for error in errors):
+                return {}
+            raise UpstreamUnavailableException(
+                description="{} Ticker error: {}".format(self.EXCHANGER_UNIQ_NAME, ", ".join(map(str, errors))))
+        return response_data.get("result") or {}
+
+    async def fetch_symbol_index(self) -> ExchangeSymbolIndex:
+        """ Make symbol index from AssetPairs (assets are taken from websocket pair name, like XBT/USD) """
+        await self._acquire_upstream_request(1)
+        from httpx import AsyncClient
+        async with AsyncClient() as client:
+            response = await client.get(self._api_method_url("AssetPairs"))
+            response.raise_for_status()
+            response_data = response.json()
+        if len(response_data.get("error") or []) != 0:
+            raise ValueError("Kraken AssetPairs error: {}".format(response_data["error"]))
+        markets = []
+        for k_pair, k_pair_info in response_data["result"].items():
+            if "wsname" not in k_pair_info:
+                continue
+            base_asset, quote_asset = k_pair_info["wsname"].split("/", 1)
+            markets.append((
+                k_pair,
+                self.ASSET_ALIASES.get(base_asset, base_asset), self.ASSET_ALIASES.get(quote_asset, quote_asset)))
+        return ExchangeSymbolIndex(self.EXCHANGER_UNIQ_NAME, markets=markets)
+
+    def _native_to_pair_title(self, k_pair: str, swap_price: bool | None = False) -> Optional[str]:
+        """ Pair title for kraken pair name (None if symbol index loaded and market not found) """
+        if self.symbol_index is not None:
+            return self.symbol_index.pair_title_for(k_pair)
+        return ExplorerPairInvalidFormatException.explorer_pair_format_validator(
+            f"{k_pair[0:3]}_{k_pair[4:]}" if swap_price is False else f"{k_pair[4:]}_{k_pair[0:3]}")
 
     def _scraper_data_list_from_response(
             self, kraken_ticker_data: Dict[str, dict],
@@ -40,12 +94,15 @@ class KrakenExchangerCurrencyScraper(
         """
         if kraken_ticker_data is None:
             return []
+        parse_started_at = time.perf_counter()
         data_list = []
         for k_pair, k_item in kraken_ticker_data.items():
             ask_price, bid_price, close_price = list(map(lambda x: x[0], list(k_item.values())[:3]))
             symbol = None if pair is None else str(pair)
             if symbol is None:
-                symbol = f"{k_pair[0:3]}_{k_pair[4:]}" if swap_price is False else f"{k_pair[4:]}_{k_pair[0:3]}"
+                symbol = self._native_to_pair_title(k_pair, swap_price=swap_price)
+                if symbol is None:
+                    continue
             avr_price = (float(ask_price) + float(bid_price)) / 2
             new_data = ScraperStorageBackendPairData(
                 exchanger_uniq_name=self.EXCHANGER_UNIQ_NAME,
@@ -54,13 +111,30 @@ class KrakenExchangerCurrencyScraper(
                 last_update=time.time()
             )
             data_list.append(new_data)
+        SCRAPER_PARSE_SECONDS.observe(
+            time.perf_counter() - parse_started_at, exchange=self.EXCHANGER_UNIQ_NAME)
         return data_list
 
     async def get_currency(
             self, pair_title: Optional[str] = None) -> Union[
                 List[ScraperStorageBackendPairData], ScraperStorageBackendPairData]:
         
-        # load only for specified pair
+        await self.load_symbol_index()
+
+        # load only for specified pair (market orientation is known from symbol index)
+        if pair_title is not None and self.symbol_index is not None:
+            symbol_mapping = self.symbol_index.native_symbol_for(pair_title)
+            if symbol_mapping is None:
+                # Kraken has no market for this pair
+                return []
+            k_pair, swap_price = symbol_mapping
+            kraken_pair_data = await self._get_ticker_data(pair=k_pair)
+            self._record_upstream_payload(
+                kraken_pair_data, "fetch", swap_price=swap_price, pair=pair_title)
+            return self._scraper_data_list_from_response(
+                kraken_pair_data, swap_price=swap_price, pair=pair_title)
+
+        # load only for specified pair (without symbol index: direct market first, then reversed)
         if pair_title is not None:
             symbol_pair = str(pair_title).split("_")
             kraken_pair_data = await self._get_ticker_data(pair=f"{symbol_pair[0]}{symbol_pair[1]}")
@@ -69,8 +143,67 @@ class KrakenExchangerCurrencyScraper(
                 kraken_pair_data = await self._get_ticker_data(
                     pair=f"{symbol_pair[1]}{symbol_pair[0]}")
                 swap_price = True
+            self._record_upstream_payload(
+                kraken_pair_data, "fetch", swap_price=swap_price, pair=pair_title)
             return self._scraper_data_list_from_response(
                 kraken_pair_data, swap_price=swap_price, pair=pair_title)
         
         # Load for all aviable pairs
-        return self._scraper_data_list_from_response(await self._get_ticker_data())
+        kraken_ticker_data = await self._get_ticker_data()
+        self._record_upstream_payload(kraken_ticker_data, "fetch")
+        return self._scraper_data_list_from_response(kraken_ticker_data)
+
+    async def get_currencies(self, pair_titles: List[str]) -> List[ScraperStorageBackendPairData]:
+        """ Fetch several pairs by one ticker request (comma-separated pairs).
+                Market orientation of each pair is required, so without symbol index
+                    pairs are fetched one by one
+        """
+        await self.load_symbol_index()
+        if self.symbol_index is None:
+            return await super().get_currencies(pair_titles)
+        # {kraken_pair: [(pair_title, swap_price)]} - same market can be requested in both directions
+        requested_pairs: Dict[str, List[Tuple[str, bool]]] = {}
+        for pair_title in pair_titles:
+            symbol_mapping = self.symbol_index.native_symbol_for(pair_title)
+            if symbol_mapping is not None:
+                k_pair, swap_price = symbol_mapping
+                requested_pairs.setdefault(k_pair, []).append((pair_title, swap_price))
+        if len(requested_pairs) == 0:
+            return []
+
+        kraken_ticker_data = await self._get_ticker_data(pair=",".join(requested_pairs))
+        data_list = []
+        for k_pair, k_item in kraken_ticker_data.items():
+            for pair_title, swap_price in requested_pairs.get(k_pair, []):
+                self._record_upstream_payload(
+                    {k_pair: k_item}, "fetch", swap_price=swap_price, pair=pair_title)
+                data_list.extend(self._scraper_data_list_from_response(
+                    {k_pair: k_item}, swap_price=swap_price, pair=pair_title))
+        return data_list
+
+    async def attach_currency_listener(
+            self, *args,
+            delay_seconds: Optional[float] = None, max_update_iteration: Optional[int] = None,
+            **kwargs) -> AsyncIterator[List[ScraperStorageBackendPairData] | ScraperStorageBackendPairData]:
+        """ Polling listener (see. AbstractExchangerScraper.attach_currency_listener),
+                failed poll is logged and skipped (next poll is made after listener timeout as usual)
+        """
+        current_iteration_count = 0
+        self._worker_running_status = True
+        while not self._worker_stop_signal:
+            current_iteration_count += 1
+            await asyncio.sleep(
+                delay_seconds if delay_seconds is not None else self.DEFAULT_LISTNER_TIMEOUT)
+            try:
+                data = await self.get_currency(*args, **kwargs)
+            except UpstreamUnavailableException:
+                logger.info(traceback.format_exc())
+            else:
+                yield data
+            if isinstance(max_update_iteration, int) and current_iteration_count >= max_update_iteration:
+                break
+        self._worker_running_status = False
+
+    async def parse_recorded_payload(
+            self, payload: Any, **parse_kwargs: Any) -> List[ScraperStorageBackendPairData]:
+        return self._scraper_data_list_from_response(payload, **parse_kwargs)
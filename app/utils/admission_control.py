@@ -0,0 +1,73 @@
+from typing import Optional, Dict
+from currencyexplorer import config, event_loop_lag_monitor
+from currencyexplorer.core.monitoring import EventLoopLagMonitor, ADMISSION_REJECTED
+
+
+class AdmissionController:
+    """
+        Admission control of API requests and WebSocket connections (load shedding).
+            - Requests are rejected while event loop lag is higher than `lag_threshold` seconds
+                (new WebSocket connections too), so loop time is left for ingestion tasks.
+            - Not more than `max_concurrent_per_client` requests are executed concurrently by one client
+                (auth token and client address, all clients of API share one token).
+                    Clients behind same proxy without forwarded address are limited together.
+            - Not more than `max_websocket_connections` WebSocket connections are open.
+        admit_*() methods return rejection reason (None if admitted), admitted slot should be released
+    """
+
+    def __init__(
+            self, loop_lag_monitor: EventLoopLagMonitor, lag_threshold: Optional[float] = None,
+            max_concurrent_per_client: Optional[int] = None,
+            max_websocket_connections: Optional[int] = None) -> None:
+        self.loop_lag_monitor = loop_lag_monitor
+        self.lag_threshold = lag_threshold
+        self.max_concurrent_per_client = max_concurrent_per_client
+        self.max_websocket_connections = max_websocket_connections
+        # {client key: count of executing requests}
+        self.__active_requests: Dict[str, int] = {}
+        self.__websocket_connections = 0
+
+    @property
+    def is_overloaded(self) -> bool:
+        return self.lag_threshold is not None and self.loop_lag_monitor.lag > self.lag_threshold
+
+    def admit_request(self, client_key: str) -> Optional[str]:
+        if self.is_overloaded:
+            ADMISSION_REJECTED.inc(reason="loop_lag")
+            return "loop_lag"
+        active_requests = self.__active_requests.get(client_key, 0)
+        if self.max_concurrent_per_client is not None and active_requests >= self.max_concurrent_per_client:
+            ADMISSION_REJECTED.inc(reason="client_concurrency")
+            return "client_concurrency"
+        self.__active_requests[client_key] = active_requests + 1
+        return None
+
+    def release_request(self, client_key: str) -> None:
+        active_requests = self.__active_requests.get(client_key, 0) - 1
+        if active_requests <= 0:
+            self.__active_requests.pop(client_key, None)
+        else:
+            self.__active_requests[client_key] = active_requests
+
+    def admit_websocket(self) -> Optional[str]:
+        if self.is_overloaded:
+            ADMISSION_REJECTED.inc(reason="loop_lag")
+            return "loop_lag"
+        if self.max_websocket_connections is not None and (
+                self.__websocket_connections >= self.max_websocket_connections):
+            ADMISSION_REJECTED.inc(reason="websocket_connections")
+            return "websocket_connections"
+        self.__websocket_connections += 1
+        return None
+
+    def release_websocket(self) -> None:
+        self.__websocket_connections = max(self.__websocket_connections - 1, 0)
+
+
+admission_controller = AdmissionController(
+    event_loop_lag_monitor,
+    lag_threshold=config.EVENT_LOOP_LAG_THRESHOLD if config.ADMISSION_CONTROL_ENABLED is True else None,
+    max_concurrent_per_client=(
+        config.MAX_CONCURRENT_REQUESTS_PER_CLIENT if config.ADMISSION_CONTROL_ENABLED is True else None),
+    max_websocket_connections=(
+        config.MAX_WEBSOCKET_CONNECTIONS if config.ADMISSION_CONTROL_ENABLED is True else None))
@@ -1,13 +1,17 @@
 from fastapi import APIRouter, Depends
-from app.dependencies import get_auth_api_token, validate_ws_auth_api_token
+from app.dependencies import (
+	get_auth_api_token, validate_ws_auth_api_token, http_admission_control, websocket_admission_control)
 from typing import Optional
 
 
 def make_base_router(
 		tags,
-		basic_auth: Optional[bool] = True, ws_auth: Optional[bool] = False, **kwargs):
+		basic_auth: Optional[bool] = True, ws_auth: Optional[bool] = False,
+		admission_control: Optional[bool] = True, **kwargs):
 	"""Make FastAPI router object with basic API settings.
             IF basic_auth is True the endpoint will be protected by default authorization depeend method.
+            IF admission_control is True requests (WebSocket connections for ws_auth routers) are admitted
+                by admission controller after auth (load shedding, per-token concurrency limit).
                 All kwargs wiil be passed to APIRouter constructor
     """
     
@@ -19,6 +23,9 @@ def make_base_router(
 		base_kwargs["dependencies"].append(get_auth_api_token)
 	if ws_auth is True:
 		base_kwargs["dependencies"].append(validate_ws_auth_api_token)
+	if admission_control is True:
+		base_kwargs["dependencies"].append(
+			websocket_admission_control if ws_auth is True else http_admission_control)
 	if "dependencies" in kwargs:
 		del kwargs["dependencies"]
 	base_kwargs.update(kwargs)
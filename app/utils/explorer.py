@@ -1,5 +1,8 @@
 from loguru import logger
 from currencyexplorer import scrapers_manager
+from currencyexplorer.core.exchangers_scraping import (
+    UpstreamRequestPriority, UpstreamRateLimitExceededException, UpstreamUnavailableException)
+from currencyexplorer.core.monitoring import GETTER_UPDATE_ATEMPTS, phase_span
 from app.schemas.explorer import GetExplorerInfoResponse
 
 
@@ -9,17 +12,42 @@ class ScraperManagerGetter:
     """
     def __init__(
             self, exchange: str | None, pair: str | None,
-            update_atemp_if_not_exist: bool | None = True):
+            update_atemp_if_not_exist: bool | None = True,
+            base: str | None = None, quote: str | None = None):
         self.exchange = exchange
         self.pair = pair
-        self.update_atemp_if_not_exist = update_atemp_if_not_exist
+        self.base = base
+        self.quote = quote
+        # Base/quote filtered queries without pair are served from stored data only
+        #   (update atemp would refresh all pairs of exchanges)
+        self.update_atemp_if_not_exist = update_atemp_if_not_exist if (
+            pair is not None or (base is None and quote is None)) else False
         self.update_atemp_if_not_all_source = True
     
+    async def _refresh_from_upstream(self):
+        """ Refresh pair data from upstream with user-facing priority.
+                IF upstream rate limit budget is exhausted or exchange is unavailable (open circuit breaker,
+                    refresh deadline exceeded), stored data is used as is
+        """
+        with phase_span("upstream_refresh"):
+            try:
+                if self.exchange is not None:
+                    await scrapers_manager.update_from_scraper(
+                        self.exchange, pair_title=self.pair, priority=UpstreamRequestPriority.USER)
+                else:
+                    await scrapers_manager.update_all(
+                        pair_title=self.pair, priority=UpstreamRequestPriority.USER)
+            except (UpstreamRateLimitExceededException, UpstreamUnavailableException) as e:
+                logger.warning("{}: {}, using stored data".format(self.__class__.__name__, e.description))
+
     async def get(self, skip_update_atemp: bool | None = False):
         """ Make explorer response from scraping manager """
+        if skip_update_atemp is False:
+            scrapers_manager.record_pair_demand(self.exchange, self.pair)
         data = []
         if self.exchange is not None:
-            results = await scrapers_manager.get(scraper=self.exchange, pair_title=self.pair)
+            results = await scrapers_manager.get(
+                scraper=self.exchange, pair_title=self.pair, base_asset=self.base, quote_asset=self.quote)
             if isinstance(results, (list, tuple, )):
                 data.extend(results)
             elif isinstance(results, dict):
@@ -28,7 +56,8 @@ class ScraperManagerGetter:
                 data = [results]
         else:
             data_from_all_exchange = await scrapers_manager.get_all(
-                group_by_currency_pair=False, only_for_pair_title=self.pair)
+                group_by_currency_pair=False, only_for_pair_title=self.pair,
+                base_asset=self.base, quote_asset=self.quote)
             for p_data in list(data_from_all_exchange.values()):
                 if isinstance(p_data, (list, tuple,)):
                     data.extend(p_data)
@@ -48,10 +77,9 @@ class ScraperManagerGetter:
                 logger.info("{}: {} not found in {} exchange! Update atemp...".format(
                     self.__class__.__name__, self.pair, self.exchange
                 ))
-                if self.exchange is not None:
-                    await scrapers_manager.update_from_scraper(self.exchange, pair_title=self.pair)
-                else:
-                    await scrapers_manager.update_all(pair_title=self.pair)
+                GETTER_UPDATE_ATEMPTS.inc(
+                    exchange=self.exchange or "all", reason="not_found")
+                await self._refresh_from_upstream()
                 return await self.get(skip_update_atemp=True)
         
         elif len(data) > 0 and len(data) < scrapers_manager.scrapers_count and (
@@ -62,10 +90,10 @@ class ScraperManagerGetter:
             else:
                 logger.info("{}: not all sources has data, update atemp...".format(
                         self.__class__.__name__))
-                if self.exchange is not None:
-                    await scrapers_manager.update_from_scraper(self.exchange, pair_title=self.pair)
-                else:
-                    await scrapers_manager.update_all(pair_title=self.pair)
+                GETTER_UPDATE_ATEMPTS.inc(
+                    exchange=self.exchange or "all", reason="not_all_sources")
+                await self._refresh_from_upstream()
                 return await self.get(skip_update_atemp=True)
         
-        return GetExplorerInfoResponse.from_scraper_pair_data_list(data)
+        with phase_span("build_response"):
+            return GetExplorerInfoResponse.from_scraper_pair_data_list(data)
@@ -0,0 +1,37 @@
+from loguru import logger
+from currencyexplorer import config
+from currencyexplorer.core.monitoring import start_phase_timings, stop_phase_timings
+
+
+class ServerTimingMiddleware:
+    """
+        ASGI middleware for per-request phase timings.
+            Phase spans collected during request (see. phase_span) are reported in `Server-Timing` header
+                and logged for requests slower than SLOW_REQUEST_LOG_THRESHOLD
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        token = start_phase_timings()
+        phase_timings = token.var.get()
+
+        async def send_with_server_timing(message) -> None:
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", phase_timings.to_server_timing_header().encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_server_timing)
+        finally:
+            stop_phase_timings(token)
+            if config.SLOW_REQUEST_LOG_THRESHOLD is not None and (
+                    phase_timings.total >= config.SLOW_REQUEST_LOG_THRESHOLD):
+                logger.warning("Slow request {} {}: {}".format(
+                    scope.get("method"), scope.get("path"), phase_timings.to_server_timing_header()))
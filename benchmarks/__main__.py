@@ -0,0 +1,151 @@
+import os
+os.environ.setdefault("API_AUTHENTICATION_TOKEN", "benchmark")
+
+import asyncio
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import click
+from typing import Dict, Any
+
+
+@click.group()
+def cli():
+    """ Offline microbenchmarks for currency explorer (storage, manager, response building) """
+
+
+def _git_revision() -> str | None:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL).decode().strip()
+    except Exception:
+        return None
+
+
+@cli.command("run")
+@click.option("--symbols", "symbols_counts", type=int, multiple=True, default=(100, 2000, 20000),
+              show_default=True, help="Synthetic symbols count (can be passed multiple times)")
+@click.option("--backend", "backend_names", multiple=True, default=("dict", ), show_default=True,
+              help="Storage backend name (can be passed multiple times)")
+@click.option("--rounds", type=int, default=5, show_default=True)
+@click.option("--lifetime", "stored_data_lifetime", type=float, default=None,
+              help="Storage stored_data_lifetime (TTL cleanup is executed on each read if defined)")
+@click.option("--case", "cases_filter", multiple=True, help="Run only cases with this name prefix")
+@click.option("--output", type=click.Path(dir_okay=False), default=None,
+              help="Write JSON results to file (stdout by default)")
+def run_command(symbols_counts, backend_names, rounds, stored_data_lifetime, cases_filter, output):
+    """ Run benchmarks and print machine-readable JSON results """
+    from .cases import run_benchmarks, BENCHMARK_STORAGE_BACKENDS
+
+    for backend_name in backend_names:
+        if backend_name not in BENCHMARK_STORAGE_BACKENDS:
+            raise click.BadParameter("{} backend not found (aviable: {})".format(
+                backend_name, ",".join(BENCHMARK_STORAGE_BACKENDS)))
+    results = asyncio.run(run_benchmarks(
+        list(symbols_counts), list(backend_names), rounds,
+        stored_data_lifetime=stored_data_lifetime, cases_filter=list(cases_filter)))
+    report = {
+        "meta": {
+            "git_revision": _git_revision(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "timestamp": time.time(),
+        },
+        "results": results,
+    }
+    report_json = json.dumps(report, indent=2)
+    if output is None:
+        click.echo(report_json)
+    else:
+        with open(output, "w") as f:
+            f.write(report_json)
+
+
+@cli.command("compare")
+@click.argument("base_report", type=click.Path(exists=True, dir_okay=False))
+@click.argument("head_report", type=click.Path(exists=True, dir_okay=False))
+def compare_command(base_report, head_report):
+    """ Compare median timings of two JSON reports (for example, from two branches) """
+    with open(base_report) as f:
+        base = json.load(f)
+    with open(head_report) as f:
+        head = json.load(f)
+
+    def result_key(item):
+        return (item["case"], item["backend"], item["symbols_count"])
+
+    base_results = {result_key(item): item for item in base["results"]}
+    click.echo("{:<40} {:<10} {:>8} {:>14} {:>14} {:>9}".format(
+        "case", "backend", "symbols", "base us/op", "head us/op", "change"))
+    for item in head["results"]:
+        base_item = base_results.get(result_key(item))
+        if base_item is None:
+            continue
+        change = (item["median_us"] - base_item["median_us"]) / base_item["median_us"] * 100
+        click.echo("{:<40} {:<10} {:>8} {:>14.3f} {:>14.3f} {:>+8.1f}%".format(
+            item["case"], item["backend"], item["symbols_count"],
+            base_item["median_us"], item["median_us"], change))
+
+
+def _measure_import_time(module: str) -> Dict[str, Any]:
+    """ Import module in clean interpreter with `-X importtime` and return wall time and top imports """
+    measure_code = (
+        "import time; started_at = time.perf_counter(); import {}; "
+        "print(time.perf_counter() - started_at)").format(module)
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", measure_code],
+        capture_output=True, text=True, check=True, env=os.environ.copy())
+    imports = []
+    for line in process.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, package = line[len("import time:"):].split("|", 2)
+        imports.append({
+            "module": package.strip(), "self_us": int(self_us.strip()),
+            "cumulative_us": int(cumulative_us.strip())})
+    return {"wall_seconds": float(process.stdout.strip().splitlines()[-1]), "imports": imports}
+
+
+@cli.command("import-time")
+@click.option("--module", "modules", multiple=True, default=("currencyexplorer", "currencyexplorer.main"),
+              show_default=True, help="Module to import (can be passed multiple times)")
+@click.option("--repeat", type=int, default=5, show_default=True)
+@click.option("--top", type=int, default=15, show_default=True, help="Count of slowest imports in report")
+@click.option("--output", type=click.Path(dir_okay=False), default=None,
+              help="Write JSON results to file (stdout by default)")
+def import_time_command(modules, repeat, top, output):
+    """ Measure cold import time of application modules (each import in new interpreter) """
+    results = []
+    for module in modules:
+        runs = [_measure_import_time(module) for _ in range(repeat)]
+        slowest_imports = sorted(
+            runs[-1]["imports"], key=lambda item: item["cumulative_us"], reverse=True)[:top]
+        wall_timings = [run["wall_seconds"] for run in runs]
+        results.append({
+            "case": "import_time",
+            "module": module,
+            "rounds": repeat,
+            "min_seconds": min(wall_timings),
+            "median_seconds": statistics.median(wall_timings),
+            "slowest_imports": slowest_imports})
+    report_json = json.dumps({
+        "meta": {
+            "git_revision": _git_revision(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "timestamp": time.time(),
+        },
+        "results": results}, indent=2)
+    if output is None:
+        click.echo(report_json)
+    else:
+        with open(output, "w") as f:
+            f.write(report_json)
+
+
+if __name__ == "__main__":
+    cli()
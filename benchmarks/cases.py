@@ -0,0 +1,243 @@
+import random
+import statistics
+import time
+import tracemalloc
+from typing import Callable, Awaitable, Dict, List, Any, Optional
+from currencyexplorer.core.exchangers_scraping import (
+    AbstractScraperStorageBackend, CurrencyScraperAsyncSafeDictStorage, CurrencyScraperSnapshotStorage,
+    ExchangersScrapingManager)
+from currencyexplorer.core.exchangers_scraping.top_movers import TopMoversLeaderboard
+from app.scrapers import EXCHANGERS_MAPPING
+from app.schemas.explorer import GetExplorerInfoResponse
+from .synthetic import make_pair_titles, make_pair_data_list, make_binance_ticker_frame
+
+
+# Storage backends available for benchmarking: {backend_name: backend_constructor(stored_data_lifetime)}
+BENCHMARK_STORAGE_BACKENDS: Dict[str, Callable[[Optional[float]], AbstractScraperStorageBackend]] = {
+    "dict": lambda lifetime: CurrencyScraperAsyncSafeDictStorage(stored_data_lifetime=lifetime),
+    "snapshot": lambda lifetime: CurrencyScraperSnapshotStorage(stored_data_lifetime=lifetime),
+}
+
+
+class BenchmarkContext:
+    """ Synthetic data set and system objects shared between benchmark cases """
+
+    def __init__(
+            self, symbols_count: int, backend_name: str,
+            stored_data_lifetime: Optional[float] = None) -> None:
+        self.symbols_count = int(symbols_count)
+        self.backend_name = str(backend_name)
+        self.stored_data_lifetime = stored_data_lifetime
+        self.exchanges = list(EXCHANGERS_MAPPING.keys())
+        self.pair_titles = make_pair_titles(self.symbols_count)
+        self.pair_data_list = make_pair_data_list(self.exchanges, self.pair_titles)
+        self.binance_frame = make_binance_ticker_frame(self.pair_titles)
+        self.lookup_pairs = random.Random(7).choices(self.pair_titles, k=256)
+
+    def make_backend(self) -> AbstractScraperStorageBackend:
+        return BENCHMARK_STORAGE_BACKENDS[self.backend_name](self.stored_data_lifetime)
+
+    async def make_filled_backend(self) -> AbstractScraperStorageBackend:
+        backend = self.make_backend()
+        await backend.store_pair_data_list(self.pair_data_list)
+        return backend
+
+    async def make_filled_manager(self) -> ExchangersScrapingManager:
+        return ExchangersScrapingManager(
+            list(EXCHANGERS_MAPPING.values()), storage_backend=await self.make_filled_backend())
+
+
+async def _measure(
+        operation: Callable[[int], Awaitable[Any]],
+        operations_per_round: int, rounds: int,
+        measure_allocations: Optional[bool] = False) -> Dict[str, float]:
+    """ Run operation(round_index) `rounds` times and return per-operation timings in microseconds.
+            IF measure_allocations is True, one more round is executed with tracemalloc:
+                retained_bytes_per_op - memory still held by operation result,
+                peak_bytes_per_op - peak memory allocated during operation
+    """
+    rounds_timings = []
+    for round_index in range(rounds):
+        started_at = time.perf_counter()
+        await operation(round_index)
+        rounds_timings.append((time.perf_counter() - started_at) / operations_per_round * 1e6)
+    result = {
+        "operations_per_round": operations_per_round,
+        "rounds": rounds,
+        "min_us": min(rounds_timings),
+        "median_us": statistics.median(rounds_timings),
+        "max_us": max(rounds_timings),
+    }
+    if measure_allocations is True:
+        tracemalloc.start()
+        try:
+            memory_before, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            operation_result = await operation(rounds - 1)
+            memory_after, memory_peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        del operation_result
+        result["retained_bytes_per_op"] = (memory_after - memory_before) / operations_per_round
+        result["peak_bytes_per_op"] = (memory_peak - memory_before) / operations_per_round
+    return result
+
+
+async def bench_store_pair_data(ctx: BenchmarkContext, rounds: int) -> Dict[str, float]:
+    backends = [ctx.make_backend() for _ in range(rounds)]
+
+    async def operation(round_index: int) -> None:
+        backend = backends[round_index]
+        for data in ctx.pair_data_list:
+            await backend.store_pair_data(data)
+    return await _measure(operation, len(ctx.pair_data_list), rounds)
+
+
+async def bench_store_pair_data_list(ctx: BenchmarkContext, rounds: int) -> Dict[str, float]:
+    """ Store ticks by frames of 100 records to filled storage (typical ingestion batch) """
+    backends = [await ctx.make_filled_backend() for _ in range(rounds)]
+    frames = [ctx.pair_data_list[i:i + 100] for i in range(0, len(ctx.pair_data_list), 100)]
+
+    async def operation(round_index: int) -> None:
+        backend = backends[round_index]
+        for frame in frames:
+            await backend.store_pair_data_list(frame)
+    return await _measure(operation, len(ctx.pair_data_list), rounds)
+
+
+async def bench_get_pair_data(ctx: BenchmarkContext, rounds: int) -> Dict[str, float]:
+    backend = await ctx.make_filled_backend()
+    exchange = ctx.exchanges[0]
+
+    async def operation(round_index: int) -> None:
+        for pair_title in ctx.lookup_pairs:
+            await backend.get_pair_data(exchanger_uniq_name=exchange, pair_title=pair_title)
+    return await _measure(operation, len(ctx.lookup_pairs), rounds)
+
+
+async def bench_get_all_pair_filtered(ctx: BenchmarkContext, rounds: int) -> Dict[str, float]:
+    backend = await ctx.make_filled_backend()
+    lookup_pairs = ctx.lookup_pairs[:16]
+
+    async def operation(round_index: int) -> None:
+        for pair_title in lookup_pairs:
+            await backend.get_all(only_for_pair_title=pair_title)
+    return await _measure(operation, len(lookup_pairs), rounds)
+
+
+async def bench_manager_get(ctx: BenchmarkContext, rounds: int) -> Dict[str, float]:
+    manager = await ctx.make_filled_manager()
+    exchange = ctx.exchanges[0]
+
+    async def operation(round_index: int) -> None:
+        for pair_title in ctx.lookup_pairs:
+            await manager.get(scraper=exchange, pair_title=pair_title)
+    return await _measure(operation, len(ctx.lookup_pairs), rounds)
+
+
+async def bench_manager_get_all(ctx: BenchmarkContext, rounds: int) -> Dict[str, float]:
+    manager = await ctx.make_filled_manager()
+
+    async def operation(round_index: int) -> None:
+        await manager.get_all(only_for_pair_title=None, group_by_currency_pair=False)
+    return await _measure(operation, 1, rounds)
+
+
+async def bench_manager_get_all_pair_filtered(ctx: BenchmarkContext, rounds: int) -> Dict[str, float]:
+    manager = await ctx.make_filled_manager()
+    lookup_pairs = ctx.lookup_pairs[:16]
+
+    async def operation(round_index: int) -> None:
+        for pair_title in lookup_pairs:
+            await manager.get_all(only_for_pair_title=pair_title, group_by_currency_pair=False)
+    return await _measure(operation, len(lookup_pairs), rounds)
+
+
+async def bench_build_explorer_response(ctx: BenchmarkContext, rounds: int) -> Dict[str, float]:
+
+    async def operation(round_index: int) -> None:
+        GetExplorerInfoResponse.from_scraper_pair_data_list(ctx.pair_data_list)
+    return await _measure(operation, len(ctx.pair_data_list), rounds)
+
+
+async def bench_binance_tick_parser(ctx: BenchmarkContext, rounds: int) -> Dict[str, float]:
+    scraper = EXCHANGERS_MAPPING["binance"]()
+
+    async def operation(round_index: int) -> List[Any]:
+        return await scraper._ticker_response_to_data_list(
+            ctx.binance_frame,
+            use_binance_average_price=True,
+            message_title_mapping={"WeightedAvgPrice": "x", "symbol": "s"})
+    return await _measure(operation, len(ctx.binance_frame), rounds, measure_allocations=True)
+
+
+async def bench_ingest_to_response(ctx: BenchmarkContext, rounds: int) -> Dict[str, float]:
+    """ Full tick path: parse binance frame -> store to backend -> read all pairs -> build API response """
+    manager = ExchangersScrapingManager(
+        [EXCHANGERS_MAPPING["binance"]], storage_backend=ctx.make_backend())
+    scraper = await manager.get_scraper("binance")
+
+    async def operation(round_index: int) -> GetExplorerInfoResponse:
+        data_list = await scraper._ticker_response_to_data_list(
+            ctx.binance_frame,
+            use_binance_average_price=True,
+            message_title_mapping={"WeightedAvgPrice": "x", "symbol": "s"})
+        await manager._store_scraper_response(scraper, data_list)
+        stored_data = await manager.get(scraper="binance", pair_title=None)
+        return GetExplorerInfoResponse.from_scraper_pair_data_list(stored_data)
+    return await _measure(operation, len(ctx.binance_frame), rounds, measure_allocations=True)
+
+
+async def bench_top_movers_handle_stored_batch(ctx: BenchmarkContext, rounds: int) -> Dict[str, float]:
+    leaderboard = TopMoversLeaderboard()
+
+    async def operation(round_index: int) -> None:
+        leaderboard.handle_stored_batch(ctx.pair_data_list)
+    return await _measure(operation, len(ctx.pair_data_list), rounds)
+
+
+async def bench_top_movers_top(ctx: BenchmarkContext, rounds: int) -> Dict[str, float]:
+    leaderboard = TopMoversLeaderboard()
+    leaderboard.handle_stored_batch(ctx.pair_data_list)
+
+    async def operation(round_index: int) -> None:
+        leaderboard.top("5m", limit=10)
+    return await _measure(operation, 1, rounds)
+
+
+BENCHMARK_CASES: Dict[str, Callable[[BenchmarkContext, int], Awaitable[Dict[str, float]]]] = {
+    "storage.store_pair_data": bench_store_pair_data,
+    "storage.store_pair_data_list": bench_store_pair_data_list,
+    "storage.get_pair_data": bench_get_pair_data,
+    "storage.get_all_pair_filtered": bench_get_all_pair_filtered,
+    "manager.get": bench_manager_get,
+    "manager.get_all": bench_manager_get_all,
+    "manager.get_all_pair_filtered": bench_manager_get_all_pair_filtered,
+    "schemas.from_scraper_pair_data_list": bench_build_explorer_response,
+    "scrapers.binance_tick_parser": bench_binance_tick_parser,
+    "pipeline.ingest_to_response": bench_ingest_to_response,
+    "sinks.top_movers_handle_stored_batch": bench_top_movers_handle_stored_batch,
+    "sinks.top_movers_top": bench_top_movers_top,
+}
+
+
+async def run_benchmarks(
+        symbols_counts: List[int], backend_names: List[str], rounds: int,
+        stored_data_lifetime: Optional[float] = None,
+        cases_filter: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """ Run all benchmark cases for each symbols count and storage backend """
+    results = []
+    for backend_name in backend_names:
+        for symbols_count in symbols_counts:
+            ctx = BenchmarkContext(
+                symbols_count, backend_name, stored_data_lifetime=stored_data_lifetime)
+            for case_name, case in BENCHMARK_CASES.items():
+                if cases_filter and not any(case_name.startswith(f) for f in cases_filter):
+                    continue
+                case_result = await case(ctx, rounds)
+                results.append({
+                    "case": case_name,
+                    "backend": backend_name,
+                    "symbols_count": symbols_count,
+                    **case_result})
+    return results
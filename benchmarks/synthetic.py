@@ -0,0 +1,46 @@
+import random
+import time
+from typing import List, Dict, Optional
+from currencyexplorer.core.exchangers_scraping import ScraperStorageBackendPairData
+
+
+SYNTHETIC_QUOTE_ASSETS = ("USDT", "BTC", "ETH", "BNB", "EUR")
+
+
+def make_pair_titles(symbols_count: int, seed: Optional[int] = 42) -> List[str]:
+    """ Make list of uniq synthetic pair titles in COIN1_COIN2 format """
+    rnd = random.Random(seed)
+    titles = []
+    for i in range(symbols_count):
+        quote = SYNTHETIC_QUOTE_ASSETS[rnd.randrange(len(SYNTHETIC_QUOTE_ASSETS))]
+        titles.append("S{:05d}_{}".format(i, quote))
+    return titles
+
+
+def make_pair_data_list(
+        exchanges: List[str], pair_titles: List[str],
+        seed: Optional[int] = 42) -> List[ScraperStorageBackendPairData]:
+    """ Make synthetic currency rate records for each exchange/pair combination """
+    rnd = random.Random(seed)
+    now = time.time()
+    return [
+        ScraperStorageBackendPairData(
+            exchanger_uniq_name=exchange,
+            currency_pair_title=pair_title,
+            currency_rate=rnd.uniform(0.0001, 50000),
+            last_update=now)
+        for exchange in exchanges for pair_title in pair_titles]
+
+
+def make_binance_ticker_frame(pair_titles: List[str], seed: Optional[int] = 42) -> List[Dict[str, str]]:
+    """ Make synthetic all-market Binance ticker frame (`!ticker@arr` stream message) """
+    rnd = random.Random(seed)
+    frame = []
+    for pair_title in pair_titles:
+        price = rnd.uniform(0.0001, 50000)
+        frame.append({
+            "e": "24hrTicker", "E": int(time.time() * 1000),
+            "s": pair_title.replace("_", ""),
+            "x": "{:.8f}".format(price), "c": "{:.8f}".format(price),
+            "b": "{:.8f}".format(price * 0.999), "a": "{:.8f}".format(price * 1.001)})
+    return frame
@@ -1,7 +1,9 @@
 import os
 from .settings import ConfigConstructorMapper
 from .core.exchangers_scraping import *
-from binance.client import Client, AsyncClient
+from .core.exchangers_scraping.feed_recording import FeedRecorder
+from .core.exchangers_scraping.polling_scheduler import PairDemandTracker
+from .core.monitoring import STORAGE_STORED_PAIRS, EVENT_LOOP_LAG_SECONDS, EventLoopLagMonitor
 
 
 # Detect and load config object
@@ -11,11 +13,67 @@ config = CONFIG_LOADER()
 
 
 # Init currency rate scrapers manager instance
+STORAGE_BACKENDS_MAPPING = {
+    "dict": CurrencyScraperAsyncSafeDictStorage,
+    "snapshot": CurrencyScraperSnapshotStorage,
+}
+storage_backend = STORAGE_BACKENDS_MAPPING[config.STORAGE_BACKEND](
+    stored_data_lifetime=config.STORED_DATA_LIFETIME_FOR_UPDATE_ATEMP,
+    max_stored_pairs=config.STORAGE_MAX_PAIRS, access_half_life=config.STORAGE_ACCESS_HALF_LIFE)
 scrapers_manager = ExchangersScrapingManager(
     [],
-    storage_backend=CurrencyScraperAsyncSafeDictStorage(
-        stored_data_lifetime=config.STORED_DATA_LIFETIME_FOR_UPDATE_ATEMP))
+    storage_backend=storage_backend,
+    feed_recorder=None if config.FEED_RECORDING_PATH is None else FeedRecorder(
+        config.FEED_RECORDING_PATH),
+    # Pairs demand is tracked only for its consumers (adaptive polling, Binance demand streams)
+    pair_demand_tracker=PairDemandTracker(half_life=config.PAIR_DEMAND_HALF_LIFE) if (
+        config.ADAPTIVE_POLLING_ENABLED is True or config.BINANCE_DEMAND_STREAMS_ENABLED is True) else None,
+    adaptive_polling=config.ADAPTIVE_POLLING_ENABLED,
+    adaptive_polling_min_interval=config.ADAPTIVE_POLLING_MIN_INTERVAL,
+    symbol_index_cache_dir=config.SYMBOL_INDEX_CACHE_DIR,
+    symbol_index_cache_lifetime=config.SYMBOL_INDEX_CACHE_LIFETIME,
+    fetch_batch_window=config.UPSTREAM_FETCH_BATCH_WINDOW,
+    circuit_breaker_failure_threshold=config.CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+    circuit_breaker_latency_slo=config.CIRCUIT_BREAKER_LATENCY_SLO,
+    circuit_breaker_open_duration=config.CIRCUIT_BREAKER_OPEN_DURATION,
+    user_refresh_deadline=config.USER_REFRESH_DEADLINE,
+    hedge_user_refreshes=config.HEDGE_USER_REFRESHES,
+    ingest_queue_max_pairs=config.INGEST_QUEUE_MAX_PAIRS)
+STORAGE_STORED_PAIRS.set_function(lambda: scrapers_manager.stored_pairs_count)
 
 
-# Init binance API SDK
-binance_async_client = AsyncClient()
+# Init event loop lag monitor (used by API admission control)
+event_loop_lag_monitor = EventLoopLagMonitor(interval=config.EVENT_LOOP_LAG_CHECK_INTERVAL)
+EVENT_LOOP_LAG_SECONDS.set_function(lambda: event_loop_lag_monitor.lag)
+
+
+# Init warm-start storage snapshots (disabled if STORAGE_SNAPSHOT_PATH not defined)
+storage_snapshot_writer = None if config.STORAGE_SNAPSHOT_PATH is None else StorageSnapshotWriter(
+    storage_backend, config.STORAGE_SNAPSHOT_PATH, write_interval=config.STORAGE_SNAPSHOT_INTERVAL,
+    max_record_age=config.STORED_DATA_LIFETIME_FOR_UPDATE_ATEMP)
+
+
+# Init bounded in-memory rates history (disabled if RATE_HISTORY_ENABLED is False)
+rate_history = None
+if config.RATE_HISTORY_ENABLED is True:
+    from .core.exchangers_scraping.rate_history import RateHistoryBuffers
+    rate_history = RateHistoryBuffers(
+        capacity=config.RATE_HISTORY_CAPACITY, max_series=config.RATE_HISTORY_MAX_SERIES)
+    scrapers_manager.attach_stored_data_sink(rate_history)
+
+
+# Init top movers leaderboard (disabled if TOP_MOVERS_ENABLED is False)
+top_movers = None
+if config.TOP_MOVERS_ENABLED is True:
+    from .core.exchangers_scraping.top_movers import TopMoversLeaderboard
+    top_movers = TopMoversLeaderboard()
+    scrapers_manager.attach_stored_data_sink(top_movers)
+
+# Init on-disk tick journal (disabled if TICK_JOURNAL_PATH not defined)
+tick_journal = None
+if config.TICK_JOURNAL_PATH is not None:
+    from .core.exchangers_scraping.tick_journal import TickJournalWriter
+    tick_journal = TickJournalWriter(
+        config.TICK_JOURNAL_PATH, segment_max_bytes=config.TICK_JOURNAL_SEGMENT_MAX_BYTES,
+        segment_max_age=config.TICK_JOURNAL_SEGMENT_MAX_AGE, retention=config.TICK_JOURNAL_RETENTION)
+    scrapers_manager.attach_stored_data_sink(tick_journal)
@@ -1,4 +1,14 @@
 from .abstract_exchanger_scraper import AbstractExchangerScraper
-from .storage_backends import AbstractScraperStorageBackend, CurrencyScraperAsyncSafeDictStorage, ScraperStorageBackendPairData
+from .storage_backends import (
+    AbstractScraperStorageBackend, CurrencyScraperAsyncSafeDictStorage, CurrencyScraperSnapshotStorage,
+    ScraperStorageBackendPairData)
 from .scraping_manager import ExchangersScrapingManager
-from .exceptions import ExplorerPairInvalidFormatException
+from .exceptions import (
+    ExplorerPairInvalidFormatException, UpstreamRateLimitExceededException, UpstreamUnavailableException)
+from .scrapers_registry import ScraperPluginsRegistry
+from .storage_snapshots import StorageSnapshotWriter
+from .rate_limiting import UpstreamRateLimitGovernor, UpstreamRequestPriority, upstream_request_priority
+from .symbol_index import ExchangeSymbolIndex
+from .stored_data_sinks import AbstractStoredDataSink
+from .circuit_breaker import UpstreamCircuitBreaker, CircuitBreakerState
+from .storage_eviction import PairAccessFrequencyEviction
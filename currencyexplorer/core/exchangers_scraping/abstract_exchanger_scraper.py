@@ -1,6 +1,13 @@
 import asyncio
+import math
+import time
+import traceback
+from loguru import logger
 from typing import Optional, Union, List, ClassVar, Any, AsyncIterator
 from .storage_backends import (ScraperStorageBackendPairData)
+from .feed_recording import FeedRecorder
+from .rate_limiting import UpstreamRateLimitGovernor, get_exchange_rate_limit_governor
+from .symbol_index import ExchangeSymbolIndex
 from abc import ABC, abstractmethod
 
 
@@ -15,16 +22,46 @@ class AbstractExchangerScraper(ABC):
     EXCHANGER_UNIQ_NAME: ClassVar[str]
     LISTNER_AUTO_START: ClassVar[bool]
     DEFAULT_LISTNER_TIMEOUT: ClassVar[float]
+    # Upstream requests budget for demand-aware polling (see. AdaptivePollingScheduler).
+    #   IF None scraper is not polled by scheduler.
+    ADAPTIVE_POLLING_REQUESTS_PER_MINUTE: ClassVar[Optional[float]]
+    # Upstream API rate limit (token bucket: max request weight and weight refill per second).
+    #   IF None upstream requests are not limited. (see. UpstreamRateLimitGovernor)
+    RATE_LIMIT_CAPACITY: ClassVar[Optional[float]] = None
+    RATE_LIMIT_REFILL_PER_SECOND: ClassVar[Optional[float]] = None
+    # Max count of pairs fetched by one get_currencies() upstream request
+    MAX_PAIRS_PER_REQUEST: ClassVar[int] = 1
+    # Delay in seconds before next symbol index load atempt if loading failed
+    SYMBOL_INDEX_RETRY_INTERVAL: ClassVar[float] = 60
 
     def __init__(self) -> None:
+        # Readiness event is set/cleared together with _worker_running_status
+        self._listener_ready_event = asyncio.Event()
         self._worker_stop_signal: Optional[bool] = False
         self._worker_running_status: Optional[bool] = False
+        # Set by scraping manager if upstream payloads recording enabled (see. FeedRecorder)
+        self.feed_recorder: Optional[FeedRecorder] = None
+        # Set by scraping manager: clients demand for pairs (see. PairDemandTracker)
+        self.pair_demand_tracker = None
+        # Shared per exchange upstream requests governor
+        self.rate_limit_governor: Optional[UpstreamRateLimitGovernor] = None
+        if self.RATE_LIMIT_CAPACITY is not None:
+            self.rate_limit_governor = get_exchange_rate_limit_governor(
+                self.EXCHANGER_UNIQ_NAME, self.RATE_LIMIT_CAPACITY, self.RATE_LIMIT_REFILL_PER_SECOND)
+        # Exchange symbols index (see. load_symbol_index), None until loaded or if not supported
+        self.symbol_index: Optional[ExchangeSymbolIndex] = None
+        # Set by scraping manager: symbol index disk cache file and cache lifetime in seconds
+        self.symbol_index_cache_path: Optional[str] = None
+        self.symbol_index_cache_lifetime: Optional[float] = None
+        self._symbol_index_lock = asyncio.Lock()
+        self._symbol_index_retry_at: float = 0
 
     def __init_subclass__(
             cls, /, *,
             EXCHANGER_UNIQ_NAME: Optional[str] = None,
             DEFAULT_LISTNER_TIMEOUT: Optional[float] = 0.1,
-            LISTNER_AUTO_START: Optional[bool] = False, **kwargs: Any) -> None:
+            LISTNER_AUTO_START: Optional[bool] = False,
+            ADAPTIVE_POLLING_REQUESTS_PER_MINUTE: Optional[float] = None, **kwargs: Any) -> None:
         if hasattr(cls, "EXCHANGER_UNIQ_NAME") is False and EXCHANGER_UNIQ_NAME is None:
             # Generate exchaner scraper uniq_name from scraper class name if EXCHANGER_UNIQ_NAME not defined
             new_uniq_name = str(cls.__name__).lower()
@@ -37,6 +74,9 @@ class AbstractExchangerScraper(ABC):
             cls.DEFAULT_LISTNER_TIMEOUT = float(DEFAULT_LISTNER_TIMEOUT)
         if hasattr(cls, "LISTNER_AUTO_START") is False:
             cls.LISTNER_AUTO_START = LISTNER_AUTO_START
+        if hasattr(cls, "ADAPTIVE_POLLING_REQUESTS_PER_MINUTE") is False or (
+                ADAPTIVE_POLLING_REQUESTS_PER_MINUTE is not None):
+            cls.ADAPTIVE_POLLING_REQUESTS_PER_MINUTE = ADAPTIVE_POLLING_REQUESTS_PER_MINUTE
         return super().__init_subclass__(**kwargs)
 
     @abstractmethod
@@ -52,6 +92,117 @@ class AbstractExchangerScraper(ABC):
         """
         raise NotImplementedError
     
+    async def get_currencies(self, pair_titles: List[str]) -> List[ScraperStorageBackendPairData]:
+        """
+            Fetch currency rate data for several pairs.
+                By default, it uses get_currency() for each pair concurrently, SHOULD be overridden
+                    if exchange API can return several pairs by one request (see. MAX_PAIRS_PER_REQUEST)
+        """
+        responses = await asyncio.gather(*[
+            self.get_currency(pair_title=pair_title) for pair_title in pair_titles])
+        data_list = []
+        for response in responses:
+            if isinstance(response, ScraperStorageBackendPairData):
+                data_list.append(response)
+            else:
+                data_list.extend(response)
+        return data_list
+
+    @property
+    def _worker_running_status(self) -> bool:
+        return self._listener_ready_event.is_set()
+
+    @_worker_running_status.setter
+    def _worker_running_status(self, status: bool) -> None:
+        """ Listener implementations set this flag to True when listener is ready to receive updates
+                (for example, after socket connection established) and False when listener stopped.
+        """
+        if status:
+            self._listener_ready_event.set()
+        else:
+            self._listener_ready_event.clear()
+
+    async def wait_listener_ready(self, timeout: Optional[float] = None) -> bool:
+        """ Wait until currency listener is ready (see. _worker_running_status).
+                Return listener status after waiting
+        """
+        try:
+            await asyncio.wait_for(self._listener_ready_event.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+        return self.currency_listener_status
+
+    async def _acquire_upstream_request(self, weight: Optional[float] = 1) -> None:
+        """ Take request weight from exchange rate limit budget before upstream REST API call.
+                Every REST call of scraper implementation should be made after this method.
+                    Raise UpstreamRateLimitExceededException if request was dropped by governor
+        """
+        if self.rate_limit_governor is not None:
+            await self.rate_limit_governor.acquire(weight)
+
+    async def fetch_symbol_index(self) -> Optional[ExchangeSymbolIndex]:
+        """
+            This method should load exchange instruments list (markets with base and quote assets)
+                and return symbol index made from it.
+                    SHOULD be overridden if exchange symbols can't be parsed from pair title directly.
+                        Return None if symbol index is not supported by scraper.
+        """
+        return None
+
+    async def load_symbol_index(self) -> Optional[ExchangeSymbolIndex]:
+        """ Load symbol index once: from disk cache (if not expired) or from exchange (fetch_symbol_index).
+                IF loading failed scraper works without index, next atempt is made after
+                    SYMBOL_INDEX_RETRY_INTERVAL seconds
+        """
+        if self.symbol_index is not None or time.monotonic() < self._symbol_index_retry_at:
+            return self.symbol_index
+        async with self._symbol_index_lock:
+            if self.symbol_index is not None:
+                return self.symbol_index
+            try:
+                symbol_index = None
+                if self.symbol_index_cache_path is not None:
+                    symbol_index = await asyncio.to_thread(
+                        ExchangeSymbolIndex.load, self.symbol_index_cache_path,
+                        max_age=self.symbol_index_cache_lifetime)
+                if symbol_index is None:
+                    symbol_index = await self.fetch_symbol_index()
+                    if symbol_index is not None and self.symbol_index_cache_path is not None:
+                        await asyncio.to_thread(symbol_index.save, self.symbol_index_cache_path)
+            except Exception:
+                logger.warning("{}: failed to load symbol index, retry in {} seconds\n{}".format(
+                    self.EXCHANGER_UNIQ_NAME, self.SYMBOL_INDEX_RETRY_INTERVAL, traceback.format_exc()))
+                self._symbol_index_retry_at = time.monotonic() + self.SYMBOL_INDEX_RETRY_INTERVAL
+                return None
+            if symbol_index is None:
+                # Symbol index is not supported by scraper
+                self._symbol_index_retry_at = math.inf
+                return None
+            logger.info("{}: symbol index loaded ({} markets)".format(self.EXCHANGER_UNIQ_NAME, len(symbol_index)))
+            self.symbol_index = symbol_index
+            if self.feed_recorder is not None:
+                # Replay of recorded payloads needs same symbols mapping as live scraper
+                await asyncio.to_thread(self.feed_recorder.record_symbol_index, symbol_index)
+        return self.symbol_index
+
+    def _record_upstream_payload(self, payload: Any, source: str, **parse_kwargs: Any) -> None:
+        """ Write raw upstream payload to feed records log if recording enabled.
+                parse_kwargs should contain all arguments needed by parse_recorded_payload()
+                    to make same pair data objects from this payload
+        """
+        if self.feed_recorder is not None:
+            self.feed_recorder.record(self.EXCHANGER_UNIQ_NAME, source, payload, **parse_kwargs)
+
+    async def parse_recorded_payload(
+            self, payload: Any, **parse_kwargs: Any) -> Union[
+                List[ScraperStorageBackendPairData], ScraperStorageBackendPairData]:
+        """
+            This method should implement parsing of raw upstream payload recorded by
+                _record_upstream_payload() (used by ReplayExchangerScraper).
+                    SHOULD be overridden to support feed replay for specified exchanger.
+        """
+        raise NotImplementedError
+
     @property
     def currency_listener_status(self) -> bool:
         """This property method should implement logic for check currency listener process status.
@@ -0,0 +1,65 @@
+from typing import Optional, List, Dict, Tuple
+
+
+class PairAssetsIndex:
+    """ Index of stored pair titles (COIN1_COIN2) by base asset (COIN1) and quote asset (COIN2).
+            Storage backends update it when pair is added to or removed from any exchange data,
+                so filtered queries check only matched pairs instead of scanning all stored pairs.
+    """
+
+    def __init__(self) -> None:
+        # {asset: {pair_title: count of exchanges storing pair}}
+        self.__pairs_by_base: Dict[str, Dict[str, int]] = {}
+        self.__pairs_by_quote: Dict[str, Dict[str, int]] = {}
+
+    @staticmethod
+    def split_pair_title(pair_title: str) -> Tuple[str, str]:
+        base_asset, _, quote_asset = pair_title.partition("_")
+        return base_asset, quote_asset
+
+    def add_pair(self, pair_title: str) -> None:
+        """ Pair is stored for one more exchange """
+        base_asset, quote_asset = self.split_pair_title(pair_title)
+        for index, asset in ((self.__pairs_by_base, base_asset), (self.__pairs_by_quote, quote_asset)):
+            pairs = index.setdefault(asset, {})
+            pairs[pair_title] = pairs.get(pair_title, 0) + 1
+
+    def remove_pair(self, pair_title: str) -> None:
+        """ Pair is removed from one exchange data """
+        base_asset, quote_asset = self.split_pair_title(pair_title)
+        for index, asset in ((self.__pairs_by_base, base_asset), (self.__pairs_by_quote, quote_asset)):
+            pairs = index.get(asset)
+            if pairs is None or pair_title not in pairs:
+                continue
+            pairs[pair_title] -= 1
+            if pairs[pair_title] <= 0:
+                del pairs[pair_title]
+                if len(pairs) == 0:
+                    del index[asset]
+
+    def get_pair_titles(self, base_asset: Optional[str] = None, quote_asset: Optional[str] = None) -> List[str]:
+        """ Stored pair titles with specified base and/or quote asset """
+        if base_asset is not None and quote_asset is not None:
+            pair_title = "{}_{}".format(base_asset, quote_asset)
+            return [pair_title] if pair_title in self.__pairs_by_base.get(base_asset, {}) else []
+        if base_asset is not None:
+            return list(self.__pairs_by_base.get(base_asset, {}))
+        if quote_asset is not None:
+            return list(self.__pairs_by_quote.get(quote_asset, {}))
+        return [pair_title for pairs in self.__pairs_by_base.values() for pair_title in pairs]
+
+    def select(
+            self, stored_data: Dict[str, Dict[str, "ScraperStorageBackendPairData"]],
+            base_asset: Optional[str] = None, quote_asset: Optional[str] = None,
+            only_for_pair_title: Optional[str] = None) -> Dict[str, Dict[str, "ScraperStorageBackendPairData"]]:
+        """ Filter storage data ({exchange: {pair_title: pair_data}}) by assets using index """
+        pair_titles = self.get_pair_titles(base_asset, quote_asset)
+        if only_for_pair_title is not None:
+            pair_titles = [pair_title for pair_title in pair_titles if pair_title == only_for_pair_title]
+        response = {}
+        for exchanger_name, exchanger_data in stored_data.items():
+            for pair_title in pair_titles:
+                pair_data = exchanger_data.get(pair_title)
+                if pair_data is not None:
+                    response.setdefault(exchanger_name, {})[pair_title] = pair_data
+        return response
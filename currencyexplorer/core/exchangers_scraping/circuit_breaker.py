@@ -0,0 +1,157 @@
+import asyncio
+import time
+from collections import deque
+from enum import IntEnum
+from loguru import logger
+from typing import Optional, Dict, Any, Callable, Awaitable, Deque
+from .exceptions import UpstreamUnavailableException, UpstreamRateLimitExceededException
+from ..monitoring import UPSTREAM_CIRCUIT_BREAKER_STATE, UPSTREAM_CIRCUIT_BREAKER_REJECTED, UPSTREAM_HEDGED_REQUESTS
+
+
+class CircuitBreakerState(IntEnum):
+    CLOSED = 0
+    HALF_OPEN = 1
+    OPEN = 2
+
+
+class UpstreamCircuitBreaker:
+    """ Circuit breaker for upstream requests of one exchange.
+            - CLOSED: requests are executed. After `failure_threshold` consecutive failures (errors, deadline
+                timeouts or responses slower than `latency_slo` seconds) circuit is opened.
+            - OPEN: requests fail fast by UpstreamUnavailableException (callers use stored data),
+                after `open_duration` seconds circuit is half-opened.
+            - HALF_OPEN: one probe request is executed, circuit is closed if it succeeded or opened again.
+            call() can limit request by deadline and start hedged (second) request if first one is slower
+                than `hedge_quantile` of recent requests latency.
+            Local rate limit rejections (UpstreamRateLimitExceededException) are not upstream failures.
+    """
+
+    def __init__(
+            self, exchanger_uniq_name: str, failure_threshold: Optional[int] = 5,
+            latency_slo: Optional[float] = None, open_duration: Optional[float] = 10,
+            hedge_quantile: Optional[float] = 0.95, latency_window: Optional[int] = 128,
+            hedge_min_samples: Optional[int] = 20) -> None:
+        self.exchanger_uniq_name = str(exchanger_uniq_name)
+        self.failure_threshold = int(failure_threshold)
+        self.latency_slo = None if latency_slo is None else float(latency_slo)
+        self.open_duration = float(open_duration)
+        self.hedge_quantile = float(hedge_quantile)
+        self.hedge_min_samples = int(hedge_min_samples)
+        self.__state = CircuitBreakerState.CLOSED
+        self.__consecutive_failures = 0
+        self.__opened_at = 0.0
+        self.__probe_in_flight = False
+        self.__latencies: Deque[float] = deque(maxlen=latency_window)
+        UPSTREAM_CIRCUIT_BREAKER_STATE.set(self.__state, exchange=self.exchanger_uniq_name)
+
+    @property
+    def state(self) -> CircuitBreakerState:
+        if self.__state == CircuitBreakerState.OPEN and time.monotonic() - self.__opened_at >= self.open_duration:
+            self._set_state(CircuitBreakerState.HALF_OPEN)
+        return self.__state
+
+    @property
+    def hedge_delay(self) -> Optional[float]:
+        """ Latency quantile of recent successful requests (None if not enough samples) """
+        if len(self.__latencies) < self.hedge_min_samples:
+            return None
+        latencies = sorted(self.__latencies)
+        return latencies[min(int(len(latencies) * self.hedge_quantile), len(latencies) - 1)]
+
+    def _set_state(self, state: CircuitBreakerState) -> None:
+        if state != self.__state:
+            logger.warning("{}: {} circuit {} -> {}".format(
+                self.__class__.__name__, self.exchanger_uniq_name, self.__state.name, state.name))
+        self.__state = state
+        UPSTREAM_CIRCUIT_BREAKER_STATE.set(state, exchange=self.exchanger_uniq_name)
+
+    def allow_request(self) -> bool:
+        """ Check if request can be executed (take probe slot if circuit is half-open) """
+        state = self.state
+        if state == CircuitBreakerState.CLOSED:
+            return True
+        if state == CircuitBreakerState.HALF_OPEN and not self.__probe_in_flight:
+            self.__probe_in_flight = True
+            return True
+        return False
+
+    def record_success(self, latency: float) -> None:
+        self.__probe_in_flight = False
+        self.__latencies.append(latency)
+        if self.latency_slo is not None and latency > self.latency_slo:
+            return self.record_failure()
+        self.__consecutive_failures = 0
+        if self.__state != CircuitBreakerState.CLOSED:
+            self._set_state(CircuitBreakerState.CLOSED)
+
+    def record_failure(self) -> None:
+        self.__probe_in_flight = False
+        self.__consecutive_failures += 1
+        if self.__state == CircuitBreakerState.HALF_OPEN or (
+                self.__consecutive_failures >= self.failure_threshold):
+            self.__opened_at = time.monotonic()
+            self._set_state(CircuitBreakerState.OPEN)
+
+    def release(self) -> None:
+        """ Request was not executed (for example local rate limit), so it is neither success nor failure """
+        self.__probe_in_flight = False
+
+    async def call(
+            self, request: Callable[[], Awaitable[Any]], deadline: Optional[float] = None,
+            hedge: Optional[bool] = False) -> Any:
+        """ Execute upstream request through circuit breaker.
+                - deadline: max time in seconds, UpstreamUnavailableException is raised after it.
+                - hedge: start second request if first one is slower than hedge_delay (first response wins)
+        """
+        if not self.allow_request():
+            UPSTREAM_CIRCUIT_BREAKER_REJECTED.inc(exchange=self.exchanger_uniq_name)
+            raise UpstreamUnavailableException(
+                description="{} upstream circuit is open".format(self.exchanger_uniq_name))
+        started_at = time.monotonic()
+        try:
+            response = await asyncio.wait_for(
+                self._hedged_request(request) if hedge else request(), timeout=deadline)
+        except UpstreamRateLimitExceededException:
+            self.release()
+            raise
+        except asyncio.TimeoutError:
+            self.record_failure()
+            raise UpstreamUnavailableException(
+                description="{} upstream request deadline ({} seconds) exceeded".format(
+                    self.exchanger_uniq_name, deadline))
+        except asyncio.CancelledError:
+            self.release()
+            raise
+        except Exception:
+            self.record_failure()
+            raise
+        self.record_success(time.monotonic() - started_at)
+        return response
+
+    async def _hedged_request(self, request: Callable[[], Awaitable[Any]]) -> Any:
+        hedge_delay = self.hedge_delay
+        first_task = asyncio.ensure_future(request())
+        if hedge_delay is None:
+            return await first_task
+        tasks = {first_task}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=hedge_delay)
+            if len(done) == 0:
+                UPSTREAM_HEDGED_REQUESTS.inc(exchange=self.exchanger_uniq_name)
+                tasks.add(asyncio.ensure_future(request()))
+            while True:
+                done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    tasks.discard(task)
+                    if task.exception() is None or len(tasks) == 0:
+                        # First successful response (or error of last request) wins
+                        return task.result()
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "state": self.state.name.lower(),
+            "consecutive_failures": self.__consecutive_failures,
+            "hedge_delay": self.hedge_delay}
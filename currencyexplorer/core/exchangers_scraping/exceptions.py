@@ -19,3 +19,21 @@ class ExplorerPairInvalidFormatException(Exception):
         if len(pair_items) != 2:
             raise CLS(description="pair string should be in format COIN1_COIN2")
         return str(pair).upper()
+
+
+class UpstreamRateLimitExceededException(Exception):
+    def __init__(
+                self,
+                description: str | None = "upstream rate limit exceeded."
+            ) -> None:
+        self.description = description
+        super().__init__(self.description)
+
+
+class UpstreamUnavailableException(Exception):
+    def __init__(
+                self,
+                description: str | None = "upstream is unavailable."
+            ) -> None:
+        self.description = description
+        super().__init__(self.description)
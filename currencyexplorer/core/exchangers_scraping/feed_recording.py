@@ -0,0 +1,140 @@
+import asyncio
+import gzip
+import json
+import queue
+import struct
+import threading
+import time
+import traceback
+from loguru import logger
+from typing import Optional, Any, Dict, NamedTuple, Iterator
+from ..monitoring import FEED_RECORDING_DROPPED_RECORDS
+
+
+# Record header: timestamp (float64), source code (uint8), exchange name length (uint16), body length (uint32)
+FEED_RECORD_HEADER = struct.Struct("<dBHI")
+
+FEED_RECORD_SOURCES: Dict[str, int] = {"listener": 0, "fetch": 1}
+FEED_RECORD_SOURCES_BY_CODE: Dict[int, str] = {code: name for name, code in FEED_RECORD_SOURCES.items()}
+
+
+class FeedRecord(NamedTuple):
+    """ Raw upstream payload received by scraper with context required to parse it again """
+    timestamp: float
+    exchanger_uniq_name: str
+    source: str
+    payload: Any
+    parse_kwargs: Dict[str, Any]
+
+
+def feed_symbol_index_path(records_path: str, exchanger_uniq_name: str) -> str:
+    """ Path of exchange symbol index saved with feed records log (replay maps symbols same way as recording) """
+    return "{}.{}.symbols.json".format(records_path, exchanger_uniq_name)
+
+
+class FeedRecorder:
+    """ Writer of raw upstream payloads to compact on-disk log (gzip stream of length-prefixed records).
+            Records body is compact JSON: {"p": <raw payload>, "k": <scraper parse kwargs>}
+            - Payloads are passed to writer thread by bounded queue (thread is started by first record),
+                so listeners never wait for JSON encoding and compression.
+                IF queue is full payload is dropped (currencyexplorer_feed_recording_dropped_records_total metric).
+            - stop() writes pending payloads and closes log.
+    """
+
+    def __init__(
+            self, records_path: str,
+            flush_interval: Optional[float] = 1, compress_level: Optional[int] = 1,
+            max_pending_records: Optional[int] = 100000) -> None:
+        self.records_path = str(records_path)
+        self.flush_interval = flush_interval
+        self.compress_level = compress_level
+        self.records_count = 0
+        self.__queue: queue.Queue = queue.Queue(maxsize=max_pending_records)
+        self.__thread: Optional[threading.Thread] = None
+        self.__stopped = False
+
+    def record(
+            self, exchanger_uniq_name: str, source: str, payload: Any,
+            timestamp: Optional[float] = None, **parse_kwargs: Any) -> None:
+        """ Pass raw payload to writer thread (payload should not be changed after this call) """
+        if self.__stopped:
+            return
+        if self.__thread is None:
+            self.__thread = threading.Thread(target=self._writer_flow, name="feed-recorder-writer", daemon=True)
+            self.__thread.start()
+        try:
+            self.__queue.put_nowait((
+                time.time() if timestamp is None else timestamp, exchanger_uniq_name, source, payload, parse_kwargs))
+        except queue.Full:
+            FEED_RECORDING_DROPPED_RECORDS.inc()
+
+    def record_symbol_index(self, symbol_index: "ExchangeSymbolIndex") -> None:
+        """ Save exchange symbol index next to records log (see. feed_symbol_index_path) """
+        symbol_index.save(feed_symbol_index_path(self.records_path, symbol_index.exchanger_uniq_name))
+
+    async def stop(self, timeout: Optional[float] = 5) -> None:
+        """ Write pending payloads, close log and stop writer thread """
+        self.__stopped = True
+        if self.__thread is None:
+            return
+        self.__queue.put(None)
+        await asyncio.to_thread(self.__thread.join, timeout)
+        if self.__thread.is_alive():
+            logger.warning("{}: writer thread not finished in {} seconds".format(
+                self.__class__.__name__, timeout))
+        self.__thread = None
+
+    # Writer thread
+
+    def _writer_flow(self) -> None:
+        with gzip.open(self.records_path, "ab", compresslevel=self.compress_level) as records_file:
+            last_flush_at = time.monotonic()
+            while True:
+                try:
+                    item = self.__queue.get(timeout=self.flush_interval)
+                except queue.Empty:
+                    item = ()
+                if item is None:
+                    return
+                if len(item) != 0:
+                    try:
+                        self._write_record(records_file, *item)
+                    except Exception:
+                        logger.error("{}: failed to write payload\n{}".format(
+                            self.__class__.__name__, traceback.format_exc()))
+                if self.flush_interval is not None and time.monotonic() - last_flush_at >= self.flush_interval:
+                    records_file.flush()
+                    last_flush_at = time.monotonic()
+
+    def _write_record(
+            self, records_file, timestamp: float, exchanger_uniq_name: str, source: str,
+            payload: Any, parse_kwargs: Dict[str, Any]) -> None:
+        name = str(exchanger_uniq_name).encode()
+        body = json.dumps({"p": payload, "k": parse_kwargs}, separators=(",", ":")).encode()
+        records_file.write(FEED_RECORD_HEADER.pack(timestamp, FEED_RECORD_SOURCES[source], len(name), len(body)))
+        records_file.write(name)
+        records_file.write(body)
+        self.records_count += 1
+
+
+def iter_feed_records(
+        records_path: str, exchanger_uniq_name: Optional[str] = None) -> Iterator[FeedRecord]:
+    """ Iterate over records from log created by FeedRecorder (optional filter by exchange) """
+    with gzip.open(records_path, "rb") as f:
+        while True:
+            header = f.read(FEED_RECORD_HEADER.size)
+            if len(header) < FEED_RECORD_HEADER.size:
+                return
+            timestamp, source_code, name_length, body_length = FEED_RECORD_HEADER.unpack(header)
+            name = f.read(name_length).decode()
+            body = f.read(body_length)
+            if len(body) < body_length:
+                # Log was not closed correctly (last record is incomplete)
+                return
+            if exchanger_uniq_name is not None and name != exchanger_uniq_name:
+                continue
+            body_data = json.loads(body)
+            yield FeedRecord(
+                timestamp=timestamp, exchanger_uniq_name=name,
+                source=FEED_RECORD_SOURCES_BY_CODE[source_code],
+                payload=body_data["p"], parse_kwargs=body_data["k"])
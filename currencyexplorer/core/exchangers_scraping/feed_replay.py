@@ -0,0 +1,120 @@
+import asyncio
+import math
+import time
+import types
+from typing import Optional, Union, List, ClassVar, Type, Dict, AsyncIterator
+from .abstract_exchanger_scraper import AbstractExchangerScraper
+from .storage_backends import ScraperStorageBackendPairData
+from .feed_recording import iter_feed_records, feed_symbol_index_path
+from .symbol_index import ExchangeSymbolIndex
+
+
+class ReplayExchangerScraper(AbstractExchangerScraper, EXCHANGER_UNIQ_NAME="replay", LISTNER_AUTO_START=True):
+    """ Scraper that plays back raw upstream payloads recorded by FeedRecorder.
+            Payloads are parsed by source scraper (parse_recorded_payload), so ingestion works
+                exactly like with live exchange, but offline and reproducibly.
+            Use ReplayExchangerScraper.make_for() to make replay scraper type for specified exchange.
+            Source scraper maps symbols by symbol index saved with records log
+                (manager's symbol index cache is used if recording has no index).
+
+        - REPLAY_SPEED: 1 - original speed, N - N times faster, None/0 - maximum speed
+        - REPLAY_LOOP: start playback from the beginning when records ends
+    """
+
+    SOURCE_SCRAPER: ClassVar[Type[AbstractExchangerScraper]]
+    RECORDS_PATH: ClassVar[str]
+    REPLAY_SPEED: ClassVar[Optional[float]] = 1
+    REPLAY_LOOP: ClassVar[bool] = True
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._source_scraper = self.SOURCE_SCRAPER()
+        # {pair_title: ScraperStorageBackendPairData} - latest replayed data for get_currency()
+        self._replayed_data: Dict[str, ScraperStorageBackendPairData] = {}
+        self.replayed_records_count = 0
+
+    @classmethod
+    def make_for(
+            CLS, source_scraper: Type[AbstractExchangerScraper], records_path: str,
+            replay_speed: Optional[float] = 1, replay_loop: Optional[bool] = True
+            ) -> Type["ReplayExchangerScraper"]:
+        """ Make replay scraper type with same uniq name as source scraper """
+        return types.new_class(
+            "Replay{}".format(source_scraper.__name__), (CLS, ),
+            {"EXCHANGER_UNIQ_NAME": source_scraper.EXCHANGER_UNIQ_NAME},
+            lambda ns: ns.update({
+                "SOURCE_SCRAPER": source_scraper,
+                "RECORDS_PATH": str(records_path),
+                "REPLAY_SPEED": replay_speed,
+                "REPLAY_LOOP": bool(replay_loop)}))
+
+    async def load_symbol_index(self) -> Optional[ExchangeSymbolIndex]:
+        """ Load symbol index of source scraper from disk only (replay never requests exchange) """
+        if self.symbol_index is None and time.monotonic() >= self._symbol_index_retry_at:
+            async with self._symbol_index_lock:
+                index_paths = [feed_symbol_index_path(self.RECORDS_PATH, self.EXCHANGER_UNIQ_NAME)]
+                if self.symbol_index_cache_path is not None:
+                    index_paths.append(self.symbol_index_cache_path)
+                for index_path in index_paths:
+                    self.symbol_index = await asyncio.to_thread(ExchangeSymbolIndex.load, index_path)
+                    if self.symbol_index is not None:
+                        break
+                else:
+                    # Symbols are parsed from payloads without index (same as live scraper without index)
+                    self._symbol_index_retry_at = math.inf
+        self._source_scraper.symbol_index = self.symbol_index
+        return self.symbol_index
+
+    async def _parse_record(self, record) -> List[ScraperStorageBackendPairData]:
+        await self.load_symbol_index()
+        data = await self._source_scraper.parse_recorded_payload(record.payload, **record.parse_kwargs)
+        if isinstance(data, ScraperStorageBackendPairData):
+            data = [data]
+        for pair_data in data:
+            self._replayed_data[pair_data.currency_pair_title] = pair_data
+        return data
+
+    async def get_currency(
+            self, pair_title: Optional[str] = None) -> Union[
+                List[ScraperStorageBackendPairData], ScraperStorageBackendPairData]:
+        if len(self._replayed_data) == 0:
+            # Preload state from first recorded fetch before playback started
+            for record in iter_feed_records(self.RECORDS_PATH, self.EXCHANGER_UNIQ_NAME):
+                if record.source == "fetch":
+                    await self._parse_record(record)
+                    break
+        if pair_title is not None:
+            pair_data = self._replayed_data.get(pair_title)
+            return [] if pair_data is None else [pair_data]
+        return list(self._replayed_data.values())
+
+    async def attach_currency_listener(
+            self, *args,
+            delay_seconds: Optional[float] = None, max_update_iteration: Optional[int] = None,
+            **kwargs) -> AsyncIterator[List[ScraperStorageBackendPairData] | ScraperStorageBackendPairData]:
+        current_iteration_count = 0
+        self._worker_running_status = True
+        while not self._worker_stop_signal:
+            first_record_timestamp = None
+            playback_started_at = time.monotonic()
+            for record in iter_feed_records(self.RECORDS_PATH, self.EXCHANGER_UNIQ_NAME):
+                if self._worker_stop_signal:
+                    break
+                if first_record_timestamp is None:
+                    first_record_timestamp = record.timestamp
+                if self.REPLAY_SPEED:
+                    wait_seconds = playback_started_at + (
+                        record.timestamp - first_record_timestamp) / self.REPLAY_SPEED - time.monotonic()
+                    await asyncio.sleep(max(wait_seconds, 0))
+                else:
+                    await asyncio.sleep(0)
+                data = await self._parse_record(record)
+                self.replayed_records_count += 1
+                yield data
+                current_iteration_count += 1
+                if isinstance(max_update_iteration, int) and current_iteration_count >= max_update_iteration:
+                    self._worker_running_status = False
+                    return
+            if not self.REPLAY_LOOP or first_record_timestamp is None:
+                break
+        self._worker_running_status = False
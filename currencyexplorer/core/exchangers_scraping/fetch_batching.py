@@ -0,0 +1,66 @@
+import asyncio
+from typing import Optional, List, Dict, Callable, Awaitable
+from .rate_limiting import UpstreamRequestPriority, get_upstream_request_priority
+
+
+class PairsFetchBatcher:
+    """ Micro-batching of single pair refreshes for one exchange.
+            Pairs requested within `batch_window` seconds are fetched together by `fetch_pairs` callback
+                (batches are split by `max_batch_size`), same pair requested several times is fetched once.
+            Batch is fetched with highest priority of its requests (USER if any request is user-facing).
+    """
+
+    def __init__(
+            self, fetch_pairs: Callable[[List[str], UpstreamRequestPriority], Awaitable[None]],
+            batch_window: Optional[float] = 0.005, max_batch_size: Optional[int] = 1) -> None:
+        self.fetch_pairs = fetch_pairs
+        self.batch_window = float(batch_window)
+        self.max_batch_size = max(int(max_batch_size), 1)
+        # {pair_title: result future}
+        self.__pending: Dict[str, asyncio.Future] = {}
+        self.__pending_priority: Optional[UpstreamRequestPriority] = None
+        self.__flush_handle: Optional[asyncio.TimerHandle] = None
+        self.__flush_tasks = set()
+
+    async def fetch(self, pair_title: str, priority: Optional[UpstreamRequestPriority] = None) -> None:
+        """ Refresh pair with next batch. Raise exception of batch fetch if it failed """
+        loop = asyncio.get_running_loop()
+        priority = get_upstream_request_priority() if priority is None else priority
+        if self.__pending_priority is None or priority < self.__pending_priority:
+            self.__pending_priority = priority
+        future = self.__pending.get(pair_title)
+        if future is None:
+            future = self.__pending[pair_title] = loop.create_future()
+        if len(self.__pending) >= self.max_batch_size:
+            self._flush()
+        elif self.__flush_handle is None:
+            self.__flush_handle = loop.call_later(self.batch_window, self._flush)
+        # Shield: cancelled waiter should not cancel fetch for other waiters of same pair
+        await asyncio.shield(future)
+
+    def _flush(self) -> None:
+        if self.__flush_handle is not None:
+            self.__flush_handle.cancel()
+            self.__flush_handle = None
+        if len(self.__pending) == 0:
+            return
+        pending, priority = self.__pending, self.__pending_priority
+        self.__pending, self.__pending_priority = {}, None
+        task = asyncio.create_task(self._fetch_batch(pending, priority))
+        # Keep reference to task until it finished
+        self.__flush_tasks.add(task)
+        task.add_done_callback(self.__flush_tasks.discard)
+
+    async def _fetch_batch(self, pending: Dict[str, asyncio.Future], priority: UpstreamRequestPriority) -> None:
+        try:
+            await self.fetch_pairs(list(pending), priority)
+        except BaseException as e:
+            for future in pending.values():
+                if not future.done():
+                    future.set_exception(e)
+            if isinstance(e, asyncio.CancelledError):
+                raise
+        else:
+            for future in pending.values():
+                if not future.done():
+                    future.set_result(None)
@@ -0,0 +1,63 @@
+import asyncio
+from typing import Optional, List, Dict
+from .storage_backends import ScraperStorageBackendPairData
+from ..monitoring import SCRAPER_INGEST_QUEUE_DEPTH, SCRAPER_INGEST_CONFLATED_TICKS, SCRAPER_INGEST_DROPPED_TICKS
+
+
+class ConflatingIngestQueue:
+    """ Bounded queue between listener receive stage and store stage of one scraper.
+            Only latest pending update of each pair is kept (older one is replaced - conflated),
+                so queue size is bounded by count of pairs and receive stage never waits for storage.
+            IF `max_pairs` pairs are pending, oldest pending update is dropped for new pair.
+            get() returns all pending updates as one batch, None after close() when nothing is pending.
+    """
+
+    def __init__(self, exchanger_uniq_name: str, max_pairs: Optional[int] = 100000) -> None:
+        self.exchanger_uniq_name = str(exchanger_uniq_name)
+        self.max_pairs = max(int(max_pairs), 1)
+        # {pair_title: latest pending update}
+        self.__pending: Dict[str, ScraperStorageBackendPairData] = {}
+        self.__has_pending = asyncio.Event()
+        self.__closed = False
+
+    def __len__(self) -> int:
+        return len(self.__pending)
+
+    def put(self, pair_data_list: List[ScraperStorageBackendPairData]) -> None:
+        pending = self.__pending
+        conflated_count = dropped_count = 0
+        for pair_data in pair_data_list:
+            pair_title = pair_data.currency_pair_title
+            if pair_title in pending:
+                conflated_count += 1
+            elif len(pending) >= self.max_pairs:
+                del pending[next(iter(pending))]
+                dropped_count += 1
+            pending[pair_title] = pair_data
+        if conflated_count != 0:
+            SCRAPER_INGEST_CONFLATED_TICKS.inc(conflated_count, exchange=self.exchanger_uniq_name)
+        if dropped_count != 0:
+            SCRAPER_INGEST_DROPPED_TICKS.inc(dropped_count, exchange=self.exchanger_uniq_name)
+        SCRAPER_INGEST_QUEUE_DEPTH.set(len(pending), exchange=self.exchanger_uniq_name)
+        if len(pending) != 0:
+            self.__has_pending.set()
+
+    def get_nowait(self) -> List[ScraperStorageBackendPairData]:
+        """ Take all pending updates (empty list if nothing pending) """
+        pending, self.__pending = self.__pending, {}
+        self.__has_pending.clear()
+        SCRAPER_INGEST_QUEUE_DEPTH.set(0, exchange=self.exchanger_uniq_name)
+        return list(pending.values())
+
+    def close(self) -> None:
+        """ Finish queue: get() returns remaining pending updates, then None """
+        self.__closed = True
+        self.__has_pending.set()
+
+    async def get(self) -> Optional[List[ScraperStorageBackendPairData]]:
+        """ Wait for pending updates and take all of them (None if queue is closed and nothing pending) """
+        while len(self.__pending) == 0:
+            if self.__closed:
+                return None
+            await self.__has_pending.wait()
+        return self.get_nowait()
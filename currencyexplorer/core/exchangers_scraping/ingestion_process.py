@@ -0,0 +1,303 @@
+import asyncio
+import multiprocessing
+import pickle
+import traceback
+from loguru import logger
+from multiprocessing.connection import Connection
+from typing import Optional, List, Dict, Tuple, Type, Any
+from .abstract_exchanger_scraper import AbstractExchangerScraper
+from .storage_backends import AbstractScraperStorageBackend, ScraperStorageBackendPairData
+from .feed_recording import FeedRecorder
+from .polling_scheduler import PairDemandTracker
+from .scraping_manager import ExchangersScrapingManager
+
+
+# Ingested record: (exchanger_uniq_name, currency_pair_title, currency_rate, last_update, event_time)
+IngestedRecord = Tuple[str, str, Optional[float], Optional[float], Optional[float]]
+
+# Pipe messages: (message_type, payload)
+#   ingestion process -> API process: ("batch", [IngestedRecord]), ("ready", {scraper: status}), ("stopped", None)
+#   API process -> ingestion process: ("demand", [(exchange, pair_title, weight)]), ("stop", None)
+INGESTION_MESSAGE_BATCH = "batch"
+INGESTION_MESSAGE_READY = "ready"
+INGESTION_MESSAGE_STOPPED = "stopped"
+INGESTION_MESSAGE_DEMAND = "demand"
+INGESTION_MESSAGE_STOP = "stop"
+
+
+def _send_message(connection: Connection, message_type: str, payload: Any) -> None:
+    connection.send_bytes(pickle.dumps((message_type, payload), protocol=pickle.HIGHEST_PROTOCOL))
+
+
+class PipeMessageSender:
+    """ Sends messages to pipe from worker thread: pickling and blocking send (waits while pipe buffer is full)
+            are done outside of event loop. Messages are sent one by one in order of send() calls
+    """
+
+    def __init__(self, connection: Connection) -> None:
+        self.connection = connection
+        self.__lock = asyncio.Lock()
+
+    async def send(self, message_type: str, payload: Any) -> None:
+        async with self.__lock:
+            send_task = asyncio.ensure_future(
+                asyncio.to_thread(_send_message, self.connection, message_type, payload))
+            try:
+                await asyncio.shield(send_task)
+            except asyncio.CancelledError:
+                # Message is still written by thread, next message can't be sent before it ends
+                await asyncio.wait([send_task])
+                raise
+
+
+class PipeForwardingStorage(AbstractScraperStorageBackend):
+    """ Write-only storage backend of ingestion process.
+            Stored data is buffered as plain tuples and sent to API process by batches
+                (when batch is full or every flush_interval seconds). Data is never read in ingestion process.
+    """
+
+    def __init__(
+            self, connection: Connection, *args,
+            batch_max_size: Optional[int] = 5000, flush_interval: Optional[float] = 0.05, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.connection = connection
+        self.sender = PipeMessageSender(connection)
+        self.batch_max_size = int(batch_max_size)
+        self.flush_interval = float(flush_interval)
+        self.__buffer: List[IngestedRecord] = []
+
+    async def store_pair_data(self, new_or_update_data: ScraperStorageBackendPairData) -> None:
+        self.__buffer.append((
+            new_or_update_data.exchanger_uniq_name, new_or_update_data.currency_pair_title,
+            new_or_update_data.currency_rate, new_or_update_data.last_update, new_or_update_data.event_time))
+        if len(self.__buffer) >= self.batch_max_size:
+            await self.flush()
+
+    async def flush(self) -> None:
+        """ Send buffered records to API process """
+        if len(self.__buffer) == 0:
+            return
+        batch, self.__buffer = self.__buffer, []
+        await self.sender.send(INGESTION_MESSAGE_BATCH, batch)
+
+    async def run_flusher(self) -> None:
+        """ Periodically flush buffer until cancelled """
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+
+async def _ingestion_process_flow(
+        connection: Connection, scraper_types: List[Type[AbstractExchangerScraper]],
+        manager_kwargs: Dict[str, Any], batch_max_size: int, flush_interval: float,
+        feed_recording_path: Optional[str], pair_demand_half_life: float,
+        wait_ready_timeout: Optional[float], stop_timeout: Optional[float],
+        restart_backoff_min: float, restart_backoff_max: float) -> None:
+    storage_backend = PipeForwardingStorage(
+        connection, batch_max_size=batch_max_size, flush_interval=flush_interval)
+    pair_demand_tracker = PairDemandTracker(half_life=pair_demand_half_life)
+    manager = ExchangersScrapingManager(
+        scraper_types, storage_backend=storage_backend,
+        feed_recorder=None if feed_recording_path is None else FeedRecorder(feed_recording_path),
+        pair_demand_tracker=pair_demand_tracker, **manager_kwargs)
+    flusher_task = asyncio.create_task(storage_backend.run_flusher(), name="ingestion-flusher")
+    await manager.load_symbol_indexes()
+
+    await manager.run_active_updater(
+        restart_backoff_min=restart_backoff_min, restart_backoff_max=restart_backoff_max)
+    update_all_result, scraper_status_mapping = await asyncio.gather(
+        manager.update_all(), manager.wait_until_ready(timeout=wait_ready_timeout), return_exceptions=True)
+    if isinstance(update_all_result, Exception):
+        logger.error("Ingestion process: initial update failed: {}".format(update_all_result))
+    if isinstance(scraper_status_mapping, Exception):
+        raise scraper_status_mapping
+    await storage_backend.flush()
+    await storage_backend.sender.send(INGESTION_MESSAGE_READY, scraper_status_mapping)
+
+    # Control messages from API process
+    while True:
+        if not await asyncio.to_thread(connection.poll, 0.5):
+            continue
+        message_type, payload = pickle.loads(connection.recv_bytes())
+        if message_type == INGESTION_MESSAGE_DEMAND:
+            for exchange, pair_title, weight in payload:
+                pair_demand_tracker.record(exchange, pair_title, weight=weight)
+        elif message_type == INGESTION_MESSAGE_STOP:
+            break
+
+    await manager.stop_active_updater(timeout=stop_timeout)
+    flusher_task.cancel()
+    await asyncio.gather(flusher_task, return_exceptions=True)
+    await storage_backend.flush()
+    if manager.feed_recorder is not None:
+        await manager.feed_recorder.stop(timeout=stop_timeout)
+    await storage_backend.sender.send(INGESTION_MESSAGE_STOPPED, None)
+
+
+def run_ingestion_process(connection: Connection, *args, **kwargs) -> None:
+    """ Ingestion process entry point (should be importable, process is started with spawn method) """
+    try:
+        asyncio.run(_ingestion_process_flow(connection, *args, **kwargs))
+    except KeyboardInterrupt:
+        pass
+    except Exception:
+        logger.error("Ingestion process crashed!\n{}".format(traceback.format_exc()))
+        raise
+    finally:
+        connection.close()
+
+
+class IngestionProcess:
+    """ Run scraper listeners of scraping manager in separate process, so upstream frames parsing
+            and validation don't share event loop with API requests.
+            - Ingestion process runs own ExchangersScrapingManager with PipeForwardingStorage backend
+            - Parsed data is received by batches and applied to API process manager storage in bulk
+                (see. ExchangersScrapingManager.store_ingested_batch)
+            - Pairs demand recorded in API process is forwarded to ingestion process (demand-aware polling)
+            On-demand refreshes (update_from_scraper) are still executed by API process scrapers.
+    """
+
+    def __init__(
+            self, manager: ExchangersScrapingManager,
+            scraper_types: List[Type[AbstractExchangerScraper]],
+            batch_max_size: Optional[int] = 5000, flush_interval: Optional[float] = 0.05,
+            feed_recording_path: Optional[str] = None, pair_demand_half_life: Optional[float] = 300,
+            demand_forward_interval: Optional[float] = 1) -> None:
+        self.manager = manager
+        self.scraper_types = list(scraper_types)
+        self.batch_max_size = batch_max_size
+        self.flush_interval = flush_interval
+        self.feed_recording_path = feed_recording_path
+        self.pair_demand_half_life = pair_demand_half_life
+        self.demand_forward_interval = float(demand_forward_interval)
+        self.__process: Optional[multiprocessing.Process] = None
+        self.__connection: Optional[Connection] = None
+        self.__sender: Optional[PipeMessageSender] = None
+        self.__reader_task: Optional[asyncio.Task] = None
+        self.__demand_forward_task: Optional[asyncio.Task] = None
+        self.__ready_future: Optional[asyncio.Future] = None
+        self.__stopped_event = asyncio.Event()
+        self.__pending_demand: Dict[Tuple[Optional[str], str], float] = {}
+
+    @property
+    def is_alive(self) -> bool:
+        return self.__process is not None and self.__process.is_alive()
+
+    def start(
+            self, wait_ready_timeout: Optional[float] = None, stop_timeout: Optional[float] = None,
+            restart_backoff_min: Optional[float] = 1, restart_backoff_max: Optional[float] = 60) -> None:
+        """ Spawn ingestion process and start receiving batches from it """
+        if self.is_alive:
+            return
+        api_connection, process_connection = multiprocessing.Pipe(duplex=True)
+        self.__process = multiprocessing.get_context("spawn").Process(
+            target=run_ingestion_process,
+            args=(
+                process_connection, self.scraper_types,
+                {
+                    "adaptive_polling": self.manager.adaptive_polling,
+                    "adaptive_polling_min_interval": self.manager.adaptive_polling_min_interval,
+                    "symbol_index_cache_dir": self.manager.symbol_index_cache_dir,
+                    "symbol_index_cache_lifetime": self.manager.symbol_index_cache_lifetime,
+                    "fetch_batch_window": self.manager.fetch_batch_window},
+                self.batch_max_size, self.flush_interval, self.feed_recording_path,
+                self.pair_demand_half_life, wait_ready_timeout, stop_timeout,
+                restart_backoff_min, restart_backoff_max),
+            name="currencyexplorer-ingestion", daemon=True)
+        self.__process.start()
+        process_connection.close()
+        self.__connection = api_connection
+        self.__sender = PipeMessageSender(api_connection)
+        self.__ready_future = asyncio.get_running_loop().create_future()
+        self.__stopped_event.clear()
+        self.__reader_task = asyncio.create_task(self._reader(), name="ingestion-reader")
+        self.__demand_forward_task = asyncio.create_task(
+            self._demand_forwarder(), name="ingestion-demand-forwarder")
+        logger.info("{}: ingestion process started (pid {})".format(
+            self.__class__.__name__, self.__process.pid))
+
+    def _receive_message(self) -> Optional[Tuple[str, Any]]:
+        """ Blocking receive (executed in thread): unpickling is done outside of event loop """
+        if not self.__connection.poll(0.5):
+            return None
+        return pickle.loads(self.__connection.recv_bytes())
+
+    async def _reader(self) -> None:
+        while True:
+            try:
+                message = await asyncio.to_thread(self._receive_message)
+            except (EOFError, OSError):
+                logger.error("{}: ingestion process connection closed".format(self.__class__.__name__))
+                break
+            if message is None:
+                if not self.is_alive:
+                    logger.error("{}: ingestion process exited (code {})".format(
+                        self.__class__.__name__, self.__process.exitcode))
+                    break
+                continue
+            message_type, payload = message
+            if message_type == INGESTION_MESSAGE_BATCH:
+                try:
+                    await self.manager.store_ingested_batch(payload)
+                except Exception:
+                    logger.error("{}: failed to store ingested batch\n{}".format(
+                        self.__class__.__name__, traceback.format_exc()))
+            elif message_type == INGESTION_MESSAGE_READY:
+                if not self.__ready_future.done():
+                    self.__ready_future.set_result(payload)
+            elif message_type == INGESTION_MESSAGE_STOPPED:
+                break
+        self.__stopped_event.set()
+        if not self.__ready_future.done():
+            self.__ready_future.set_result({
+                scraper_type.EXCHANGER_UNIQ_NAME: False for scraper_type in self.scraper_types})
+
+    def record_pair_demand(self, exchange: Optional[str], pair_title: str, weight: Optional[float] = 1) -> None:
+        """ Queue client request for pair to be forwarded to ingestion process """
+        key = (exchange, pair_title)
+        self.__pending_demand[key] = self.__pending_demand.get(key, 0) + weight
+
+    async def _demand_forwarder(self) -> None:
+        while True:
+            await asyncio.sleep(self.demand_forward_interval)
+            if len(self.__pending_demand) == 0 or not self.is_alive:
+                continue
+            pending_demand, self.__pending_demand = self.__pending_demand, {}
+            try:
+                await self.__sender.send(INGESTION_MESSAGE_DEMAND, [
+                    (exchange, pair_title, weight) for (exchange, pair_title), weight in pending_demand.items()])
+            except (BrokenPipeError, OSError):
+                logger.warning("{}: failed to forward pairs demand".format(self.__class__.__name__))
+
+    async def wait_until_ready(self, timeout: Optional[float] = None) -> Dict[str, bool]:
+        """ Wait until ingestion process scrapers are ready. Return dict like {scraper_uniq_name: status} """
+        try:
+            return await asyncio.wait_for(asyncio.shield(self.__ready_future), timeout=timeout)
+        except asyncio.TimeoutError:
+            return {scraper_type.EXCHANGER_UNIQ_NAME: False for scraper_type in self.scraper_types}
+
+    async def stop(self, timeout: Optional[float] = None) -> None:
+        """ Send stop signal to ingestion process and wait until it finish (process is killed after timeout) """
+        if self.__process is None:
+            return
+        if self.__demand_forward_task is not None:
+            self.__demand_forward_task.cancel()
+            await asyncio.gather(self.__demand_forward_task, return_exceptions=True)
+        if self.is_alive:
+            try:
+                await self.__sender.send(INGESTION_MESSAGE_STOP, None)
+            except (BrokenPipeError, OSError):
+                pass
+            try:
+                await asyncio.wait_for(self.__stopped_event.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                logger.warning("{}: ingestion process stop timeout".format(self.__class__.__name__))
+        await asyncio.to_thread(self.__process.join, timeout)
+        if self.__process.is_alive():
+            self.__process.terminate()
+            await asyncio.to_thread(self.__process.join)
+        if self.__reader_task is not None:
+            self.__reader_task.cancel()
+            await asyncio.gather(self.__reader_task, return_exceptions=True)
+        self.__connection.close()
+        self.__process = None
@@ -0,0 +1,173 @@
+import asyncio
+import math
+import time
+import traceback
+from loguru import logger
+from typing import Optional, Dict, Tuple, List, Callable, Awaitable
+from .abstract_exchanger_scraper import AbstractExchangerScraper
+
+
+class PairDemandTracker:
+    """ Exponentially decayed counters of client requests per (exchange, pair).
+            Requests without exchange (exchange is None) count as demand for pair on all exchanges.
+            Not more than `max_pairs` pairs are tracked: IF tracker is full, forgotten pairs are removed
+                (not more often than once per `half_life / 10` seconds) and new pair is not recorded
+                    if all tracked pairs are still requested (pair titles come from clients).
+    """
+
+    def __init__(
+            self, half_life: Optional[float] = 300, max_pairs: Optional[int] = 10000,
+            min_score: Optional[float] = 0.01) -> None:
+        self.half_life = float(half_life)
+        self.max_pairs = max(int(max_pairs), 1)
+        self.min_score = float(min_score)
+        # {(exchange | None, pair_title): (score, last_update_monotonic)}
+        self.__scores: Dict[Tuple[Optional[str], str], Tuple[float, float]] = {}
+        self.__next_prune_at = 0.0
+
+    def __len__(self) -> int:
+        return len(self.__scores)
+
+    def _decayed(self, score: float, updated_at: float, now: float) -> float:
+        return score * math.pow(0.5, (now - updated_at) / self.half_life)
+
+    def _prune(self, now: float) -> None:
+        """ Remove forgotten pairs (decayed score < min_score) """
+        for key, (score, updated_at) in list(self.__scores.items()):
+            if self._decayed(score, updated_at, now) < self.min_score:
+                del self.__scores[key]
+
+    def record(self, exchange: Optional[str], pair_title: str, weight: Optional[float] = 1) -> None:
+        """ Record client request for pair (cheap: one dict lookup and one pow) """
+        now = time.monotonic()
+        key = (exchange, pair_title)
+        current = self.__scores.get(key)
+        if current is None and len(self.__scores) >= self.max_pairs:
+            if now < self.__next_prune_at:
+                return
+            self.__next_prune_at = now + self.half_life / 10
+            self._prune(now)
+            if len(self.__scores) >= self.max_pairs:
+                return
+        score = weight if current is None else self._decayed(current[0], current[1], now) + weight
+        self.__scores[key] = (score, now)
+
+    def get_demand(self, exchange: str) -> Dict[str, float]:
+        """ Return current demand scores for exchange: {pair_title: score}.
+                Forgotten pairs (score < min_score) are removed from tracker
+        """
+        now = time.monotonic()
+        demand: Dict[str, float] = {}
+        for key, (score, updated_at) in list(self.__scores.items()):
+            key_exchange, pair_title = key
+            score = self._decayed(score, updated_at, now)
+            if score < self.min_score:
+                del self.__scores[key]
+                continue
+            if key_exchange is None or key_exchange == exchange:
+                demand[pair_title] = demand.get(pair_title, 0) + score
+        return demand
+
+    def hot_pairs(self, exchange: str, limit: Optional[int] = None) -> List[str]:
+        """ Return pairs ordered by demand (most requested first) """
+        demand = self.get_demand(exchange)
+        return sorted(demand, key=demand.get, reverse=True)[:limit]
+
+
+class AdaptivePollingScheduler:
+    """ Demand-aware polling of REST-polling scraper within request budget.
+            - All pairs are refreshed by one full request every `full_refresh_interval` seconds.
+            - Budget left after full refreshes is split between requested pairs proportionally to demand,
+                so hot pairs are polled more often (not more often than `min_interval`),
+                    cold pairs are covered only by full refreshes.
+            - Requests are limited by token bucket with `requests_per_minute` refill rate.
+            - Due pairs are fetched together by `poll_pairs` callback (batched where exchange supports it).
+    """
+
+    def __init__(
+            self, scraper: AbstractExchangerScraper, demand_tracker: PairDemandTracker,
+            requests_per_minute: float, full_refresh_interval: float,
+            poll_pairs: Callable[[AbstractExchangerScraper, Optional[List[str]]], Awaitable[int]],
+            min_interval: Optional[float] = 2, max_pairs_per_request: Optional[int] = 1) -> None:
+        self.scraper = scraper
+        self.demand_tracker = demand_tracker
+        self.requests_per_minute = float(requests_per_minute)
+        self.full_refresh_interval = float(full_refresh_interval)
+        self.min_interval = float(min_interval)
+        self.max_pairs_per_request = max(int(max_pairs_per_request), 1)
+        self.poll_pairs = poll_pairs
+        self.__tokens = 1.0
+        self.__tokens_updated_at = time.monotonic()
+        self.__next_full_refresh_at = time.monotonic()
+        # {pair_title: next_poll_at_monotonic}
+        self.__next_poll_at: Dict[str, float] = {}
+        self.pair_intervals: Dict[str, float] = {}
+
+    def _refill_tokens(self, now: float) -> float:
+        self.__tokens = min(
+            self.__tokens + (now - self.__tokens_updated_at) * self.requests_per_minute / 60,
+            max(self.requests_per_minute / 60, 1))
+        self.__tokens_updated_at = now
+        return self.__tokens
+
+    def calculate_pair_intervals(self) -> Dict[str, float]:
+        """ Split targeted polls budget between pairs proportionally to their demand """
+        demand = self.demand_tracker.get_demand(self.scraper.EXCHANGER_UNIQ_NAME)
+        full_refresh_requests_per_minute = 60 / self.full_refresh_interval
+        targeted_requests_per_minute = max(
+            self.requests_per_minute - full_refresh_requests_per_minute, 0) * self.max_pairs_per_request
+        total_demand = sum(demand.values())
+        intervals = {}
+        if targeted_requests_per_minute == 0 or total_demand == 0:
+            return intervals
+        for pair_title, score in demand.items():
+            pair_interval = max(60 / (targeted_requests_per_minute * score / total_demand), self.min_interval)
+            if pair_interval < self.full_refresh_interval:
+                intervals[pair_title] = pair_interval
+        return intervals
+
+    async def _take_token(self) -> None:
+        while self._refill_tokens(time.monotonic()) < 1:
+            await asyncio.sleep((1 - self.__tokens) * 60 / self.requests_per_minute)
+        self.__tokens -= 1
+
+    async def poll_once(self) -> None:
+        """ Execute all due polls (full refresh and/or targeted hot pairs polls) """
+        now = time.monotonic()
+        if now >= self.__next_full_refresh_at:
+            await self._take_token()
+            self.__next_full_refresh_at = time.monotonic() + self.full_refresh_interval
+            await self.poll_pairs(self.scraper, None)
+
+        self.pair_intervals = self.calculate_pair_intervals()
+        now = time.monotonic()
+        due_pairs = [
+            pair_title for pair_title in self.pair_intervals
+            if self.__next_poll_at.get(pair_title, 0) <= now]
+        for pair_title in list(self.__next_poll_at):
+            if pair_title not in self.pair_intervals:
+                del self.__next_poll_at[pair_title]
+        for batch_start in range(0, len(due_pairs), self.max_pairs_per_request):
+            batch = due_pairs[batch_start:batch_start + self.max_pairs_per_request]
+            await self._take_token()
+            for pair_title in batch:
+                self.__next_poll_at[pair_title] = time.monotonic() + self.pair_intervals[pair_title]
+            await self.poll_pairs(self.scraper, batch)
+
+    def seconds_to_next_poll(self) -> float:
+        next_poll_at = min([self.__next_full_refresh_at] + list(self.__next_poll_at.values()))
+        return min(max(next_poll_at - time.monotonic(), 0.05), self.min_interval)
+
+    async def run(self) -> None:
+        """ Polling loop (works until scraper stop signal) """
+        self.scraper._worker_running_status = True
+        try:
+            while not self.scraper._worker_stop_signal:
+                try:
+                    await self.poll_once()
+                except Exception:
+                    logger.error("{}: {} poll failed\n{}".format(
+                        self.__class__.__name__, self.scraper.EXCHANGER_UNIQ_NAME, traceback.format_exc()))
+                await asyncio.sleep(self.seconds_to_next_poll())
+        finally:
+            self.scraper._worker_running_status = False
@@ -0,0 +1,122 @@
+import numpy as np
+from loguru import logger
+from typing import Optional, List, Dict, Tuple, NamedTuple
+from .storage_backends import ScraperStorageBackendPairData
+from .stored_data_sinks import AbstractStoredDataSink
+
+
+class RateHistoryCandles(NamedTuple):
+    """ OHLC buckets (arrays of same length, sorted by bucket start timestamp) """
+    timestamps: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    ticks_count: np.ndarray
+
+
+class _RateHistorySeries:
+    """ Ring buffer of (timestamp, rate) points of one (exchange, pair) """
+    __slots__ = ("timestamps", "rates", "position", "count")
+
+    def __init__(self, capacity: int) -> None:
+        self.timestamps = np.empty(capacity, dtype=np.float64)
+        self.rates = np.empty(capacity, dtype=np.float64)
+        self.position = 0
+        self.count = 0
+
+    def append(self, timestamp: float, rate: float) -> None:
+        self.timestamps[self.position] = timestamp
+        self.rates[self.position] = rate
+        self.position = (self.position + 1) % len(self.timestamps)
+        if self.count < len(self.timestamps):
+            self.count += 1
+
+    def ordered(self) -> Tuple[np.ndarray, np.ndarray]:
+        """ Points from oldest to newest (copy) """
+        if self.count < len(self.timestamps):
+            return self.timestamps[:self.count].copy(), self.rates[:self.count].copy()
+        return (
+            np.concatenate((self.timestamps[self.position:], self.timestamps[:self.position])),
+            np.concatenate((self.rates[self.position:], self.rates[:self.position])))
+
+
+class RateHistoryBuffers(AbstractStoredDataSink):
+    """ Bounded in-memory history of stored currency rates.
+            - Fixed size ring buffer (preallocated NumPy arrays of timestamps and rates) for each
+                (exchange, pair), filled as ticks are stored by scraping manager.
+            - Not more than `max_series` buffers are allocated, so memory usage is bounded:
+                max_series * capacity * 16 bytes. New pairs over limit are not tracked.
+            - get_candles() returns OHLC buckets of requested resolution (vectorized downsampling).
+    """
+
+    def __init__(self, capacity: Optional[int] = 1024, max_series: Optional[int] = 4096) -> None:
+        self.capacity = int(capacity)
+        self.max_series = int(max_series)
+        # {(exchanger_uniq_name, pair_title): _RateHistorySeries}
+        self.__series: Dict[Tuple[str, str], _RateHistorySeries] = {}
+        self.__limit_reached_logged = False
+
+    @property
+    def series_count(self) -> int:
+        return len(self.__series)
+
+    @property
+    def max_memory_bytes(self) -> int:
+        """ Max memory of all buffers (timestamps and rates arrays) """
+        return self.max_series * self.capacity * 2 * np.dtype(np.float64).itemsize
+
+    def handle_stored_batch(self, pair_data_list: List[ScraperStorageBackendPairData]) -> None:
+        for pair_data in pair_data_list:
+            if pair_data.currency_rate is None or pair_data.last_update is None:
+                continue
+            key = (pair_data.exchanger_uniq_name, pair_data.currency_pair_title)
+            series = self.__series.get(key)
+            if series is None:
+                if len(self.__series) >= self.max_series:
+                    if not self.__limit_reached_logged:
+                        self.__limit_reached_logged = True
+                        logger.warning("{}: max series count ({}) reached, new pairs are not tracked".format(
+                            self.__class__.__name__, self.max_series))
+                    continue
+                series = self.__series[key] = _RateHistorySeries(self.capacity)
+            series.append(pair_data.last_update, pair_data.currency_rate)
+
+    def get_exchanges(self, pair_title: str) -> List[str]:
+        """ Exchanges which have history for pair """
+        return [exchange for exchange, series_pair_title in self.__series if series_pair_title == pair_title]
+
+    def get_candles(
+            self, exchanger_uniq_name: str, pair_title: str, resolution: float,
+            since: Optional[float] = None, until: Optional[float] = None) -> Optional[RateHistoryCandles]:
+        """ OHLC buckets of `resolution` seconds (bucket start timestamp is multiple of resolution).
+                Return None if pair history not found
+        """
+        series = self.__series.get((exchanger_uniq_name, pair_title))
+        if series is None:
+            return None
+        timestamps, rates = series.ordered()
+        if len(timestamps) > 1 and np.any(np.diff(timestamps) < 0):
+            order = np.argsort(timestamps, kind="stable")
+            timestamps, rates = timestamps[order], rates[order]
+        if since is not None or until is not None:
+            mask = np.ones(len(timestamps), dtype=bool)
+            if since is not None:
+                mask &= timestamps >= since
+            if until is not None:
+                mask &= timestamps < until
+            timestamps, rates = timestamps[mask], rates[mask]
+        if len(timestamps) == 0:
+            empty = np.empty(0, dtype=np.float64)
+            return RateHistoryCandles(empty, empty, empty, empty, empty, np.empty(0, dtype=np.int64))
+
+        buckets = np.floor(timestamps / resolution)
+        bucket_starts = np.flatnonzero(np.concatenate(([True], buckets[1:] != buckets[:-1])))
+        bucket_ends = np.append(bucket_starts[1:], len(timestamps))
+        return RateHistoryCandles(
+            timestamps=buckets[bucket_starts] * resolution,
+            open=rates[bucket_starts],
+            high=np.maximum.reduceat(rates, bucket_starts),
+            low=np.minimum.reduceat(rates, bucket_starts),
+            close=rates[bucket_ends - 1],
+            ticks_count=bucket_ends - bucket_starts)
@@ -0,0 +1,125 @@
+import asyncio
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import Optional, Dict, Iterator
+from .exceptions import UpstreamRateLimitExceededException
+from ..monitoring import UPSTREAM_RATE_LIMIT_REMAINING, UPSTREAM_RATE_LIMIT_REJECTED
+
+
+class UpstreamRequestPriority(IntEnum):
+    """ Priority of upstream request: user-facing requests are served before background refreshes """
+    USER = 0
+    BACKGROUND = 1
+
+
+_current_upstream_request_priority: ContextVar[UpstreamRequestPriority] = ContextVar(
+    "currencyexplorer_upstream_request_priority", default=UpstreamRequestPriority.BACKGROUND)
+
+
+@contextmanager
+def upstream_request_priority(priority: UpstreamRequestPriority) -> Iterator[None]:
+    """ Set priority for all upstream requests made inside context block """
+    token = _current_upstream_request_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_upstream_request_priority.reset(token)
+
+
+def get_upstream_request_priority() -> UpstreamRequestPriority:
+    return _current_upstream_request_priority.get()
+
+
+class UpstreamRateLimitGovernor:
+    """ Token bucket for upstream API requests of one exchange with requests weights.
+            - USER priority requests can use whole bucket and wait up to `user_max_wait` seconds for tokens.
+            - BACKGROUND priority requests can't use `background_reserve` part of bucket, wait only up to
+                `background_max_wait` seconds and never take tokens while user requests are waiting.
+            IF request can't get tokens in time UpstreamRateLimitExceededException is raised (request dropped)
+    """
+
+    def __init__(
+            self, exchanger_uniq_name: str, capacity: float, refill_per_second: float,
+            background_reserve: Optional[float] = 0.2, user_max_wait: Optional[float] = 5,
+            background_max_wait: Optional[float] = 1) -> None:
+        self.exchanger_uniq_name = str(exchanger_uniq_name)
+        self.capacity = float(capacity)
+        self.refill_per_second = float(refill_per_second)
+        self.background_reserve = float(background_reserve)
+        self.user_max_wait = float(user_max_wait)
+        self.background_max_wait = float(background_max_wait)
+        self.__tokens = self.capacity
+        self.__updated_at = time.monotonic()
+        self.__user_waiters = 0
+
+    @property
+    def remaining(self) -> float:
+        """ Currently available request weight """
+        now = time.monotonic()
+        self.__tokens = min(self.capacity, self.__tokens + (now - self.__updated_at) * self.refill_per_second)
+        self.__updated_at = now
+        return self.__tokens
+
+    def _required_tokens(self, weight: float, priority: UpstreamRequestPriority) -> float:
+        if priority == UpstreamRequestPriority.USER:
+            return weight
+        return weight + self.capacity * self.background_reserve
+
+    def _try_acquire(self, weight: float, priority: UpstreamRequestPriority) -> bool:
+        if priority != UpstreamRequestPriority.USER and self.__user_waiters > 0:
+            return False
+        if self.remaining < self._required_tokens(weight, priority):
+            return False
+        self.__tokens -= weight
+        UPSTREAM_RATE_LIMIT_REMAINING.set(self.__tokens, exchange=self.exchanger_uniq_name)
+        return True
+
+    async def acquire(self, weight: Optional[float] = 1, priority: Optional[UpstreamRequestPriority] = None) -> None:
+        """ Take `weight` tokens for upstream request (priority from context if not passed) """
+        priority = get_upstream_request_priority() if priority is None else priority
+        if weight > self.capacity:
+            raise ValueError("request weight {} is bigger than {} rate limit capacity".format(
+                weight, self.exchanger_uniq_name))
+        if self._try_acquire(weight, priority):
+            return
+        max_wait = self.user_max_wait if priority == UpstreamRequestPriority.USER else self.background_max_wait
+        deadline = time.monotonic() + max_wait
+        if priority == UpstreamRequestPriority.USER:
+            self.__user_waiters += 1
+        try:
+            while True:
+                wait_seconds = max(
+                    (self._required_tokens(weight, priority) - self.remaining) / self.refill_per_second, 0.01)
+                if time.monotonic() + wait_seconds > deadline:
+                    UPSTREAM_RATE_LIMIT_REJECTED.inc(
+                        exchange=self.exchanger_uniq_name, priority=priority.name.lower())
+                    raise UpstreamRateLimitExceededException(
+                        description="{} upstream rate limit exceeded ({} priority request dropped)".format(
+                            self.exchanger_uniq_name, priority.name.lower()))
+                await asyncio.sleep(wait_seconds)
+                if self._try_acquire(weight, priority):
+                    return
+        finally:
+            if priority == UpstreamRequestPriority.USER:
+                self.__user_waiters -= 1
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            "remaining": self.remaining,
+            "capacity": self.capacity,
+            "refill_per_second": self.refill_per_second}
+
+
+_exchange_rate_limit_governors: Dict[str, UpstreamRateLimitGovernor] = {}
+
+
+def get_exchange_rate_limit_governor(
+        exchanger_uniq_name: str, capacity: float, refill_per_second: float) -> UpstreamRateLimitGovernor:
+    """ Get shared (per process) rate limit governor for exchange """
+    governor = _exchange_rate_limit_governors.get(exchanger_uniq_name)
+    if governor is None:
+        governor = _exchange_rate_limit_governors[exchanger_uniq_name] = UpstreamRateLimitGovernor(
+            exchanger_uniq_name, capacity, refill_per_second)
+    return governor
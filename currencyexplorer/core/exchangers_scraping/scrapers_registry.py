@@ -0,0 +1,54 @@
+from collections.abc import Mapping
+from importlib import import_module
+from importlib.metadata import entry_points
+from typing import Optional, Dict, Type, Iterator
+from .abstract_exchanger_scraper import AbstractExchangerScraper
+
+
+class ScraperPluginsRegistry(Mapping):
+    """ Lazy registry of exchanger scrapers: {EXCHANGER_UNIQ_NAME: scraper type}.
+            Scrapers are declared by manifest {uniq_name: "module.path:ClassName"} and/or by package
+                entry points group, so names are known without importing scraper modules.
+            Scraper module is imported only when scraper type requested first time.
+    """
+
+    def __init__(
+            self, manifest: Optional[Dict[str, str]] = None,
+            entry_points_group: Optional[str] = None) -> None:
+        self.__manifest: Dict[str, str] = dict(manifest or {})
+        if entry_points_group is not None:
+            for entry_point in entry_points(group=entry_points_group):
+                self.__manifest.setdefault(entry_point.name, entry_point.value)
+        self.__loaded: Dict[str, Type[AbstractExchangerScraper]] = {}
+
+    def register(self, uniq_name: str, import_path: str) -> None:
+        """ Add scraper to registry by import path in format "module.path:ClassName" """
+        if uniq_name in self.__manifest:
+            raise NameError("{} scraper already registered".format(uniq_name))
+        self.__manifest[uniq_name] = str(import_path)
+
+    def _load(self, uniq_name: str) -> Type[AbstractExchangerScraper]:
+        module_path, _, class_name = self.__manifest[uniq_name].partition(":")
+        scraper_type = getattr(import_module(module_path), class_name)
+        if not issubclass(scraper_type, AbstractExchangerScraper):
+            raise TypeError("{} should be AbstractExchangerScraper subclass".format(
+                self.__manifest[uniq_name]))
+        if scraper_type.EXCHANGER_UNIQ_NAME != uniq_name:
+            raise NameError("{} scraper registered as {}, but EXCHANGER_UNIQ_NAME is {}".format(
+                self.__manifest[uniq_name], uniq_name, scraper_type.EXCHANGER_UNIQ_NAME))
+        return scraper_type
+
+    def __getitem__(self, uniq_name: str) -> Type[AbstractExchangerScraper]:
+        scraper_type = self.__loaded.get(uniq_name)
+        if scraper_type is None:
+            scraper_type = self.__loaded[uniq_name] = self._load(uniq_name)
+        return scraper_type
+
+    def __contains__(self, uniq_name: object) -> bool:
+        return uniq_name in self.__manifest
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.__manifest)
+
+    def __len__(self) -> int:
+        return len(self.__manifest)
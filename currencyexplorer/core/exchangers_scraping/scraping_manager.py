@@ -1,11 +1,25 @@
 import asyncio
+import os
+import random
 import time
+import traceback
 from loguru import logger
 from inspect import isclass
-from typing import Optional, Union, List, Dict, Type, AsyncIterator
+from typing import Optional, Union, List, Dict, Tuple, Type, Any, AsyncIterator, Callable, Awaitable
 from .storage_backends import (
     AbstractScraperStorageBackend, CurrencyScraperAsyncSafeDictStorage, ScraperStorageBackendPairData)
 from .abstract_exchanger_scraper import AbstractExchangerScraper
+from .feed_recording import FeedRecorder
+from .polling_scheduler import PairDemandTracker, AdaptivePollingScheduler
+from .rate_limiting import UpstreamRequestPriority, upstream_request_priority, get_upstream_request_priority
+from .circuit_breaker import UpstreamCircuitBreaker
+from .exceptions import UpstreamRateLimitExceededException, UpstreamUnavailableException
+from .fetch_batching import PairsFetchBatcher
+from .stored_data_sinks import AbstractStoredDataSink
+from .ingest_queue import ConflatingIngestQueue
+from ..monitoring import (
+    SCRAPER_INGEST_FRAMES, SCRAPER_INGEST_TICKS, SCRAPER_LISTENER_RESTARTS, SCRAPER_INGEST_LAG_SECONDS, STORAGE_OPERATION_SECONDS,
+    phase_span)
 
 
 class ExchangersScrapingManager:
@@ -18,9 +32,51 @@ class ExchangersScrapingManager:
             self,
             scrapers_list: List[Type[AbstractExchangerScraper]],
             storage_backend: Optional[
-                AbstractScraperStorageBackend] = CurrencyScraperAsyncSafeDictStorage()) -> None:
+                AbstractScraperStorageBackend] = CurrencyScraperAsyncSafeDictStorage(),
+            feed_recorder: Optional[FeedRecorder] = None,
+            pair_demand_tracker: Optional[PairDemandTracker] = None,
+            adaptive_polling: Optional[bool] = False,
+            adaptive_polling_min_interval: Optional[float] = 2,
+            symbol_index_cache_dir: Optional[str] = None,
+            symbol_index_cache_lifetime: Optional[float] = 86400,
+            fetch_batch_window: Optional[float] = None,
+            circuit_breaker_failure_threshold: Optional[int] = None,
+            circuit_breaker_latency_slo: Optional[float] = None,
+            circuit_breaker_open_duration: Optional[float] = 10,
+            user_refresh_deadline: Optional[float] = None,
+            hedge_user_refreshes: Optional[bool] = False,
+            ingest_queue_max_pairs: Optional[int] = 100000) -> None:
         self._storage_backend = storage_backend
+        self.feed_recorder = feed_recorder
+        # Client requests of pairs are recorded only if tracker is defined (demand consumer is enabled),
+        #   adaptive polling always needs tracker
+        self.pair_demand_tracker = PairDemandTracker() if (
+            pair_demand_tracker is None and adaptive_polling is True) else pair_demand_tracker
+        self.adaptive_polling = adaptive_polling
+        self.adaptive_polling_min_interval = adaptive_polling_min_interval
+        self.symbol_index_cache_dir = symbol_index_cache_dir
+        self.symbol_index_cache_lifetime = symbol_index_cache_lifetime
+        # Single pair refreshes of same exchange within this window (seconds) are fetched by one request.
+        #   IF None each refresh is separate upstream request
+        self.fetch_batch_window = fetch_batch_window
+        self.__fetch_batchers: Dict[str, PairsFetchBatcher] = {}
+        # Upstream requests of each exchange are executed through circuit breaker (see. UpstreamCircuitBreaker).
+        #   IF circuit_breaker_failure_threshold is None circuit breakers are disabled
+        self.circuit_breaker_failure_threshold = circuit_breaker_failure_threshold
+        self.circuit_breaker_latency_slo = circuit_breaker_latency_slo
+        self.circuit_breaker_open_duration = circuit_breaker_open_duration
+        # USER priority refreshes are limited by deadline (seconds) and optionally hedged
+        self.user_refresh_deadline = user_refresh_deadline
+        self.hedge_user_refreshes = hedge_user_refreshes
+        self.__circuit_breakers: Dict[str, UpstreamCircuitBreaker] = {}
+        # Listener updates are passed from receive stage to store stage by conflating queue of this size
+        self.ingest_queue_max_pairs = ingest_queue_max_pairs
+        self.__stored_data_sinks: List[AbstractStoredDataSink] = []
+        self.polling_schedulers: Dict[str, AdaptivePollingScheduler] = {}
+        # Ingestion process client (see. IngestionProcess), pairs demand is forwarded to it if defined
+        self.ingestion_process = None
         self.__scrapers_list = {}
+        self.__updater_tasks: Dict[str, asyncio.Task] = {}
         self.append_to_scrapers(*scrapers_list)
     
     def append_to_scrapers(self, *scrapers: List[Type[AbstractExchangerScraper]]) -> None:
@@ -31,7 +87,14 @@ class ExchangersScrapingManager:
             if SCRAPER_TYPE.EXCHANGER_UNIQ_NAME in self.__scrapers_list:
                 raise NameError("{} already exist in scraping manager flow".format(
                     SCRAPER_TYPE.EXCHANGER_UNIQ_NAME))
-            self.__scrapers_list[SCRAPER_TYPE.EXCHANGER_UNIQ_NAME] = SCRAPER_TYPE()
+            scraper_obj = SCRAPER_TYPE()
+            scraper_obj.pair_demand_tracker = self.pair_demand_tracker
+            scraper_obj.feed_recorder = self.feed_recorder
+            scraper_obj.symbol_index_cache_lifetime = self.symbol_index_cache_lifetime
+            if self.symbol_index_cache_dir is not None:
+                scraper_obj.symbol_index_cache_path = os.path.join(
+                    self.symbol_index_cache_dir, "{}.symbols.json".format(SCRAPER_TYPE.EXCHANGER_UNIQ_NAME))
+            self.__scrapers_list[SCRAPER_TYPE.EXCHANGER_UNIQ_NAME] = scraper_obj
 
     async def rm_from_scrapers(
             self,
@@ -78,75 +141,391 @@ class ExchangersScrapingManager:
     def scrapers_count(self) -> int:
         return len(self.__scrapers_list)
 
-    async def update_from_scraper(
-            self, scraper: Union[
-                str, Type[AbstractExchangerScraper], AbstractExchangerScraper],
-            pair_title: Optional[str] = None) -> None:
-        """ Update currency data from specified scraper """
-        scraper_obj = await self.get_scraper(scraper)
-        scraper_response = await scraper_obj.get_currency(pair_title=pair_title)
+    @property
+    def stored_pairs_count(self) -> Optional[int]:
+        """ Count of currency pair records in storage backend (None if backend can't count it) """
+        return self._storage_backend.stored_pairs_count
+
+    def attach_stored_data_sink(self, sink: AbstractStoredDataSink) -> None:
+        """ Add consumer of stored data batches (see. AbstractStoredDataSink) """
+        if not isinstance(sink, AbstractStoredDataSink):
+            raise TypeError("sink should be AbstractStoredDataSink instance")
+        self.__stored_data_sinks.append(sink)
+
+    def _notify_stored_data_sinks(self, pair_data_list: List[ScraperStorageBackendPairData]) -> None:
+        for sink in self.__stored_data_sinks:
+            try:
+                sink.handle_stored_batch(pair_data_list)
+            except Exception:
+                logger.error("{}: {} failed to handle stored batch\n{}".format(
+                    self.__class__.__name__, sink.__class__.__name__, traceback.format_exc()))
+
+    async def _store_scraper_response(
+            self, scraper_obj: AbstractExchangerScraper,
+            scraper_response: Union[
+                List[ScraperStorageBackendPairData], ScraperStorageBackendPairData]) -> None:
+        """ Validate scraper response and store it to backend with ingestion metrics """
+        await self._store_received_data(
+            scraper_obj, self._receive_scraper_response(scraper_obj, scraper_response))
+
+    def _receive_scraper_response(
+            self, scraper_obj: AbstractExchangerScraper,
+            scraper_response: Union[
+                List[ScraperStorageBackendPairData], ScraperStorageBackendPairData]
+            ) -> List[ScraperStorageBackendPairData]:
+        """ Validate scraper response type, set exchange name and count received frame """
         if isinstance(scraper_response, ScraperStorageBackendPairData):
             scraper_response = [scraper_response]
         elif not isinstance(scraper_response, list):
             raise TypeError(
                 "scraper method should return scope of ScraperStorageBackendPairData objects")
-        
+
+        exchanger_uniq_name = str(scraper_obj.EXCHANGER_UNIQ_NAME)
+        SCRAPER_INGEST_FRAMES.inc(exchange=exchanger_uniq_name)
+        SCRAPER_INGEST_TICKS.inc(len(scraper_response), exchange=exchanger_uniq_name)
         for data in scraper_response:
-            data.exchanger_uniq_name = str(scraper_obj.EXCHANGER_UNIQ_NAME)
-            await self._storage_backend.store_pair_data(data)
+            data.exchanger_uniq_name = exchanger_uniq_name
+        return scraper_response
+
+    async def _store_received_data(
+            self, scraper_obj: AbstractExchangerScraper, pair_data_list: List[ScraperStorageBackendPairData]) -> None:
+        """ Store received data to backend (with ingestion lag metric) and pass it to stored data sinks """
+        exchanger_uniq_name = str(scraper_obj.EXCHANGER_UNIQ_NAME)
+        now = time.time()
+        for data in pair_data_list:
+            # Lag from exchange event, records without exchange event time are not observed
+            if data.event_time is not None:
+                SCRAPER_INGEST_LAG_SECONDS.observe(now - data.event_time, exchange=exchanger_uniq_name)
+        with STORAGE_OPERATION_SECONDS.time(operation="store_pair_data_list"):
+            await self._storage_backend.store_pair_data_list(pair_data_list)
+        self._notify_stored_data_sinks(pair_data_list)
+
+    async def load_symbol_indexes(self) -> Dict[str, bool]:
+        """ Load symbol indexes of all scrapers (see. AbstractExchangerScraper.load_symbol_index).
+                Return dict like {scraper_uniq_name: index_loaded}
+        """
+        scrapers = list(self.__scrapers_list.values())
+        symbol_indexes = await asyncio.gather(*[scraper.load_symbol_index() for scraper in scrapers])
+        return {
+            scraper.EXCHANGER_UNIQ_NAME: symbol_index is not None
+            for scraper, symbol_index in zip(scrapers, symbol_indexes)}
+
+    async def store_ingested_batch(
+            self, records: List[Tuple[str, str, Optional[float], Optional[float], Optional[float]]]) -> None:
+        """ Store batch of records received from ingestion process:
+                [(exchanger_uniq_name, currency_pair_title, currency_rate, last_update, event_time)].
+                Records are already validated by ingestion process, so validation is skipped
+        """
+        now = time.time()
+        pair_data_list = []
+        ticks_by_exchange: Dict[str, int] = {}
+        for exchanger_uniq_name, currency_pair_title, currency_rate, last_update, event_time in records:
+            pair_data_list.append(ScraperStorageBackendPairData(
+                exchanger_uniq_name=exchanger_uniq_name, currency_pair_title=currency_pair_title,
+                currency_rate=currency_rate, last_update=last_update, event_time=event_time))
+            ticks_by_exchange[exchanger_uniq_name] = ticks_by_exchange.get(exchanger_uniq_name, 0) + 1
+            if event_time is not None:
+                SCRAPER_INGEST_LAG_SECONDS.observe(now - event_time, exchange=exchanger_uniq_name)
+        for exchanger_uniq_name, ticks_count in ticks_by_exchange.items():
+            SCRAPER_INGEST_TICKS.inc(ticks_count, exchange=exchanger_uniq_name)
+        with STORAGE_OPERATION_SECONDS.time(operation="store_pair_data_list"):
+            await self._storage_backend.store_pair_data_list(pair_data_list)
+        self._notify_stored_data_sinks(pair_data_list)
+
+    async def update_from_scraper(
+            self, scraper: Union[
+                str, Type[AbstractExchangerScraper], AbstractExchangerScraper],
+            pair_title: Optional[str] = None,
+            priority: Optional[UpstreamRequestPriority] = None) -> None:
+        """ Update currency data from specified scraper.
+                IF priority passed, upstream requests are made with this priority
+                    (see. UpstreamRateLimitGovernor), otherwise with priority from context.
+                IF fetch_batch_window defined, pair refresh is merged with other pairs refreshes
+                    of same exchange requested within this window (see. PairsFetchBatcher)
+        """
+        scraper_obj = await self.get_scraper(scraper)
+        if pair_title is not None and self.fetch_batch_window is not None:
+            return await self._get_fetch_batcher(scraper_obj).fetch(pair_title, priority=priority)
+        scraper_obj.feed_recorder = self.feed_recorder
+        scraper_response = await self._fetch_from_scraper(
+            scraper_obj, lambda: scraper_obj.get_currency(pair_title=pair_title), priority=priority)
+        await self._store_scraper_response(scraper_obj, scraper_response)
+
+    async def update_pairs_from_scraper(
+            self, scraper: Union[
+                str, Type[AbstractExchangerScraper], AbstractExchangerScraper],
+            pair_titles: List[str],
+            priority: Optional[UpstreamRequestPriority] = None) -> None:
+        """ Update currency data for several pairs from specified scraper
+                (one upstream request per MAX_PAIRS_PER_REQUEST pairs, see. get_currencies)
+        """
+        scraper_obj = await self.get_scraper(scraper)
+        scraper_obj.feed_recorder = self.feed_recorder
+        batch_size = max(int(scraper_obj.MAX_PAIRS_PER_REQUEST), 1)
+        for batch_start in range(0, len(pair_titles), batch_size):
+            batch = pair_titles[batch_start:batch_start + batch_size]
+            scraper_response = await self._fetch_from_scraper(
+                scraper_obj, lambda: scraper_obj.get_currencies(batch), priority=priority)
+            await self._store_scraper_response(scraper_obj, scraper_response)
+
+    def _get_circuit_breaker(self, scraper: AbstractExchangerScraper) -> Optional[UpstreamCircuitBreaker]:
+        if self.circuit_breaker_failure_threshold is None:
+            return None
+        circuit_breaker = self.__circuit_breakers.get(scraper.EXCHANGER_UNIQ_NAME)
+        if circuit_breaker is None:
+            circuit_breaker = self.__circuit_breakers[scraper.EXCHANGER_UNIQ_NAME] = UpstreamCircuitBreaker(
+                scraper.EXCHANGER_UNIQ_NAME, failure_threshold=self.circuit_breaker_failure_threshold,
+                latency_slo=self.circuit_breaker_latency_slo, open_duration=self.circuit_breaker_open_duration)
+        return circuit_breaker
 
-    async def update_all(self, pair_title: Optional[str] = None) -> None:
-        """ Update currency data from all scrapers """
-        for scraper_uniq_name in self.__scrapers_list:
-            await self.update_from_scraper(scraper_uniq_name, pair_title=pair_title)
+    async def _fetch_from_scraper(
+            self, scraper: AbstractExchangerScraper, fetch: Callable[[], Awaitable[Any]],
+            priority: Optional[UpstreamRequestPriority] = None) -> Any:
+        """ Execute scraper upstream request with priority through exchange circuit breaker.
+                USER priority requests are limited by user_refresh_deadline and hedged if enabled
+        """
+        priority = get_upstream_request_priority() if priority is None else priority
+
+        async def fetch_with_priority() -> Any:
+            with upstream_request_priority(priority):
+                return await fetch()
+
+        circuit_breaker = self._get_circuit_breaker(scraper)
+        if circuit_breaker is None:
+            return await fetch_with_priority()
+        is_user_request = priority == UpstreamRequestPriority.USER
+        return await circuit_breaker.call(
+            fetch_with_priority,
+            deadline=self.user_refresh_deadline if is_user_request else None,
+            hedge=self.hedge_user_refreshes is True and is_user_request)
+
+    def _get_fetch_batcher(self, scraper: AbstractExchangerScraper) -> PairsFetchBatcher:
+        batcher = self.__fetch_batchers.get(scraper.EXCHANGER_UNIQ_NAME)
+        if batcher is None:
+            async def fetch_pairs(pair_titles: List[str], priority: UpstreamRequestPriority) -> None:
+                await self.update_pairs_from_scraper(scraper, pair_titles, priority=priority)
+
+            batcher = self.__fetch_batchers[scraper.EXCHANGER_UNIQ_NAME] = PairsFetchBatcher(
+                fetch_pairs, batch_window=self.fetch_batch_window,
+                max_batch_size=scraper.MAX_PAIRS_PER_REQUEST)
+        return batcher
+
+    async def update_all(
+            self, pair_title: Optional[str] = None,
+            priority: Optional[UpstreamRequestPriority] = None) -> None:
+        """ Update currency data from all scrapers.
+                Exchanges are updated independently: unavailable exchange (open circuit, deadline or
+                    rate limit) is logged and skipped, other errors are raised after all updates finished
+        """
+        scraper_uniq_names = list(self.__scrapers_list)
+        results = await asyncio.gather(*[
+            self.update_from_scraper(scraper_uniq_name, pair_title=pair_title, priority=priority)
+            for scraper_uniq_name in scraper_uniq_names], return_exceptions=True)
+        errors = []
+        for scraper_uniq_name, result in zip(scraper_uniq_names, results):
+            if isinstance(result, (UpstreamUnavailableException, UpstreamRateLimitExceededException)):
+                logger.warning("{}: {} update skipped ({})".format(
+                    self.__class__.__name__, scraper_uniq_name, result.description))
+            elif isinstance(result, BaseException):
+                errors.append(result)
+        if len(errors) != 0:
+            raise errors[0]
+
+    def get_circuit_breakers(self) -> Dict[str, Dict[str, Any]]:
+        """ Upstream circuit breakers state: {scraper_uniq_name: {state, consecutive_failures, hedge_delay}} """
+        return {
+            scraper_uniq_name: circuit_breaker.to_dict()
+            for scraper_uniq_name, circuit_breaker in self.__circuit_breakers.items()}
     
+    def get_rate_limits(self) -> Dict[str, Dict[str, float]]:
+        """ Remaining upstream rate limit budget: {scraper_uniq_name: {remaining, capacity, refill_per_second}} """
+        return {
+            scraper_uniq_name: scraper.rate_limit_governor.to_dict()
+            for scraper_uniq_name, scraper in self.__scrapers_list.items()
+            if scraper.rate_limit_governor is not None}
+
+    def record_pair_demand(self, exchange: Optional[str], pair_title: Optional[str]) -> None:
+        """ Record client request for currency pair (used by demand-aware polling and streams).
+                Requests are not recorded if manager has no pair demand tracker (no demand consumer)
+        """
+        if pair_title is None or self.pair_demand_tracker is None:
+            return
+        self.pair_demand_tracker.record(exchange, pair_title)
+        if self.ingestion_process is not None:
+            self.ingestion_process.record_pair_demand(exchange, pair_title)
+
+    def _is_adaptive_polling_scraper(self, scraper: AbstractExchangerScraper) -> bool:
+        return self.adaptive_polling is True and scraper.ADAPTIVE_POLLING_REQUESTS_PER_MINUTE is not None
+
+    async def _poll_pairs(
+            self, scraper: AbstractExchangerScraper, pair_titles: Optional[List[str]]) -> None:
+        """ Polling scheduler callback: refresh all pairs (pair_titles is None) or specified pairs """
+        if pair_titles is None:
+            return await self.update_from_scraper(scraper)
+        await self.update_pairs_from_scraper(scraper, pair_titles)
+
+    async def _adaptive_polling_process(self, scraper: AbstractExchangerScraper) -> None:
+        """ Demand-aware polling of scraper instead of fixed interval currency listener """
+        scheduler = AdaptivePollingScheduler(
+            scraper, self.pair_demand_tracker,
+            requests_per_minute=scraper.ADAPTIVE_POLLING_REQUESTS_PER_MINUTE,
+            full_refresh_interval=scraper.DEFAULT_LISTNER_TIMEOUT,
+            poll_pairs=self._poll_pairs,
+            min_interval=self.adaptive_polling_min_interval,
+            max_pairs_per_request=scraper.MAX_PAIRS_PER_REQUEST)
+        self.polling_schedulers[scraper.EXCHANGER_UNIQ_NAME] = scheduler
+        await scheduler.run()
+
     async def _updater_process(self, scraper: AbstractExchangerScraper, *args, **kwargs) -> None:
         """ Scraper manager flow system wrapper method
                 Listing updates from scraper and store to backend.
+                    Receive stage (listener) and store stage are connected by ConflatingIngestQueue,
+                        so slow storage doesn't delay listener (only latest pending update of pair is stored).
+                    Scrapers with polling budget are polled by demand-aware scheduler if adaptive polling enabled
         """
-        async for updates in scraper.attach_currency_listener():
-            scraper_response = updates
-            if isinstance(updates, ScraperStorageBackendPairData):
-                scraper_response = [scraper_response]
-            elif not isinstance(updates, list):
-                raise TypeError(
-                    "scraper method should return scope of ScraperStorageBackendPairData objects")
-    
-            for data in scraper_response:
-                data.exchanger_uniq_name = str(scraper.EXCHANGER_UNIQ_NAME)
-                await self._storage_backend.store_pair_data(data)
+        if self._is_adaptive_polling_scraper(scraper):
+            return await self._adaptive_polling_process(scraper)
+        scraper.feed_recorder = self.feed_recorder
+        ingest_queue = ConflatingIngestQueue(scraper.EXCHANGER_UNIQ_NAME, max_pairs=self.ingest_queue_max_pairs)
+        store_task = asyncio.create_task(
+            self._store_stage_process(scraper, ingest_queue),
+            name="{}-store-stage".format(scraper.EXCHANGER_UNIQ_NAME))
+        try:
+            async for updates in scraper.attach_currency_listener():
+                if store_task.done():
+                    # Store stage crashed: raise its exception (updater is restarted by supervisor)
+                    store_task.result()
+                ingest_queue.put(self._receive_scraper_response(scraper, updates))
+        except asyncio.CancelledError:
+            # Updater cancelled after stop timeout: pending updates are dropped
+            store_task.cancel()
+            raise
+        finally:
+            # Store stage stores remaining updates and finishes (batch taken from queue is never interrupted)
+            ingest_queue.close()
+            await asyncio.gather(store_task, return_exceptions=True)
+
+    async def _store_stage_process(
+            self, scraper: AbstractExchangerScraper, ingest_queue: ConflatingIngestQueue) -> None:
+        """ Store batches of latest pending updates from ingest queue until queue is closed """
+        while True:
+            pair_data_list = await ingest_queue.get()
+            if pair_data_list is None:
+                return
+            await self._store_received_data(scraper, pair_data_list)
     
-    async def run_active_updater(self, *args, **kwargs) -> None:
-        """ Run update handler process for all available scrapers """
+    async def _supervised_updater_process(
+            self, scraper: AbstractExchangerScraper, *args,
+            restart_backoff_min: Optional[float] = 1, restart_backoff_max: Optional[float] = 60,
+            **kwargs) -> None:
+        """ Run scraper updater process and restart it with exponential backoff if listener crashed
+                or finished without stop signal.
+        """
+        restarts_in_row = 0
+        while True:
+            try:
+                await self._updater_process(scraper, *args, **kwargs)
+            except asyncio.CancelledError:
+                scraper._worker_running_status = False
+                raise
+            except Exception:
+                logger.error("{}: {} updater crashed!\n{}".format(
+                    self.__class__.__name__, scraper.EXCHANGER_UNIQ_NAME, traceback.format_exc()))
+            if scraper._worker_stop_signal:
+                break
+            listener_was_ready = scraper.currency_listener_status
+            scraper._worker_running_status = False
+            # Backoff is reset if listener was working before stopped
+            restarts_in_row = 0 if listener_was_ready else restarts_in_row + 1
+            restart_delay = min(
+                restart_backoff_max, restart_backoff_min * (2 ** restarts_in_row)) * random.uniform(0.8, 1.2)
+            SCRAPER_LISTENER_RESTARTS.inc(exchange=scraper.EXCHANGER_UNIQ_NAME)
+            logger.warning("{}: restarting {} updater in {:.2f} seconds...".format(
+                self.__class__.__name__, scraper.EXCHANGER_UNIQ_NAME, restart_delay))
+            await asyncio.sleep(restart_delay)
+            if scraper._worker_stop_signal:
+                break
+
+    async def run_active_updater(
+            self, *args,
+            restart_backoff_min: Optional[float] = 1, restart_backoff_max: Optional[float] = 60,
+            **kwargs) -> None:
+        """ Run supervised update handler process for all available scrapers """
         for scraper_uniq_name, scraper in self.__scrapers_list.items():
-            if scraper.LISTNER_AUTO_START is False:
+            if scraper.LISTNER_AUTO_START is False and not self._is_adaptive_polling_scraper(scraper):
                 logger.info("{}: scraper {} listener skip...".format(
                     self.__class__.__name__, scraper_uniq_name
                 ))
                 continue
+            running_task = self.__updater_tasks.get(scraper_uniq_name)
+            if running_task is not None and not running_task.done():
+                logger.info("{}: updater task {} already running!".format(
+                    self.__class__.__name__, scraper_uniq_name))
+                continue
             logger.info("{}: creating task for {} updater...".format(
                 self.__class__.__name__, scraper_uniq_name))
-            asyncio.create_task(self._updater_process(scraper, *args, **kwargs))
+            scraper._worker_stop_signal = False
+            self.__updater_tasks[scraper_uniq_name] = asyncio.create_task(
+                self._supervised_updater_process(
+                    scraper, *args,
+                    restart_backoff_min=restart_backoff_min, restart_backoff_max=restart_backoff_max,
+                    **kwargs),
+                name="{}-updater".format(scraper_uniq_name))
             logger.info("{}: updater task {} ready!".format(
                 self.__class__.__name__, scraper_uniq_name))
-    
-    async def stop_active_updater(self, *args, **kwargs) -> None:
-        """ Stop update handler process for all aviable scrapers """
+
+    async def wait_until_ready(self, timeout: Optional[float] = None) -> Dict[str, bool]:
+        """ Wait until all started scraper listeners are ready (or timeout expired).
+                Return dict like {scraper_uniq_name: listener_status}
+        """
+        started_scrapers = [
+            self.__scrapers_list[scraper_uniq_name] for scraper_uniq_name in list(self.__updater_tasks)]
+        statuses = await asyncio.gather(*[
+            scraper.wait_listener_ready(timeout=timeout) for scraper in started_scrapers])
+        return {
+            scraper.EXCHANGER_UNIQ_NAME: status for scraper, status in zip(started_scrapers, statuses)}
+
+    async def stop_active_updater(self, *args, timeout: Optional[float] = None, **kwargs) -> None:
+        """ Stop update handler process for all aviable scrapers.
+                Wait until updater tasks finish (not longer than timeout), tasks still running after timeout
+                    will be cancelled.
+        """
         for scraper_uniq_name, scraper in self.__scrapers_list.items():
             await scraper.stop_currency_listener(*args, **kwargs)
+        updater_tasks = list(self.__updater_tasks.values())
+        self.__updater_tasks.clear()
+        if len(updater_tasks) == 0:
+            return
+        _, pending_tasks = await asyncio.wait(updater_tasks, timeout=timeout)
+        for task in pending_tasks:
+            task.cancel()
+        if len(pending_tasks) != 0:
+            logger.warning("{}: {} updater tasks cancelled after stop timeout".format(
+                self.__class__.__name__, len(pending_tasks)))
+            await asyncio.gather(*pending_tasks, return_exceptions=True)
 
     async def get(
                 self,
                 scraper: Union[str, Type[AbstractExchangerScraper], AbstractExchangerScraper],
-                pair_title: Optional[str]) -> Union[
+                pair_title: Optional[str],
+                base_asset: Optional[str] = None,
+                quote_asset: Optional[str] = None) -> Union[
                     ScraperStorageBackendPairData, List[ScraperStorageBackendPairData]]:
         """ Get currency data from storage for specified scraper.
                 IF pair_title is None this method will return list of all aviable
                     currency pairs for specified scraper.
+                IF base_asset/quote_asset passed this method will return list of scraper
+                    currency pairs with this base/quote asset (storage assets index is used)
         """
         scraper_obj = await self.get_scraper(scraper)
-        data = await self._storage_backend.get_pair_data(
-            exchanger_uniq_name=scraper_obj.EXCHANGER_UNIQ_NAME, pair_title=pair_title)
+        if base_asset is not None or quote_asset is not None:
+            with STORAGE_OPERATION_SECONDS.time(operation="get_all"), phase_span("storage_read"):
+                data = await self._storage_backend.get_all(
+                    only_for_pair_title=pair_title, base_asset=base_asset, quote_asset=quote_asset)
+            return list(data.get(scraper_obj.EXCHANGER_UNIQ_NAME, {}).values())
+        with STORAGE_OPERATION_SECONDS.time(operation="get_pair_data"), phase_span("storage_read"):
+            data = await self._storage_backend.get_pair_data(
+                exchanger_uniq_name=scraper_obj.EXCHANGER_UNIQ_NAME, pair_title=pair_title)
         if isinstance(data, dict):
             output = []
             for i in data.values():
@@ -164,7 +543,9 @@ class ExchangersScrapingManager:
     async def get_all(
             self,
             only_for_pair_title: Optional[str],
-            group_by_currency_pair: Optional[bool] = True) -> Union[
+            group_by_currency_pair: Optional[bool] = True,
+            base_asset: Optional[str] = None,
+            quote_asset: Optional[str] = None) -> Union[
                 Dict[
                     str, ScraperStorageBackendPairData],
                 Dict[
@@ -173,8 +554,11 @@ class ExchangersScrapingManager:
             Get currency data from storage for all aviable scraper in scraping manager flow
                 IF group_by_currency_pair is True this method will return dict object
                     like {scraper_exchange_uniq_name: {pair_title: [data1, data2, data3]}}
+                IF base_asset/quote_asset passed only pairs with this base/quote asset are returned
         """
-        scrapers_data = await self._storage_backend.get_all(only_for_pair_title=only_for_pair_title)
+        with STORAGE_OPERATION_SECONDS.time(operation="get_all"), phase_span("storage_read"):
+            scrapers_data = await self._storage_backend.get_all(
+                only_for_pair_title=only_for_pair_title, base_asset=base_asset, quote_asset=quote_asset)
         if group_by_currency_pair is True:
             return scrapers_data
         return {
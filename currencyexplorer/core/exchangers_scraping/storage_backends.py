@@ -2,21 +2,67 @@ import time
 from loguru import logger
 from collections import defaultdict
 from datetime import datetime
-from typing import Optional, Union, Dict, Callable, List
-from pydantic import BaseModel, Field, field_validator
+from typing import Optional, Union, Dict, Callable, List, Set
 from .exceptions import ExplorerPairInvalidFormatException
+from .asset_index import PairAssetsIndex
+from .storage_eviction import PairAccessFrequencyEviction
+from ..monitoring import phase_span
 from abc import ABC, abstractmethod
 
 
-class ScraperStorageBackendPairData(BaseModel):
+# Default value of ScraperStorageBackendPairData.last_update (current time)
+_LAST_UPDATE_NOW = object()
+
+
+class ScraperStorageBackendPairData:
     """
         Currency scraper rate response data schema
             This object contain data about currency pair exchange rate on specific exchanging platform
+
+        Lightweight record (__slots__, no validation), it is created for each ingested tick.
+            Data from untrusted sources should be created by validated() constructor.
+        event_time - exchange event timestamp of tick if exchange sends it (used only for ingestion lag metric,
+            not stored by snapshots and journal)
     """
-    exchanger_uniq_name: str
-    currency_pair_title: str
-    currency_rate: Optional[float] = None
-    last_update: Optional[float] = Field(default_factory=lambda: time.time())
+    __slots__ = ("exchanger_uniq_name", "currency_pair_title", "currency_rate", "last_update", "event_time")
+
+    def __init__(
+            self, exchanger_uniq_name: str, currency_pair_title: str,
+            currency_rate: Optional[float] = None,
+            last_update: Optional[float] = _LAST_UPDATE_NOW,
+            event_time: Optional[float] = None) -> None:
+        self.exchanger_uniq_name = exchanger_uniq_name
+        self.currency_pair_title = currency_pair_title
+        self.currency_rate = currency_rate
+        self.last_update = time.time() if last_update is _LAST_UPDATE_NOW else last_update
+        self.event_time = event_time
+
+    @classmethod
+    def validated(
+            CLS, exchanger_uniq_name: str, currency_pair_title: str,
+            currency_rate: Optional[float] = None,
+            last_update: Optional[float] = _LAST_UPDATE_NOW) -> "ScraperStorageBackendPairData":
+        """ Make record with values validation and normalization (pair title format, numbers types) """
+        return CLS(
+            exchanger_uniq_name=str(exchanger_uniq_name),
+            currency_pair_title=ExplorerPairInvalidFormatException.explorer_pair_format_validator(
+                currency_pair_title),
+            currency_rate=None if currency_rate is None else float(currency_rate),
+            last_update=last_update if last_update is _LAST_UPDATE_NOW or last_update is None else float(
+                last_update))
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ScraperStorageBackendPairData):
+            return NotImplemented
+        return (
+            self.exchanger_uniq_name == other.exchanger_uniq_name
+            and self.currency_pair_title == other.currency_pair_title
+            and self.currency_rate == other.currency_rate and self.last_update == other.last_update)
+
+    def __repr__(self) -> str:
+        return "{}(exchanger_uniq_name={!r}, currency_pair_title={!r}, currency_rate={!r}, last_update={!r})".format(
+            self.__class__.__name__, self.exchanger_uniq_name, self.currency_pair_title,
+            self.currency_rate, self.last_update)
 
     @property
     def last_update_datetime(self) -> Optional[datetime]:
@@ -34,11 +80,6 @@ class ScraperStorageBackendPairData(BaseModel):
             return
         return time.time() - self.last_update
 
-    @field_validator('currency_pair_title', mode="before")
-    @classmethod
-    def check_currency_pair_title(cls, v: str) -> str:
-        return ExplorerPairInvalidFormatException.explorer_pair_format_validator(v)
-        
 
 class AbstractScraperStorageBackend(ABC):
     """ Basic storage backend class for exchangers API scrapper method.
@@ -53,6 +94,14 @@ class AbstractScraperStorageBackend(ABC):
         """
         raise NotImplementedError
 
+    async def store_pair_data_list(self, new_or_update_data_list: List[ScraperStorageBackendPairData]) -> None:
+        """ Store/update batch of currency data.
+                It makes sense to override the method if storage can store batch more effictive
+                    than one by one (one transaction, one cleanup and etc.)
+        """
+        for new_or_update_data in new_or_update_data_list:
+            await self.store_pair_data(new_or_update_data)
+
     async def get_pair_data(
             self,
             exchanger_uniq_name: Optional[str] = None,
@@ -67,13 +116,15 @@ class AbstractScraperStorageBackend(ABC):
                     {exchanger_uniq_name: {pair_title: ScraperStorageBackendPairData}} .
                 If specified exchanger and pair this method should return exactly currency data object
         """
-        return ScraperStorageBackendPairData(
+        return ScraperStorageBackendPairData.validated(
             exchanger_uniq_name=str(exchanger_uniq_name),
             currency_pair_title=str(pair_title), last_update=None)
 
     async def get_all(
             self,
-            only_for_pair_title: Optional[str] = None) -> Dict[
+            only_for_pair_title: Optional[str] = None,
+            base_asset: Optional[str] = None,
+            quote_asset: Optional[str] = None) -> Dict[
                 str, Dict[str, ScraperStorageBackendPairData]]:
         """ This method should describe loading all currency data from storage.
                 It makes sense to override the method only if it is possible to make scraping
@@ -81,21 +132,52 @@ class AbstractScraperStorageBackend(ABC):
                         -> Return dict like {exchange: {pair_title: currency_data}}
                             IF only_for_pair_title is True method should return
                                 same dict without only_for_pair_title in currency_pair_name
+                            IF base_asset/quote_asset passed only pairs COIN1_COIN2 with
+                                COIN1 == base_asset / COIN2 == quote_asset are returned
+                                    (default implementation filters all loaded data)
+        """
+        data = await self.get_pair_data(pair_title=only_for_pair_title)
+        if base_asset is None and quote_asset is None:
+            return data
+        response = {}
+        for exchanger_name, exchanger_data in data.items():
+            for pair_title, pair_data in exchanger_data.items():
+                pair_base_asset, pair_quote_asset = PairAssetsIndex.split_pair_title(pair_title)
+                if (base_asset is None or pair_base_asset == base_asset) and (
+                        quote_asset is None or pair_quote_asset == quote_asset):
+                    response.setdefault(exchanger_name, {})[pair_title] = pair_data
+        return response
+
+    @property
+    def stored_pairs_count(self) -> Optional[int]:
+        """ Count of stored currency pair records.
+                Should be overridden if storage can count records cheaply (used for monitoring)
         """
-        return await self.get_pair_data(pair_title=only_for_pair_title)
+        return None
 
 
 class CurrencyScraperAsyncSafeDictStorage(AbstractScraperStorageBackend):
     """ Currency scraper storage in simple python dict.
+            IF max_stored_pairs defined, least requested pairs are evicted over this budget
+                (see. PairAccessFrequencyEviction).
             !!! Only for testing or local usage (FakeDB) !!!
     """
     
-    def __init__(self, *args, stored_data_lifetime: Optional[float] = None, **kwargs) -> None:
+    def __init__(
+            self, *args, stored_data_lifetime: Optional[float] = None,
+            max_stored_pairs: Optional[int] = None, access_half_life: Optional[float] = 300, **kwargs) -> None:
         super().__init__(*args, **kwargs)
         self.stored_data_lifetime = stored_data_lifetime
 
         # {exchanger_uniq_name: {pair_title: ScraperStorageBackendPairData } }
         self.__fake_dict_storage: Dict[str, Dict[str, ScraperStorageBackendPairData]] = dict()
+        self.__assets_index = PairAssetsIndex()
+        self.__eviction = None if max_stored_pairs is None else PairAccessFrequencyEviction(
+            max_stored_pairs, half_life=access_half_life)
+
+    @property
+    def stored_pairs_count(self) -> int:
+        return sum(len(exchanger_data) for exchanger_data in list(self.__fake_dict_storage.values()))
           
     async def _cleanup_expired_data(self) -> None:
         """
@@ -103,24 +185,50 @@ class CurrencyScraperAsyncSafeDictStorage(AbstractScraperStorageBackend):
         """
         if self.stored_data_lifetime is None:
             return
-        for exchanger_name, exchanger_data in self.__fake_dict_storage.items():
-            for pair_title, pair_data in list(exchanger_data.items()):
-                if self.stored_data_lifetime == 0 or (
-                        self.stored_data_lifetime is not None and (
-                            pair_data.time_from_last_update >= self.stored_data_lifetime)):
-                    del self.__fake_dict_storage[exchanger_name][pair_title]
+        with phase_span("storage_cleanup"):
+            for exchanger_name, exchanger_data in self.__fake_dict_storage.items():
+                for pair_title, pair_data in list(exchanger_data.items()):
+                    if self.stored_data_lifetime == 0 or (
+                            self.stored_data_lifetime is not None and (
+                                pair_data.time_from_last_update >= self.stored_data_lifetime)):
+                        del self.__fake_dict_storage[exchanger_name][pair_title]
+                        self.__assets_index.remove_pair(pair_title)
 
-    async def store_pair_data(self, new_or_update_data: ScraperStorageBackendPairData) -> None:
-        if new_or_update_data.exchanger_uniq_name in self.__fake_dict_storage:
-            self.__fake_dict_storage[
-                new_or_update_data.exchanger_uniq_name][
-                    new_or_update_data.currency_pair_title] = new_or_update_data
+    def _evict_cold_data(self) -> None:
+        """ Evict least requested pairs if stored pairs budget exceeded """
+        if self.__eviction is None:
             return
-        self.__fake_dict_storage[new_or_update_data.exchanger_uniq_name] = {
-            new_or_update_data.currency_pair_title: new_or_update_data}
-        
-        # Clean up expired data after storing
-        await self._cleanup_expired_data()
+        for exchanger_name, pair_title in self.__eviction.select_evicted(
+                self.__fake_dict_storage, self.stored_pairs_count):
+            del self.__fake_dict_storage[exchanger_name][pair_title]
+            self.__assets_index.remove_pair(pair_title)
+
+    async def store_pair_data(self, new_or_update_data: ScraperStorageBackendPairData) -> None:
+        await self.store_pair_data_list([new_or_update_data])
+
+    async def store_pair_data_list(self, new_or_update_data_list: List[ScraperStorageBackendPairData]) -> None:
+        new_exchanger_stored = new_pair_stored = False
+        eviction = self.__eviction
+        stored_pairs_count = 0 if eviction is None else self.stored_pairs_count
+        for new_or_update_data in new_or_update_data_list:
+            pair_title = new_or_update_data.currency_pair_title
+            exchanger_data = self.__fake_dict_storage.get(new_or_update_data.exchanger_uniq_name)
+            if exchanger_data is None or pair_title not in exchanger_data:
+                if eviction is not None and not eviction.admit(pair_title, stored_pairs_count):
+                    continue
+                if exchanger_data is None:
+                    exchanger_data = self.__fake_dict_storage[new_or_update_data.exchanger_uniq_name] = {}
+                    new_exchanger_stored = True
+                self.__assets_index.add_pair(pair_title)
+                stored_pairs_count += 1
+                new_pair_stored = True
+            exchanger_data[pair_title] = new_or_update_data
+        if new_pair_stored:
+            self._evict_cold_data()
+
+        # Clean up expired data after storing (once per batch, same as store_pair_data)
+        if new_exchanger_stored:
+            await self._cleanup_expired_data()
 
     async def get_pair_data(
             self,
@@ -141,7 +249,12 @@ class CurrencyScraperAsyncSafeDictStorage(AbstractScraperStorageBackend):
             pair_result = result_from_exchanger.get(pair_title)
             if pair_result is not None:
                 # Currency data from specified exchanger and currency pair title
+                if self.__eviction is not None:
+                    self.__eviction.record_access(pair_title)
                 return pair_result
+        if self.__eviction is not None and pair_title is not None:
+            # Missing pair is counted too, so it is admitted to full storage after refetch
+            self.__eviction.record_access(pair_title)
         
         # -> Empty result
         data = await super().get_pair_data(
@@ -149,13 +262,19 @@ class CurrencyScraperAsyncSafeDictStorage(AbstractScraperStorageBackend):
         return data
     
     async def get_all(
-            self, only_for_pair_title: Optional[str] = None) -> Dict[
+            self, only_for_pair_title: Optional[str] = None,
+            base_asset: Optional[str] = None, quote_asset: Optional[str] = None) -> Dict[
                 str, Dict[str, ScraperStorageBackendPairData]]:
         
         # Clean up expired data before retrieval
         await self._cleanup_expired_data()
         
         data = self.__fake_dict_storage.copy()
+        if base_asset is not None or quote_asset is not None:
+            response = self.__assets_index.select(data, base_asset, quote_asset, only_for_pair_title)
+            if self.__eviction is not None:
+                self.__eviction.record_response_access(response)
+            return response
         if only_for_pair_title is None:
             return data
         pair_found_in_exchangers = {
@@ -171,4 +290,180 @@ class CurrencyScraperAsyncSafeDictStorage(AbstractScraperStorageBackend):
             if target_exchanger not in response:
                 response[target_exchanger] = {}
             response[target_exchanger][only_for_pair_title] = e_data
+        if self.__eviction is not None:
+            # Missing pair is counted too, so it is admitted to full storage after refetch
+            self.__eviction.record_access(only_for_pair_title)
+        return response
+
+
+class CurrencyScraperSnapshotStorage(AbstractScraperStorageBackend):
+    """ Currency scraper in-memory storage with copy-on-write snapshots.
+            - Each stored batch is applied to new copy of changed exchanges dicts and published
+                by one reference swap, published snapshot is never modified.
+            - Readers take current snapshot without copy and lock, so response made from several
+                exchanges data is always consistent (same snapshot generation).
+            - Expired data is removed by writer side (not more often than cleanup_interval seconds).
+            - IF max_stored_pairs defined, least requested pairs are evicted over this budget by writer side
+                (see. PairAccessFrequencyEviction).
+            Store data by batches (store_pair_data_list), each store copies changed exchange dict.
+            !!! Returned dicts are shared snapshot data and should not be modified !!!
+    """
+
+    def __init__(
+            self, *args, stored_data_lifetime: Optional[float] = None,
+            cleanup_interval: Optional[float] = 1, max_stored_pairs: Optional[int] = None,
+            access_half_life: Optional[float] = 300, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.stored_data_lifetime = stored_data_lifetime
+        self.cleanup_interval = float(cleanup_interval)
+        self.__eviction = None if max_stored_pairs is None else PairAccessFrequencyEviction(
+            max_stored_pairs, half_life=access_half_life)
+        # {exchanger_uniq_name: {pair_title: ScraperStorageBackendPairData } } (immutable after publish)
+        self.__snapshot: Dict[str, Dict[str, ScraperStorageBackendPairData]] = {}
+        self.__snapshot_generation = 0
+        self.__assets_index = PairAssetsIndex()
+        self.__stored_pairs_count = 0
+        self.__next_cleanup_at = 0
+
+    @property
+    def stored_pairs_count(self) -> int:
+        return self.__stored_pairs_count
+
+    @property
+    def snapshot_generation(self) -> int:
+        """ Incremented on each published snapshot """
+        return self.__snapshot_generation
+
+    def _publish(self, snapshot: Dict[str, Dict[str, ScraperStorageBackendPairData]]) -> None:
+        self.__stored_pairs_count = sum(len(exchanger_data) for exchanger_data in snapshot.values())
+        self.__snapshot_generation += 1
+        self.__snapshot = snapshot
+
+    def _is_expired(self, pair_data: ScraperStorageBackendPairData, now: float) -> bool:
+        if self.stored_data_lifetime is None:
+            return False
+        return self.stored_data_lifetime == 0 or (
+            pair_data.last_update is not None and now - pair_data.last_update >= self.stored_data_lifetime)
+
+    def _without_expired_data(
+            self, snapshot: Dict[str, Dict[str, ScraperStorageBackendPairData]]
+            ) -> Dict[str, Dict[str, ScraperStorageBackendPairData]]:
+        """ Return snapshot copy without expired data (exchanges without expired data are not copied) """
+        now = time.time()
+        new_snapshot = {}
+        for exchanger_name, exchanger_data in snapshot.items():
+            if not any(self._is_expired(pair_data, now) for pair_data in exchanger_data.values()):
+                new_snapshot[exchanger_name] = exchanger_data
+                continue
+            new_snapshot[exchanger_name] = new_exchanger_data = {}
+            for pair_title, pair_data in exchanger_data.items():
+                if self._is_expired(pair_data, now):
+                    self.__assets_index.remove_pair(pair_title)
+                else:
+                    new_exchanger_data[pair_title] = pair_data
+        return new_snapshot
+
+    def _without_evicted_data(
+            self, snapshot: Dict[str, Dict[str, ScraperStorageBackendPairData]],
+            copied_exchangers: Set[str]) -> Dict[str, Dict[str, ScraperStorageBackendPairData]]:
+        """ Evict least requested pairs from new (not published) snapshot if stored pairs budget exceeded
+                (exchanges dicts not in copied_exchangers are copied before change)
+        """
+        if self.__eviction is None:
+            return snapshot
+        evicted = self.__eviction.select_evicted(
+            snapshot, sum(len(exchanger_data) for exchanger_data in snapshot.values()))
+        for exchanger_name, pair_title in evicted:
+            if exchanger_name not in copied_exchangers:
+                snapshot[exchanger_name] = dict(snapshot[exchanger_name])
+                copied_exchangers.add(exchanger_name)
+            del snapshot[exchanger_name][pair_title]
+            self.__assets_index.remove_pair(pair_title)
+        return snapshot
+
+    def _cleanup_expired_data_if_due(self) -> None:
+        if self.stored_data_lifetime is None or time.monotonic() < self.__next_cleanup_at:
+            return
+        self.__next_cleanup_at = time.monotonic() + self.cleanup_interval
+        with phase_span("storage_cleanup"):
+            self._publish(self._without_expired_data(self.__snapshot))
+
+    async def store_pair_data(self, new_or_update_data: ScraperStorageBackendPairData) -> None:
+        await self.store_pair_data_list([new_or_update_data])
+
+    async def store_pair_data_list(self, new_or_update_data_list: List[ScraperStorageBackendPairData]) -> None:
+        if len(new_or_update_data_list) == 0:
+            return
+        current_snapshot = self.__snapshot
+        new_snapshot = dict(current_snapshot)
+        copied_exchangers = set()
+        new_pair_stored = False
+        eviction = self.__eviction
+        stored_pairs_count = self.__stored_pairs_count
+        for new_or_update_data in new_or_update_data_list:
+            exchanger_name = new_or_update_data.exchanger_uniq_name
+            pair_title = new_or_update_data.currency_pair_title
+            if pair_title not in new_snapshot.get(exchanger_name, {}):
+                if eviction is not None and not eviction.admit(pair_title, stored_pairs_count):
+                    continue
+                self.__assets_index.add_pair(pair_title)
+                stored_pairs_count += 1
+                new_pair_stored = True
+            if exchanger_name not in copied_exchangers:
+                new_snapshot[exchanger_name] = dict(current_snapshot.get(exchanger_name, {}))
+                copied_exchangers.add(exchanger_name)
+            new_snapshot[exchanger_name][pair_title] = new_or_update_data
+        if new_pair_stored:
+            new_snapshot = self._without_evicted_data(new_snapshot, copied_exchangers)
+        self._publish(new_snapshot)
+        self._cleanup_expired_data_if_due()
+
+    async def get_pair_data(
+            self,
+            pair_title: Optional[str],
+            exchanger_uniq_name: Optional[str] = None) -> Union[
+                ScraperStorageBackendPairData, Dict[str, ScraperStorageBackendPairData]]:
+        if exchanger_uniq_name is None:
+            return await self.get_all(only_for_pair_title=pair_title)
+        self._cleanup_expired_data_if_due()
+
+        result_from_exchanger = self.__snapshot.get(exchanger_uniq_name)
+        if result_from_exchanger is not None:
+            if pair_title is None:
+                # All data record for specified exchanger without passed currency pair title
+                return {exchanger_uniq_name: result_from_exchanger}
+            pair_result = result_from_exchanger.get(pair_title)
+            if pair_result is not None and not self._is_expired(pair_result, time.time()):
+                # Currency data from specified exchanger and currency pair title
+                if self.__eviction is not None:
+                    self.__eviction.record_access(pair_title)
+                return pair_result
+        if self.__eviction is not None and pair_title is not None:
+            # Missing pair is counted too, so it is admitted to full storage after refetch
+            self.__eviction.record_access(pair_title)
+
+        # -> Empty result
+        return await super().get_pair_data(exchanger_uniq_name=exchanger_uniq_name, pair_title=pair_title)
+
+    async def get_all(
+            self, only_for_pair_title: Optional[str] = None,
+            base_asset: Optional[str] = None, quote_asset: Optional[str] = None) -> Dict[
+                str, Dict[str, ScraperStorageBackendPairData]]:
+        self._cleanup_expired_data_if_due()
+        snapshot = self.__snapshot
+        if base_asset is not None or quote_asset is not None:
+            response = self.__assets_index.select(snapshot, base_asset, quote_asset, only_for_pair_title)
+            if self.__eviction is not None:
+                self.__eviction.record_response_access(response)
+            return response
+        if only_for_pair_title is None:
+            return snapshot
+        response = {}
+        for exchanger_name, exchanger_data in snapshot.items():
+            pair_data = exchanger_data.get(only_for_pair_title)
+            if pair_data is not None:
+                response[exchanger_name] = {only_for_pair_title: pair_data}
+        if self.__eviction is not None:
+            # Missing pair is counted too, so it is admitted to full storage after refetch
+            self.__eviction.record_access(only_for_pair_title)
         return response
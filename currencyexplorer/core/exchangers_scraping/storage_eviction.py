@@ -0,0 +1,91 @@
+import heapq
+import time
+from typing import Optional, List, Dict, Tuple
+from ..monitoring import STORAGE_EVICTED_PAIRS, STORAGE_REJECTED_PAIRS
+
+
+class PairAccessFrequencyEviction:
+    """ Stored pairs budget of storage backend with access frequency based eviction and admission (TinyLFU-like).
+            - Storage backends count requests of pairs (get_pair_data and get_all filtered by pair or assets),
+                requests of missing pairs are counted too (so refetched pair can be admitted back).
+            - Access counts are halved every `half_life` seconds, so pairs requested only in the past become cold.
+            - IF more than `max_pairs` records are stored, records are evicted down to
+                `max_pairs * (1 - eviction_batch_ratio)` (one scan of storage for batch of evictions):
+                    pairs with lowest access count first, oldest updated first among pairs with same count.
+            - After first eviction new pair is stored over `max_pairs * (1 - eviction_batch_ratio)` records
+                only if it is requested more often than evicted pairs were (admission threshold),
+                    so cold pairs pushed by listeners again and again don't replace each other.
+    """
+
+    def __init__(
+            self, max_pairs: int, half_life: Optional[float] = 300,
+            eviction_batch_ratio: Optional[float] = 0.05, max_tracked_pairs: Optional[int] = None) -> None:
+        self.max_pairs = max(int(max_pairs), 1)
+        self.half_life = float(half_life)
+        self.eviction_batch_ratio = float(eviction_batch_ratio)
+        # Count of records after eviction, new pairs are admitted without check below this count
+        self.free_admission_pairs = int(self.max_pairs * (1 - self.eviction_batch_ratio))
+        # Access counts are decayed earlier if more pairs are tracked (requests of missing pairs)
+        self.max_tracked_pairs = 4 * self.max_pairs if max_tracked_pairs is None else int(max_tracked_pairs)
+        # {pair_title: decayed access count}
+        self.__access_counts: Dict[str, float] = {}
+        self.__next_decay_at = time.monotonic() + self.half_life
+        # Highest access count of last evicted records (None until first eviction)
+        self.__admission_threshold: Optional[float] = None
+
+    @property
+    def admission_threshold(self) -> Optional[float]:
+        return self.__admission_threshold
+
+    def access_count(self, pair_title: str) -> float:
+        return self.__access_counts.get(pair_title, 0)
+
+    def _decay_if_due(self) -> None:
+        if time.monotonic() < self.__next_decay_at and len(self.__access_counts) <= self.max_tracked_pairs:
+            return
+        self.__next_decay_at = time.monotonic() + self.half_life
+        # Pairs without requests for several half-lives are forgotten (access counts dict stays bounded)
+        self.__access_counts = {
+            pair_title: access_count / 2
+            for pair_title, access_count in self.__access_counts.items() if access_count >= 0.25}
+        if self.__admission_threshold is not None:
+            self.__admission_threshold /= 2
+
+    def record_access(self, pair_title: str) -> None:
+        self._decay_if_due()
+        self.__access_counts[pair_title] = self.__access_counts.get(pair_title, 0) + 1
+
+    def record_response_access(self, response: Dict[str, Dict[str, "ScraperStorageBackendPairData"]]) -> None:
+        """ Count access of each pair in storage response ({exchange: {pair_title: pair_data}}) """
+        pair_titles = {pair_title for exchanger_data in response.values() for pair_title in exchanger_data}
+        for pair_title in pair_titles:
+            self.record_access(pair_title)
+
+    def admit(self, pair_title: str, stored_pairs_count: int) -> bool:
+        """ Check if new (not stored) pair can be stored to storage with `stored_pairs_count` records """
+        if self.__admission_threshold is None or stored_pairs_count < self.free_admission_pairs:
+            return True
+        if self.__access_counts.get(pair_title, 0) > self.__admission_threshold:
+            return True
+        STORAGE_REJECTED_PAIRS.inc()
+        return False
+
+    def select_evicted(
+            self, stored_data: Dict[str, Dict[str, "ScraperStorageBackendPairData"]],
+            stored_pairs_count: int) -> List[Tuple[str, str]]:
+        """ Records ([(exchanger_uniq_name, pair_title)]) which should be evicted from storage data
+                (empty list if storage fits budget)
+        """
+        if stored_pairs_count <= self.max_pairs:
+            return []
+        self._decay_if_due()
+        evicted_count = stored_pairs_count - self.free_admission_pairs
+        access_counts = self.__access_counts
+        evicted = heapq.nsmallest(evicted_count, (
+            (access_counts.get(pair_title, 0), pair_data.last_update or 0, exchanger_name, pair_title)
+            for exchanger_name, exchanger_data in stored_data.items()
+            for pair_title, pair_data in exchanger_data.items()))
+        if len(evicted) != 0:
+            self.__admission_threshold = evicted[-1][0]
+        STORAGE_EVICTED_PAIRS.inc(len(evicted))
+        return [(exchanger_name, pair_title) for _, _, exchanger_name, pair_title in evicted]
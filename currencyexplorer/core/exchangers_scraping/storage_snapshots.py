@@ -0,0 +1,154 @@
+import asyncio
+import math
+import os
+import struct
+import time
+import traceback
+import zlib
+from loguru import logger
+from typing import Optional, List, Dict
+from .storage_backends import AbstractScraperStorageBackend, ScraperStorageBackendPairData
+
+
+STORAGE_SNAPSHOT_MAGIC = b"CESNAP1\0"
+SNAPSHOT_COUNT = struct.Struct("<I")
+SNAPSHOT_STRING_LENGTH = struct.Struct("<H")
+# Record: exchange name index, pair title index, currency rate (NaN if None), last update (NaN if None)
+SNAPSHOT_RECORD = struct.Struct("<IIdd")
+
+
+def encode_storage_snapshot(pair_data_list: List[ScraperStorageBackendPairData]) -> bytes:
+    """ Encode pair data objects to compact binary snapshot (interned strings table + fixed width records) """
+    strings_index: Dict[str, int] = {}
+    records = bytearray()
+    for pair_data in pair_data_list:
+        exchange_index = strings_index.setdefault(pair_data.exchanger_uniq_name, len(strings_index))
+        pair_index = strings_index.setdefault(pair_data.currency_pair_title, len(strings_index))
+        records += SNAPSHOT_RECORD.pack(
+            exchange_index, pair_index,
+            math.nan if pair_data.currency_rate is None else pair_data.currency_rate,
+            math.nan if pair_data.last_update is None else pair_data.last_update)
+
+    body = bytearray(SNAPSHOT_COUNT.pack(len(strings_index)))
+    for string in strings_index:
+        encoded_string = string.encode()
+        body += SNAPSHOT_STRING_LENGTH.pack(len(encoded_string)) + encoded_string
+    body += SNAPSHOT_COUNT.pack(len(pair_data_list)) + records
+    return STORAGE_SNAPSHOT_MAGIC + zlib.compress(bytes(body), 1)
+
+
+def decode_storage_snapshot(snapshot: bytes) -> List[ScraperStorageBackendPairData]:
+    """ Decode binary snapshot created by encode_storage_snapshot() """
+    if not snapshot.startswith(STORAGE_SNAPSHOT_MAGIC):
+        raise ValueError("invalid storage snapshot format")
+    body = memoryview(zlib.decompress(snapshot[len(STORAGE_SNAPSHOT_MAGIC):]))
+    offset = 0
+    (strings_count, ) = SNAPSHOT_COUNT.unpack_from(body, offset)
+    offset += SNAPSHOT_COUNT.size
+    strings = []
+    for _ in range(strings_count):
+        (string_length, ) = SNAPSHOT_STRING_LENGTH.unpack_from(body, offset)
+        offset += SNAPSHOT_STRING_LENGTH.size
+        strings.append(bytes(body[offset:offset + string_length]).decode())
+        offset += string_length
+    (records_count, ) = SNAPSHOT_COUNT.unpack_from(body, offset)
+    offset += SNAPSHOT_COUNT.size
+
+    pair_data_list = []
+    for exchange_index, pair_index, currency_rate, last_update in SNAPSHOT_RECORD.iter_unpack(
+            body[offset:offset + records_count * SNAPSHOT_RECORD.size]):
+        pair_data_list.append(ScraperStorageBackendPairData(
+            exchanger_uniq_name=strings[exchange_index],
+            currency_pair_title=strings[pair_index],
+            currency_rate=None if math.isnan(currency_rate) else currency_rate,
+            last_update=None if math.isnan(last_update) else last_update))
+    return pair_data_list
+
+
+class StorageSnapshotWriter:
+    """ Warm-start snapshots of storage backend content on local disk.
+            - write_snapshot(): dump current storage content to file (file write is executed in thread)
+            - load_snapshot(): store snapshot content to backend with original timestamps,
+                so TTL and staleness rules of backend still apply (records older than `max_record_age`
+                    seconds are skipped, storage would expire them on first cleanup anyway)
+            - run(): periodically write snapshots (background task)
+    """
+
+    def __init__(
+            self, storage_backend: AbstractScraperStorageBackend, snapshot_path: str,
+            write_interval: Optional[float] = 5, max_record_age: Optional[float] = None) -> None:
+        self.storage_backend = storage_backend
+        self.snapshot_path = str(snapshot_path)
+        self.write_interval = float(write_interval)
+        self.max_record_age = max_record_age
+        self.__writer_task: Optional[asyncio.Task] = None
+
+    def _write_file(self, snapshot: bytes) -> None:
+        temp_path = "{}.tmp".format(self.snapshot_path)
+        with open(temp_path, "wb") as f:
+            f.write(snapshot)
+        # Atomic replace, so snapshot file is never partially written
+        os.replace(temp_path, self.snapshot_path)
+
+    def _read_file(self) -> bytes:
+        with open(self.snapshot_path, "rb") as f:
+            return f.read()
+
+    async def write_snapshot(self) -> int:
+        """ Write snapshot of storage content. Return count of written records """
+        stored_data = await self.storage_backend.get_all()
+        pair_data_list = [
+            pair_data for exchanger_data in stored_data.values() for pair_data in exchanger_data.values()]
+        snapshot = await asyncio.to_thread(encode_storage_snapshot, pair_data_list)
+        await asyncio.to_thread(self._write_file, snapshot)
+        return len(pair_data_list)
+
+    async def load_snapshot(self) -> int:
+        """ Load snapshot to storage backend. Return count of loaded records """
+        if not os.path.exists(self.snapshot_path):
+            return 0
+        started_at = time.perf_counter()
+        try:
+            snapshot = await asyncio.to_thread(self._read_file)
+            pair_data_list = await asyncio.to_thread(decode_storage_snapshot, snapshot)
+        except Exception:
+            logger.error("{}: failed to load storage snapshot {}\n{}".format(
+                self.__class__.__name__, self.snapshot_path, traceback.format_exc()))
+            return 0
+        if self.max_record_age is not None:
+            now = time.time()
+            fresh_pair_data_list = [
+                pair_data for pair_data in pair_data_list
+                if pair_data.last_update is None or now - pair_data.last_update < self.max_record_age]
+            if len(fresh_pair_data_list) != len(pair_data_list):
+                logger.warning("{}: {} of {} snapshot records are older than {} seconds and skipped".format(
+                    self.__class__.__name__, len(pair_data_list) - len(fresh_pair_data_list),
+                    len(pair_data_list), self.max_record_age))
+            pair_data_list = fresh_pair_data_list
+        await self.storage_backend.store_pair_data_list(pair_data_list)
+        logger.info("{}: loaded {} records from {} in {:.3f} seconds".format(
+            self.__class__.__name__, len(pair_data_list), self.snapshot_path,
+            time.perf_counter() - started_at))
+        return len(pair_data_list)
+
+    async def run(self) -> None:
+        """ Periodically write snapshots until cancelled """
+        while True:
+            await asyncio.sleep(self.write_interval)
+            try:
+                await self.write_snapshot()
+            except Exception:
+                logger.error("{}: failed to write storage snapshot\n{}".format(
+                    self.__class__.__name__, traceback.format_exc()))
+
+    def start(self) -> None:
+        if self.__writer_task is None or self.__writer_task.done():
+            self.__writer_task = asyncio.create_task(self.run(), name="storage-snapshot-writer")
+
+    async def stop(self, write_final_snapshot: Optional[bool] = True) -> None:
+        if self.__writer_task is not None:
+            self.__writer_task.cancel()
+            await asyncio.gather(self.__writer_task, return_exceptions=True)
+            self.__writer_task = None
+        if write_final_snapshot:
+            await self.write_snapshot()
@@ -0,0 +1,19 @@
+from abc import ABC, abstractmethod
+from typing import List
+from .storage_backends import ScraperStorageBackendPairData
+
+
+class AbstractStoredDataSink(ABC):
+    """ Consumer of currency data stored by scraping manager (history buffers, journals and etc.).
+            Attach sink by ExchangersScrapingManager.attach_stored_data_sink(),
+                sink receives each batch right after it was stored to storage backend.
+    """
+
+    @abstractmethod
+    def handle_stored_batch(self, pair_data_list: List[ScraperStorageBackendPairData]) -> None:
+        """
+            This method should handle batch of stored data.
+                It is called in event loop for each stored batch, so it should be fast and non-blocking
+                    (slow work should be moved to thread or background task).
+        """
+        raise NotImplementedError
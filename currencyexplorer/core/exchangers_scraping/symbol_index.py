@@ -0,0 +1,83 @@
+import json
+import os
+import time
+from typing import Optional, Dict, Tuple, Iterable
+from .exceptions import ExplorerPairInvalidFormatException
+
+
+class ExchangeSymbolIndex:
+    """ Bidirectional index between explorer pair titles (COIN1_COIN2) and exchange native symbols.
+            Built once from exchange instruments list, so symbols normalization is one dict lookup
+                and pair orientation (direct or reversed exchange market) is known before upstream request.
+    """
+
+    def __init__(
+            self, exchanger_uniq_name: str,
+            markets: Optional[Iterable[Tuple[str, str, str]]] = None,
+            created_at: Optional[float] = None) -> None:
+        self.exchanger_uniq_name = str(exchanger_uniq_name)
+        self.created_at = time.time() if created_at is None else float(created_at)
+        # {native_symbol: pair_title}
+        self.__pair_by_native: Dict[str, str] = {}
+        # {pair_title: native_symbol}
+        self.__native_by_pair: Dict[str, str] = {}
+        for native_symbol, base_asset, quote_asset in (markets or []):
+            self.add_market(native_symbol, base_asset, quote_asset)
+
+    def add_market(self, native_symbol: str, base_asset: str, quote_asset: str) -> None:
+        # Pair titles are validated once here, so records made from index are not validated per tick
+        pair_title = ExplorerPairInvalidFormatException.explorer_pair_format_validator(
+            "{}_{}".format(base_asset, quote_asset))
+        self.__pair_by_native[str(native_symbol)] = pair_title
+        self.__native_by_pair[pair_title] = str(native_symbol)
+
+    def pair_title_for(self, native_symbol: str) -> Optional[str]:
+        """ Explorer pair title for exchange native symbol (None if market not found) """
+        return self.__pair_by_native.get(native_symbol)
+
+    def native_symbol_for(self, pair_title: str) -> Optional[Tuple[str, bool]]:
+        """ Exchange native symbol for pair title and swap price flag (True if pair is reversed market).
+                Return None if exchange has no market for this pair in any direction
+        """
+        native_symbol = self.__native_by_pair.get(pair_title)
+        if native_symbol is not None:
+            return native_symbol, False
+        base_asset, _, quote_asset = str(pair_title).partition("_")
+        native_symbol = self.__native_by_pair.get("{}_{}".format(quote_asset, base_asset))
+        if native_symbol is not None:
+            return native_symbol, True
+        return None
+
+    def __len__(self) -> int:
+        return len(self.__pair_by_native)
+
+    def __contains__(self, native_symbol: object) -> bool:
+        return native_symbol in self.__pair_by_native
+
+    def save(self, path: str) -> None:
+        """ Write index to JSON file (atomic replace) """
+        temp_path = "{}.tmp".format(path)
+        with open(temp_path, "w") as f:
+            json.dump({
+                "exchange": self.exchanger_uniq_name,
+                "created_at": self.created_at,
+                "markets": {
+                    native_symbol: pair_title.split("_", 1)
+                    for native_symbol, pair_title in self.__pair_by_native.items()}}, f, separators=(",", ":"))
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(CLS, path: str, max_age: Optional[float] = None) -> Optional["ExchangeSymbolIndex"]:
+        """ Load index from JSON file. Return None if file not found or older than max_age seconds """
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            data = json.load(f)
+        if max_age is not None and time.time() - data["created_at"] > max_age:
+            return None
+        return CLS(
+            data["exchange"],
+            markets=[
+                (native_symbol, base_asset, quote_asset)
+                for native_symbol, (base_asset, quote_asset) in data["markets"].items()],
+            created_at=data["created_at"])
@@ -0,0 +1,325 @@
+import asyncio
+import os
+import queue
+import threading
+import time
+import traceback
+import numpy as np
+from loguru import logger
+from typing import Optional, List, Dict, Tuple, NamedTuple, Iterator
+from .storage_backends import ScraperStorageBackendPairData
+from .stored_data_sinks import AbstractStoredDataSink
+from ..monitoring import TICK_JOURNAL_WRITTEN_TICKS, TICK_JOURNAL_DROPPED_TICKS
+
+
+# Fixed width record (20 bytes): timestamp (float64), interned symbol id (uint32), currency rate (float64)
+TICK_JOURNAL_RECORD_DTYPE = np.dtype([("timestamp", "<f8"), ("symbol_id", "<u4"), ("rate", "<f8")])
+
+# Interned symbols index: one "<exchange>\t<pair>" line per symbol, symbol id is line number
+TICK_JOURNAL_SYMBOLS_FILENAME = "symbols.txt"
+# Active segment: ticks-<first tick timestamp>.active
+# Closed segment: ticks-<first tick timestamp>-<last tick timestamp>.seg (timestamps in ms)
+TICK_JOURNAL_SEGMENT_PREFIX = "ticks-"
+TICK_JOURNAL_ACTIVE_SUFFIX = ".active"
+TICK_JOURNAL_CLOSED_SUFFIX = ".seg"
+
+
+class TickJournalSegment(NamedTuple):
+    """ Segment file of tick journal (last_timestamp is None for active segment) """
+    path: str
+    first_timestamp: float
+    last_timestamp: Optional[float]
+
+
+class TickJournalRange(NamedTuple):
+    """ Ticks of one (exchange, pair) in time window (arrays of same length, in write order) """
+    timestamps: np.ndarray
+    rates: np.ndarray
+
+
+def list_tick_journal_segments(journal_path: str) -> List[TickJournalSegment]:
+    """ Segments of journal directory sorted by first tick timestamp """
+    segments = []
+    for filename in os.listdir(journal_path):
+        if not filename.startswith(TICK_JOURNAL_SEGMENT_PREFIX):
+            continue
+        path = os.path.join(journal_path, filename)
+        name = filename[len(TICK_JOURNAL_SEGMENT_PREFIX):]
+        if name.endswith(TICK_JOURNAL_ACTIVE_SUFFIX):
+            segments.append(TickJournalSegment(
+                path, int(name[:-len(TICK_JOURNAL_ACTIVE_SUFFIX)]) / 1000, None))
+        elif name.endswith(TICK_JOURNAL_CLOSED_SUFFIX):
+            first_ms, _, last_ms = name[:-len(TICK_JOURNAL_CLOSED_SUFFIX)].partition("-")
+            segments.append(TickJournalSegment(path, int(first_ms) / 1000, int(last_ms) / 1000))
+    return sorted(segments, key=lambda segment: segment.first_timestamp)
+
+
+def map_tick_journal_segment(path: str) -> np.ndarray:
+    """ Read-only memory map of segment records (incomplete last record is ignored) """
+    records_count = os.path.getsize(path) // TICK_JOURNAL_RECORD_DTYPE.itemsize
+    if records_count == 0:
+        return np.empty(0, dtype=TICK_JOURNAL_RECORD_DTYPE)
+    return np.memmap(path, dtype=TICK_JOURNAL_RECORD_DTYPE, mode="r", shape=(records_count, ))
+
+
+class TickJournalWriter(AbstractStoredDataSink):
+    """ Append-only on-disk journal of stored ticks (history for audits and backfills beyond RAM).
+            - Stored batches are passed to writer thread by bounded queue, so event loop never waits for disk.
+                IF queue is full batch is dropped (currencyexplorer_tick_journal_dropped_ticks_total metric).
+            - Ticks are written to segment files of fixed width records with interned symbol ids.
+            - Segment is closed (renamed with last tick timestamp) after `segment_max_bytes` bytes or
+                `segment_max_age` seconds, closed segments older than `retention` seconds are deleted.
+            Use TickJournalReader for range scans of journal.
+    """
+
+    def __init__(
+            self, journal_path: str, segment_max_bytes: Optional[int] = 64 * 1024 * 1024,
+            segment_max_age: Optional[float] = 3600, retention: Optional[float] = 7 * 86400,
+            max_pending_batches: Optional[int] = 10000) -> None:
+        self.journal_path = str(journal_path)
+        self.segment_max_bytes = int(segment_max_bytes)
+        self.segment_max_age = float(segment_max_age)
+        self.retention = None if retention is None else float(retention)
+        self.__queue: queue.Queue = queue.Queue(maxsize=max_pending_batches)
+        self.__thread: Optional[threading.Thread] = None
+        # Writer thread state
+        # {(exchanger_uniq_name, pair_title): symbol_id}
+        self.__symbol_ids: Dict[Tuple[str, str], int] = {}
+        self.__symbols_file = None
+        self.__segment_file = None
+        self.__segment_first_timestamp: Optional[float] = None
+        self.__segment_last_timestamp: Optional[float] = None
+        self.__segment_opened_at = 0.0
+        self.__segment_size = 0
+
+    def handle_stored_batch(self, pair_data_list: List[ScraperStorageBackendPairData]) -> None:
+        try:
+            self.__queue.put_nowait(pair_data_list)
+        except queue.Full:
+            TICK_JOURNAL_DROPPED_TICKS.inc(len(pair_data_list))
+
+    def start(self) -> None:
+        if self.__thread is not None and self.__thread.is_alive():
+            return
+        os.makedirs(self.journal_path, exist_ok=True)
+        self._load_symbols()
+        self._close_active_segments()
+        self.__thread = threading.Thread(target=self._writer_flow, name="tick-journal-writer", daemon=True)
+        self.__thread.start()
+
+    async def stop(self, timeout: Optional[float] = 5) -> None:
+        """ Write pending batches, close active segment and stop writer thread """
+        if self.__thread is None:
+            return
+        self.__queue.put(None)
+        await asyncio.to_thread(self.__thread.join, timeout)
+        if self.__thread.is_alive():
+            logger.warning("{}: writer thread not finished in {} seconds".format(
+                self.__class__.__name__, timeout))
+        self.__thread = None
+
+    # Writer thread
+
+    def _writer_flow(self) -> None:
+        while True:
+            try:
+                batch = self.__queue.get(timeout=1)
+            except queue.Empty:
+                batch = []
+            batches, stop_requested = [batch], batch is None
+            # Write all pending batches by one write call
+            while not stop_requested:
+                try:
+                    batch = self.__queue.get_nowait()
+                except queue.Empty:
+                    break
+                stop_requested = batch is None
+                batches.append(batch)
+            try:
+                self._write_records(self._make_records(
+                    [pair_data for batch in batches if batch is not None for pair_data in batch]))
+                self._rotate_if_due()
+            except Exception:
+                logger.error("{}: failed to write ticks\n{}".format(
+                    self.__class__.__name__, traceback.format_exc()))
+            if stop_requested:
+                self._close_segment()
+                if self.__symbols_file is not None:
+                    self.__symbols_file.close()
+                    self.__symbols_file = None
+                return
+
+    def _load_symbols(self) -> None:
+        symbols_path = os.path.join(self.journal_path, TICK_JOURNAL_SYMBOLS_FILENAME)
+        if os.path.exists(symbols_path):
+            # Drop incomplete last line (crash during write), so new symbols are appended to own lines
+            with open(symbols_path, "r+b") as f:
+                f.truncate(f.read().rfind(b"\n") + 1)
+        self.__symbol_ids = {
+            symbol: symbol_id for symbol_id, symbol in enumerate(read_tick_journal_symbols(symbols_path))}
+        self.__symbols_file = open(symbols_path, "a")
+
+    def _symbol_id(self, exchanger_uniq_name: str, pair_title: str) -> int:
+        symbol = (exchanger_uniq_name, pair_title)
+        symbol_id = self.__symbol_ids.get(symbol)
+        if symbol_id is None:
+            symbol_id = self.__symbol_ids[symbol] = len(self.__symbol_ids)
+            self.__symbols_file.write("{}\t{}\n".format(exchanger_uniq_name, pair_title))
+            # Symbol must be on disk before records which refer to it
+            self.__symbols_file.flush()
+        return symbol_id
+
+    def _make_records(self, pair_data_list: List[ScraperStorageBackendPairData]) -> np.ndarray:
+        return np.array([
+            (pair_data.last_update,
+                self._symbol_id(pair_data.exchanger_uniq_name, pair_data.currency_pair_title),
+                pair_data.currency_rate)
+            for pair_data in pair_data_list
+            if pair_data.currency_rate is not None and pair_data.last_update is not None
+        ], dtype=TICK_JOURNAL_RECORD_DTYPE)
+
+    def _write_records(self, records: np.ndarray) -> None:
+        if len(records) == 0:
+            return
+        if self.__segment_file is None:
+            self._open_segment(float(records["timestamp"].min()))
+        self.__segment_file.write(records.tobytes())
+        self.__segment_file.flush()
+        self.__segment_size += records.nbytes
+        self.__segment_first_timestamp = min(self.__segment_first_timestamp, float(records["timestamp"].min()))
+        last_timestamp = float(records["timestamp"].max())
+        if self.__segment_last_timestamp is None or last_timestamp > self.__segment_last_timestamp:
+            self.__segment_last_timestamp = last_timestamp
+        TICK_JOURNAL_WRITTEN_TICKS.inc(len(records))
+
+    def _open_segment(self, first_timestamp: float) -> None:
+        self.__segment_first_timestamp = first_timestamp
+        self.__segment_last_timestamp = None
+        self.__segment_opened_at = time.monotonic()
+        self.__segment_size = 0
+        self.__segment_file = open(self._active_segment_path(first_timestamp), "ab")
+
+    def _active_segment_path(self, first_timestamp: float) -> str:
+        return os.path.join(self.journal_path, "{}{}{}".format(
+            TICK_JOURNAL_SEGMENT_PREFIX, int(first_timestamp * 1000), TICK_JOURNAL_ACTIVE_SUFFIX))
+
+    def _close_segment(self) -> None:
+        if self.__segment_file is None:
+            return
+        active_path = self.__segment_file.name
+        self.__segment_file.close()
+        self.__segment_file = None
+        os.replace(active_path, os.path.join(self.journal_path, "{}{}-{}{}".format(
+            TICK_JOURNAL_SEGMENT_PREFIX, int(self.__segment_first_timestamp * 1000),
+            int(np.ceil(self.__segment_last_timestamp * 1000)), TICK_JOURNAL_CLOSED_SUFFIX)))
+
+    def _close_active_segments(self) -> None:
+        """ Close segments left active by previous run (crash): truncate incomplete record, add last timestamp """
+        for segment in list_tick_journal_segments(self.journal_path):
+            if segment.last_timestamp is not None:
+                continue
+            record_size = TICK_JOURNAL_RECORD_DTYPE.itemsize
+            with open(segment.path, "r+b") as f:
+                f.truncate(os.path.getsize(segment.path) // record_size * record_size)
+            records = map_tick_journal_segment(segment.path)
+            if len(records) == 0:
+                os.remove(segment.path)
+                continue
+            first_timestamp, last_timestamp = float(records["timestamp"].min()), float(records["timestamp"].max())
+            del records
+            os.replace(segment.path, os.path.join(self.journal_path, "{}{}-{}{}".format(
+                TICK_JOURNAL_SEGMENT_PREFIX, int(first_timestamp * 1000), int(np.ceil(last_timestamp * 1000)),
+                TICK_JOURNAL_CLOSED_SUFFIX)))
+
+    def _rotate_if_due(self) -> None:
+        if self.__segment_file is not None and (
+                self.__segment_size >= self.segment_max_bytes
+                or time.monotonic() - self.__segment_opened_at >= self.segment_max_age):
+            self._close_segment()
+            self._remove_expired_segments()
+
+    def _remove_expired_segments(self) -> None:
+        if self.retention is None:
+            return
+        expired_before = time.time() - self.retention
+        for segment in list_tick_journal_segments(self.journal_path):
+            if segment.last_timestamp is not None and segment.last_timestamp < expired_before:
+                os.remove(segment.path)
+
+
+def read_tick_journal_symbols(symbols_path: str) -> List[Tuple[str, str]]:
+    """ Interned symbols list (symbol id is index in list) """
+    if not os.path.exists(symbols_path):
+        return []
+    symbols = []
+    with open(symbols_path) as f:
+        for line in f:
+            if not line.endswith("\n"):
+                # Line is not fully written yet
+                break
+            exchanger_uniq_name, _, pair_title = line[:-1].partition("\t")
+            symbols.append((exchanger_uniq_name, pair_title))
+    return symbols
+
+
+class TickJournalReader:
+    """ Range scans of journal written by TickJournalWriter (can be used by other process).
+            Segments are memory-mapped, only segments overlapping time window are scanned
+                and only matched ticks are copied from mapped pages.
+    """
+
+    def __init__(self, journal_path: str) -> None:
+        self.journal_path = str(journal_path)
+        self.__symbols_path = os.path.join(self.journal_path, TICK_JOURNAL_SYMBOLS_FILENAME)
+        self.__symbols: List[Tuple[str, str]] = []
+        self.__symbol_ids: Dict[Tuple[str, str], int] = {}
+        self.__symbols_file_size = -1
+
+    def get_symbols(self) -> List[Tuple[str, str]]:
+        """ (exchanger_uniq_name, pair_title) of all journaled symbols """
+        symbols_file_size = os.path.getsize(self.__symbols_path) if os.path.exists(self.__symbols_path) else 0
+        if symbols_file_size != self.__symbols_file_size:
+            self.__symbols_file_size = symbols_file_size
+            self.__symbols = read_tick_journal_symbols(self.__symbols_path)
+            self.__symbol_ids = {symbol: symbol_id for symbol_id, symbol in enumerate(self.__symbols)}
+        return self.__symbols
+
+    def get_segments(self, since: Optional[float] = None, until: Optional[float] = None) -> List[TickJournalSegment]:
+        """ Segments which can contain ticks of [since, until) window """
+        # Active segment is always scanned: its bounds are known only after it is closed
+        return [
+            segment for segment in list_tick_journal_segments(self.journal_path)
+            if segment.last_timestamp is None or (
+                (until is None or segment.first_timestamp < until)
+                and (since is None or segment.last_timestamp >= since))]
+
+    def iter_segment_records(
+            self, since: Optional[float] = None, until: Optional[float] = None) -> Iterator[np.ndarray]:
+        """ Memory-mapped records of segments overlapping time window (zero-copy views) """
+        for segment in self.get_segments(since, until):
+            try:
+                yield map_tick_journal_segment(segment.path)
+            except FileNotFoundError:
+                # Segment was closed (renamed) or removed by retention during scan
+                continue
+
+    def read_ticks(
+            self, exchanger_uniq_name: str, pair_title: str,
+            since: Optional[float] = None, until: Optional[float] = None) -> TickJournalRange:
+        """ Ticks of exchange pair in [since, until) window (empty range if symbol not journaled) """
+        self.get_symbols()
+        symbol_id = self.__symbol_ids.get((exchanger_uniq_name, pair_title))
+        timestamps, rates = [], []
+        if symbol_id is not None:
+            for records in self.iter_segment_records(since, until):
+                mask = records["symbol_id"] == symbol_id
+                if since is not None:
+                    mask &= records["timestamp"] >= since
+                if until is not None:
+                    mask &= records["timestamp"] < until
+                matched = records[mask]
+                timestamps.append(matched["timestamp"])
+                rates.append(matched["rate"])
+        if len(timestamps) == 0:
+            return TickJournalRange(np.empty(0, dtype=np.float64), np.empty(0, dtype=np.float64))
+        return TickJournalRange(np.concatenate(timestamps), np.concatenate(rates))
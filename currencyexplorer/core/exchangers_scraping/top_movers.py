@@ -0,0 +1,126 @@
+import time
+from bisect import bisect_left, insort
+from collections import deque
+from typing import Optional, List, Dict, Tuple, NamedTuple, Deque
+from .storage_backends import ScraperStorageBackendPairData
+from .stored_data_sinks import AbstractStoredDataSink
+
+
+# Leaderboard windows: {window title: window size in seconds}
+TOP_MOVERS_WINDOWS: Dict[str, float] = {"1m": 60, "5m": 300, "1h": 3600}
+# Count of reference samples kept for one window of one pair (window resolution: window / samples count)
+TOP_MOVERS_WINDOW_SAMPLES = 60
+
+
+class TopMover(NamedTuple):
+    """ Rate change of exchange pair over window """
+    exchanger_uniq_name: str
+    pair_title: str
+    change: float
+    open_rate: float
+    currency_rate: float
+    last_update: float
+
+
+class _PairMoves:
+    """ Last rate and reference samples (timestamp, rate) of each window for one (exchange, pair) """
+    __slots__ = ("currency_rate", "last_update", "samples")
+
+    def __init__(self, windows_count: int) -> None:
+        self.currency_rate = 0.0
+        self.last_update = 0.0
+        self.samples: List[Deque[Tuple[float, float]]] = [deque() for _ in range(windows_count)]
+
+
+class TopMoversLeaderboard(AbstractStoredDataSink):
+    """ Incremental leaderboard of pairs with biggest rate change over 1m/5m/1h windows.
+            - Each stored tick updates window change of its (exchange, pair): change from rate at window start
+                (sampled with window / TOP_MOVERS_WINDOW_SAMPLES resolution) to current rate.
+            - Each window keeps pairs in sorted list by absolute change (bisect updates on each tick),
+                so top() is a slice of list head (pairs without ticks during window are skipped).
+    """
+
+    def __init__(self, windows: Optional[Dict[str, float]] = None) -> None:
+        self.windows: Dict[str, float] = dict(TOP_MOVERS_WINDOWS if windows is None else windows)
+        self.__window_titles = list(self.windows)
+        self.__window_sizes = [float(self.windows[title]) for title in self.__window_titles]
+        self.__window_resolutions = [size / TOP_MOVERS_WINDOW_SAMPLES for size in self.__window_sizes]
+        # {(exchanger_uniq_name, pair_title): _PairMoves}
+        self.__pairs: Dict[Tuple[str, str], _PairMoves] = {}
+        # Per window: sorted list of (-abs(change), exchanger_uniq_name, pair_title) and current entry of pair
+        self.__rankings: List[List[Tuple[float, str, str]]] = [[] for _ in self.__window_titles]
+        self.__ranking_entries: List[Dict[Tuple[str, str], Tuple[float, str, str]]] = [
+            {} for _ in self.__window_titles]
+        self.__changes: List[Dict[Tuple[str, str], Tuple[float, float]]] = [{} for _ in self.__window_titles]
+
+    @property
+    def pairs_count(self) -> int:
+        return len(self.__pairs)
+
+    def handle_stored_batch(self, pair_data_list: List[ScraperStorageBackendPairData]) -> None:
+        for pair_data in pair_data_list:
+            if not pair_data.currency_rate or pair_data.last_update is None:
+                continue
+            self._handle_tick(
+                (pair_data.exchanger_uniq_name, pair_data.currency_pair_title),
+                pair_data.last_update, pair_data.currency_rate)
+
+    def _handle_tick(self, key: Tuple[str, str], timestamp: float, currency_rate: float) -> None:
+        pair_moves = self.__pairs.get(key)
+        if pair_moves is None:
+            pair_moves = self.__pairs[key] = _PairMoves(len(self.__window_titles))
+        elif timestamp < pair_moves.last_update:
+            # Outdated tick (refresh response older than listener update)
+            return
+        pair_moves.currency_rate = currency_rate
+        pair_moves.last_update = timestamp
+        for window_index, samples in enumerate(pair_moves.samples):
+            if len(samples) == 0 or timestamp - samples[-1][0] >= self.__window_resolutions[window_index]:
+                samples.append((timestamp, currency_rate))
+            # Keep one sample at or before window start as reference rate
+            window_start = timestamp - self.__window_sizes[window_index]
+            while len(samples) > 1 and samples[1][0] <= window_start:
+                samples.popleft()
+            open_rate = samples[0][1]
+            change = (currency_rate - open_rate) / open_rate
+            self.__changes[window_index][key] = (change, open_rate)
+            self._update_ranking(window_index, key, (-abs(change), key[0], key[1]))
+
+    def _update_ranking(self, window_index: int, key: Tuple[str, str], entry: Tuple[float, str, str]) -> None:
+        ranking, entries = self.__rankings[window_index], self.__ranking_entries[window_index]
+        previous_entry = entries.get(key)
+        if previous_entry == entry:
+            return
+        if previous_entry is not None:
+            del ranking[bisect_left(ranking, previous_entry)]
+        insort(ranking, entry)
+        entries[key] = entry
+
+    def top(self, window: str, limit: Optional[int] = 10, now: Optional[float] = None) -> List[TopMover]:
+        """ Pairs with biggest absolute rate change over window (pairs without ticks in window are skipped) """
+        window_index = self.__window_titles.index(window)
+        window_start = (time.time() if now is None else now) - self.__window_sizes[window_index]
+        changes = self.__changes[window_index]
+        result, stale_keys = [], []
+        for _, exchanger_uniq_name, pair_title in self.__rankings[window_index]:
+            if len(result) >= limit:
+                break
+            key = (exchanger_uniq_name, pair_title)
+            pair_moves = self.__pairs[key]
+            if pair_moves.last_update < window_start:
+                stale_keys.append(key)
+                continue
+            change, open_rate = changes[key]
+            result.append(TopMover(
+                exchanger_uniq_name, pair_title, change, open_rate,
+                pair_moves.currency_rate, pair_moves.last_update))
+        # Stale pairs are removed from ranking until next tick, so they are not scanned by next queries
+        for key in stale_keys:
+            self._remove_from_ranking(window_index, key)
+        return result
+
+    def _remove_from_ranking(self, window_index: int, key: Tuple[str, str]) -> None:
+        entry = self.__ranking_entries[window_index].pop(key, None)
+        if entry is not None:
+            ranking = self.__rankings[window_index]
+            del ranking[bisect_left(ranking, entry)]
@@ -0,0 +1,14 @@
+from .metrics import (
+    MetricsRegistry, CounterMetric, GaugeMetric, HistogramMetric, metrics_registry,
+    SCRAPER_INGEST_FRAMES, SCRAPER_INGEST_TICKS, SCRAPER_PARSE_SECONDS, SCRAPER_INGEST_LAG_SECONDS,
+    SCRAPER_INGEST_QUEUE_DEPTH, SCRAPER_INGEST_CONFLATED_TICKS, SCRAPER_INGEST_DROPPED_TICKS,
+    SCRAPER_LISTENER_RESTARTS, UPSTREAM_RATE_LIMIT_REMAINING, UPSTREAM_RATE_LIMIT_REJECTED,
+    UPSTREAM_CIRCUIT_BREAKER_STATE, UPSTREAM_CIRCUIT_BREAKER_REJECTED, UPSTREAM_HEDGED_REQUESTS,
+    STORAGE_OPERATION_SECONDS, STORAGE_STORED_PAIRS, STORAGE_EVICTED_PAIRS, STORAGE_REJECTED_PAIRS,
+    TICK_JOURNAL_WRITTEN_TICKS, TICK_JOURNAL_DROPPED_TICKS, FEED_RECORDING_DROPPED_RECORDS,
+    GETTER_UPDATE_ATEMPTS, WEBSOCKET_CONNECTIONS, WEBSOCKET_SEND_SECONDS,
+    EVENT_LOOP_LAG_SECONDS, ADMISSION_REJECTED)
+from .phase_timing import (
+    RequestPhaseTimings, phase_span, start_phase_timings, stop_phase_timings, get_phase_timings)
+from .sampling_profiler import SamplingProfiler
+from .loop_lag import EventLoopLagMonitor
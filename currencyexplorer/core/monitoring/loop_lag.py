@@ -0,0 +1,46 @@
+import asyncio
+from typing import Optional
+
+
+class EventLoopLagMonitor:
+    """ Event loop lag (scheduling delay) monitor.
+            Background task sleeps `interval` seconds and measures how much later than planned it was woken up.
+                lag - smoothed lag (EWMA of samples), also includes current stall
+                    (loop is blocked longer than expected since last sample).
+    """
+
+    def __init__(self, interval: Optional[float] = 0.05, smoothing: Optional[float] = 0.3) -> None:
+        self.interval = float(interval)
+        self.smoothing = float(smoothing)
+        self.last_sample = 0.0
+        self.__smoothed_lag = 0.0
+        self.__loop: Optional[asyncio.AbstractEventLoop] = None
+        self.__next_wakeup_at: Optional[float] = None
+        self.__monitor_task: Optional[asyncio.Task] = None
+
+    @property
+    def lag(self) -> float:
+        if self.__next_wakeup_at is None:
+            return self.__smoothed_lag
+        current_stall = self.__loop.time() - self.__next_wakeup_at
+        return max(self.__smoothed_lag, current_stall)
+
+    async def run(self) -> None:
+        """ Measure loop lag until cancelled """
+        loop = self.__loop = asyncio.get_running_loop()
+        while True:
+            self.__next_wakeup_at = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.last_sample = max(loop.time() - self.__next_wakeup_at, 0)
+            self.__smoothed_lag += self.smoothing * (self.last_sample - self.__smoothed_lag)
+
+    def start(self) -> None:
+        if self.__monitor_task is None or self.__monitor_task.done():
+            self.__monitor_task = asyncio.create_task(self.run(), name="event-loop-lag-monitor")
+
+    async def stop(self) -> None:
+        if self.__monitor_task is not None:
+            self.__monitor_task.cancel()
+            await asyncio.gather(self.__monitor_task, return_exceptions=True)
+            self.__monitor_task = None
+        self.__next_wakeup_at = None
@@ -0,0 +1,265 @@
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Optional, Dict, Tuple, List, Callable, ClassVar, Iterator
+
+
+DEFAULT_LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+
+class AbstractMetric:
+    """ Basic metric class for Prometheus-style text exposition.
+            Metric values are stored per labels tuple in plain python dicts,
+                so updating metric is just one dict lookup (cheap enough for permanent usage)
+    """
+    METRIC_TYPE: ClassVar[str]
+
+    def __init__(self, name: str, description: str, labels: Optional[Tuple[str, ...]] = ()) -> None:
+        self.name = str(name)
+        self.description = str(description)
+        self.labels_names = tuple(labels)
+
+    def _labels_key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        if len(labels) != len(self.labels_names):
+            raise ValueError("{} metric expects labels: {}".format(
+                self.name, ",".join(self.labels_names)))
+        return tuple(str(labels[label_name]) for label_name in self.labels_names)
+
+    def _format_labels(self, labels_key: Tuple[str, ...], **extra_labels: str) -> str:
+        pairs = list(zip(self.labels_names, labels_key)) + list(extra_labels.items())
+        if len(pairs) == 0:
+            return ""
+        return "{" + ",".join(
+            '{}="{}"'.format(k, str(v).replace("\\", "\\\\").replace('"', '\\"')) for k, v in pairs) + "}"
+
+    def collect(self) -> List[str]:
+        """ Return metric samples lines in Prometheus text format """
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [
+            "# HELP {} {}".format(self.name, self.description),
+            "# TYPE {} {}".format(self.name, self.METRIC_TYPE)]
+        lines.extend(self.collect())
+        return "\n".join(lines)
+
+
+class CounterMetric(AbstractMetric):
+    """ Monotonically increasing counter (rates like ticks per second calculated by rate() on scraper side) """
+    METRIC_TYPE: ClassVar[str] = "counter"
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, value: Optional[float] = 1, **labels: str) -> None:
+        key = self._labels_key(labels)
+        self._values[key] = self._values.get(key, 0) + value
+
+    def get(self, **labels: str) -> float:
+        return self._values.get(self._labels_key(labels), 0)
+
+    def collect(self) -> List[str]:
+        return [
+            "{}{} {}".format(self.name, self._format_labels(key), value)
+            for key, value in list(self._values.items())]
+
+
+class GaugeMetric(AbstractMetric):
+    """ Gauge metric, value can be set directly or calculated by callback on collect """
+    METRIC_TYPE: ClassVar[str] = "gauge"
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._value_function: Optional[Callable[[], Optional[float]]] = None
+
+    def set(self, value: float, **labels: str) -> None:
+        self._values[self._labels_key(labels)] = value
+
+    def inc(self, value: Optional[float] = 1, **labels: str) -> None:
+        key = self._labels_key(labels)
+        self._values[key] = self._values.get(key, 0) + value
+
+    def dec(self, value: Optional[float] = 1, **labels: str) -> None:
+        self.inc(-value, **labels)
+
+    def get(self, **labels: str) -> float:
+        return self._values.get(self._labels_key(labels), 0)
+
+    def set_function(self, value_function: Callable[[], Optional[float]]) -> None:
+        """ Set callback for calculate gauge value (only for metrics without labels) """
+        if len(self.labels_names) != 0:
+            raise ValueError("{} gauge with labels can't use value function".format(self.name))
+        self._value_function = value_function
+
+    def collect(self) -> List[str]:
+        if self._value_function is not None:
+            value = self._value_function()
+            return [] if value is None else ["{} {}".format(self.name, value)]
+        return [
+            "{}{} {}".format(self.name, self._format_labels(key), value)
+            for key, value in list(self._values.items())]
+
+
+class HistogramMetric(AbstractMetric):
+    """ Histogram metric with fixed buckets (observe is one bisect + list item increment) """
+    METRIC_TYPE: ClassVar[str] = "histogram"
+
+    def __init__(
+            self, *args,
+            buckets: Optional[Tuple[float, ...]] = DEFAULT_LATENCY_BUCKETS, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(sorted(buckets))
+        # {labels_key: [bucket_1_count, ..., +Inf_count, sum]}
+        self._values: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._labels_key(labels)
+        counts = self._values.get(key)
+        if counts is None:
+            counts = self._values[key] = [0] * (len(self.buckets) + 2)
+        counts[bisect_left(self.buckets, value)] += 1
+        counts[-1] += value
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """ Observe execution time of context block """
+        started_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started_at, **labels)
+
+    def collect(self) -> List[str]:
+        lines = []
+        for key, counts in list(self._values.items()):
+            cumulative_count = 0
+            for bucket_index, bucket in enumerate(self.buckets + (float("inf"), )):
+                cumulative_count += counts[bucket_index]
+                lines.append("{}_bucket{} {}".format(
+                    self.name,
+                    self._format_labels(key, le="+Inf" if bucket == float("inf") else repr(bucket)),
+                    cumulative_count))
+            lines.append("{}_sum{} {}".format(self.name, self._format_labels(key), counts[-1]))
+            lines.append("{}_count{} {}".format(self.name, self._format_labels(key), cumulative_count))
+        return lines
+
+
+class MetricsRegistry:
+    """ Registry of application metrics. Render all registered metrics in Prometheus text format """
+
+    def __init__(self) -> None:
+        self.__metrics: Dict[str, AbstractMetric] = {}
+
+    def register(self, metric: AbstractMetric) -> AbstractMetric:
+        if metric.name in self.__metrics:
+            raise NameError("{} metric already registered".format(metric.name))
+        self.__metrics[metric.name] = metric
+        return metric
+
+    def counter(self, *args, **kwargs) -> CounterMetric:
+        return self.register(CounterMetric(*args, **kwargs))
+
+    def gauge(self, *args, **kwargs) -> GaugeMetric:
+        return self.register(GaugeMetric(*args, **kwargs))
+
+    def histogram(self, *args, **kwargs) -> HistogramMetric:
+        return self.register(HistogramMetric(*args, **kwargs))
+
+    def get(self, name: str) -> AbstractMetric:
+        return self.__metrics[name]
+
+    def render(self) -> str:
+        return "\n".join(metric.render() for metric in list(self.__metrics.values())) + "\n"
+
+
+#############################################
+# Default application metrics registry #
+
+metrics_registry = MetricsRegistry()
+
+
+# Ingestion
+SCRAPER_INGEST_FRAMES = metrics_registry.counter(
+    "currencyexplorer_scraper_ingest_frames_total",
+    "Frames (listener updates or fetch responses) received from exchange scraper",
+    labels=("exchange", ))
+SCRAPER_INGEST_TICKS = metrics_registry.counter(
+    "currencyexplorer_scraper_ingest_ticks_total",
+    "Currency pair ticks received from exchange scraper", labels=("exchange", ))
+SCRAPER_PARSE_SECONDS = metrics_registry.histogram(
+    "currencyexplorer_scraper_parse_seconds",
+    "Time spent on parsing exchange payload to pair data objects", labels=("exchange", ))
+SCRAPER_INGEST_LAG_SECONDS = metrics_registry.histogram(
+    "currencyexplorer_scraper_ingest_lag_seconds",
+    "Lag between exchange event time of tick and storing to backend (exchanges with event time only)",
+    labels=("exchange", ),
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60))
+SCRAPER_LISTENER_RESTARTS = metrics_registry.counter(
+    "currencyexplorer_scraper_listener_restarts_total",
+    "Restarts of crashed exchange scraper listeners", labels=("exchange", ))
+SCRAPER_INGEST_QUEUE_DEPTH = metrics_registry.gauge(
+    "currencyexplorer_scraper_ingest_queue_depth",
+    "Pairs with pending (not stored yet) listener updates in ingest queue", labels=("exchange", ))
+SCRAPER_INGEST_CONFLATED_TICKS = metrics_registry.counter(
+    "currencyexplorer_scraper_ingest_conflated_ticks_total",
+    "Pending listener updates replaced by newer update of same pair before storing", labels=("exchange", ))
+SCRAPER_INGEST_DROPPED_TICKS = metrics_registry.counter(
+    "currencyexplorer_scraper_ingest_dropped_ticks_total",
+    "Pending listener updates dropped because ingest queue is full", labels=("exchange", ))
+UPSTREAM_RATE_LIMIT_REMAINING = metrics_registry.gauge(
+    "currencyexplorer_upstream_rate_limit_remaining",
+    "Remaining upstream API request weight in exchange rate limit bucket", labels=("exchange", ))
+UPSTREAM_RATE_LIMIT_REJECTED = metrics_registry.counter(
+    "currencyexplorer_upstream_rate_limit_rejected_total",
+    "Upstream requests dropped by exchange rate limit governor", labels=("exchange", "priority", ))
+UPSTREAM_CIRCUIT_BREAKER_STATE = metrics_registry.gauge(
+    "currencyexplorer_upstream_circuit_breaker_state",
+    "Exchange upstream circuit breaker state (0 - closed, 1 - half-open, 2 - open)", labels=("exchange", ))
+UPSTREAM_CIRCUIT_BREAKER_REJECTED = metrics_registry.counter(
+    "currencyexplorer_upstream_circuit_breaker_rejected_total",
+    "Upstream requests failed fast by open circuit breaker", labels=("exchange", ))
+UPSTREAM_HEDGED_REQUESTS = metrics_registry.counter(
+    "currencyexplorer_upstream_hedged_requests_total",
+    "Second (hedged) upstream requests started after slow first request", labels=("exchange", ))
+
+# Storage
+STORAGE_OPERATION_SECONDS = metrics_registry.histogram(
+    "currencyexplorer_storage_operation_seconds",
+    "Storage backend read/write latency", labels=("operation", ))
+STORAGE_STORED_PAIRS = metrics_registry.gauge(
+    "currencyexplorer_storage_stored_pairs",
+    "Count of currency pair records in storage backend")
+STORAGE_EVICTED_PAIRS = metrics_registry.counter(
+    "currencyexplorer_storage_evicted_pairs_total",
+    "Currency pair records evicted from storage backend by stored pairs budget (least requested first)")
+STORAGE_REJECTED_PAIRS = metrics_registry.counter(
+    "currencyexplorer_storage_rejected_pairs_total",
+    "New currency pair records not stored because storage is full and pair is requested less than evicted ones")
+TICK_JOURNAL_WRITTEN_TICKS = metrics_registry.counter(
+    "currencyexplorer_tick_journal_written_ticks_total", "Ticks appended to on-disk tick journal")
+TICK_JOURNAL_DROPPED_TICKS = metrics_registry.counter(
+    "currencyexplorer_tick_journal_dropped_ticks_total",
+    "Ticks dropped by tick journal because writer queue is full")
+FEED_RECORDING_DROPPED_RECORDS = metrics_registry.counter(
+    "currencyexplorer_feed_recording_dropped_records_total",
+    "Upstream payloads not recorded to feed records log because writer queue is full")
+
+# API fan-out
+GETTER_UPDATE_ATEMPTS = metrics_registry.counter(
+    "currencyexplorer_getter_update_atempts_total",
+    "Upstream refreshes triggered on storage miss by ScraperManagerGetter",
+    labels=("exchange", "reason", ))
+WEBSOCKET_CONNECTIONS = metrics_registry.gauge(
+    "currencyexplorer_websocket_connections", "Count of open WebSocket listener connections")
+WEBSOCKET_SEND_SECONDS = metrics_registry.histogram(
+    "currencyexplorer_websocket_send_seconds", "WebSocket listener message send latency")
+
+# Admission control
+EVENT_LOOP_LAG_SECONDS = metrics_registry.gauge(
+    "currencyexplorer_event_loop_lag_seconds", "Smoothed event loop scheduling lag")
+ADMISSION_REJECTED = metrics_registry.counter(
+    "currencyexplorer_admission_rejected_total",
+    "API requests and WebSocket connections rejected by admission control", labels=("reason", ))
@@ -0,0 +1,62 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Optional, Dict, Iterator
+
+
+class RequestPhaseTimings:
+    """ Collector of phase durations for one request (phase_name -> total seconds).
+            Phases with same name are summed (for example, multiple storage reads per request)
+    """
+
+    def __init__(self) -> None:
+        self.started_at = time.perf_counter()
+        self.phases: Dict[str, float] = {}
+
+    def add(self, phase_name: str, duration: float) -> None:
+        self.phases[phase_name] = self.phases.get(phase_name, 0) + duration
+
+    @property
+    def total(self) -> float:
+        return time.perf_counter() - self.started_at
+
+    def to_server_timing_header(self) -> str:
+        """ Make `Server-Timing` header value (durations in milliseconds) """
+        items = [
+            "{};dur={:.3f}".format(phase_name, duration * 1000)
+            for phase_name, duration in self.phases.items()]
+        items.append("total;dur={:.3f}".format(self.total * 1000))
+        return ", ".join(items)
+
+
+_current_phase_timings: ContextVar[Optional[RequestPhaseTimings]] = ContextVar(
+    "currencyexplorer_phase_timings", default=None)
+
+
+def start_phase_timings() -> Token:
+    """ Start phase timings collecting for current context (should be called by request middleware) """
+    return _current_phase_timings.set(RequestPhaseTimings())
+
+
+def stop_phase_timings(token: Token) -> None:
+    _current_phase_timings.reset(token)
+
+
+def get_phase_timings() -> Optional[RequestPhaseTimings]:
+    return _current_phase_timings.get()
+
+
+@contextmanager
+def phase_span(phase_name: str) -> Iterator[None]:
+    """ Measure execution time of context block as request phase.
+            Does nothing (except one ContextVar lookup) outside of request context
+    """
+    phase_timings = _current_phase_timings.get()
+    if phase_timings is None:
+        yield
+        return
+    started_at = time.perf_counter()
+    try:
+        yield
+    finally:
+        phase_timings.add(phase_name, time.perf_counter() - started_at)
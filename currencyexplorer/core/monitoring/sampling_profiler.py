@@ -0,0 +1,70 @@
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Optional, Dict
+
+
+class SamplingProfiler:
+    """ Statistical profiler for a live thread (for example, thread with running asyncio event loop).
+            Background thread periodically takes the stack of target thread from sys._current_frames()
+                and counts identical stacks. Result can be exported in "folded stacks" format
+                    (compatible with flamegraph.pl, inferno and speedscope)
+    """
+
+    def __init__(
+            self, target_thread_id: Optional[int] = None,
+            sampling_interval: Optional[float] = 0.005) -> None:
+        self.target_thread_id = threading.get_ident() if target_thread_id is None else target_thread_id
+        self.sampling_interval = float(sampling_interval)
+        self.samples: Counter = Counter()
+        self.samples_count: int = 0
+        self.__stop_event = threading.Event()
+        self.__sampler_thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def _frame_title(frame) -> str:
+        code = frame.f_code
+        return "{} ({}:{})".format(
+            getattr(code, "co_qualname", code.co_name), os.path.basename(code.co_filename),
+            code.co_firstlineno)
+
+    def _take_sample(self) -> None:
+        frame = sys._current_frames().get(self.target_thread_id)
+        if frame is None:
+            return
+        stack = []
+        while frame is not None:
+            stack.append(self._frame_title(frame))
+            frame = frame.f_back
+        self.samples[";".join(reversed(stack))] += 1
+        self.samples_count += 1
+
+    def _sampler_loop(self) -> None:
+        while not self.__stop_event.wait(self.sampling_interval):
+            self._take_sample()
+
+    def start(self) -> None:
+        if self.__sampler_thread is not None:
+            raise RuntimeError("profiler already started")
+        self.__sampler_thread = threading.Thread(
+            target=self._sampler_loop, name="currencyexplorer-sampling-profiler", daemon=True)
+        self.__sampler_thread.start()
+
+    def stop(self) -> None:
+        self.__stop_event.set()
+        if self.__sampler_thread is not None:
+            self.__sampler_thread.join()
+
+    def to_folded_stacks(self) -> str:
+        """ Export samples as folded stacks lines: `frame1;frame2;frame3 <samples count>` """
+        return "\n".join(
+            "{} {}".format(stack, count) for stack, count in self.samples.most_common()) + "\n"
+
+    @property
+    def stats(self) -> Dict[str, float]:
+        return {
+            "samples_count": self.samples_count,
+            "uniq_stacks_count": len(self.samples),
+            "sampling_interval": self.sampling_interval}
@@ -1,59 +1,150 @@
 import traceback
 import asyncio
 from contextlib import asynccontextmanager
+from typing import Optional
 from loguru import logger 
 from fastapi import FastAPI, Request, HTTPException, status
 from app.routers import (
     root,
-    explorer
+    explorer,
+    metrics,
+    admin
 )
 from app.scrapers import EXCHANGERS_MAPPING
+from app.utils.server_timing import ServerTimingMiddleware
 from .core.exchangers_scraping import ExplorerPairInvalidFormatException
-from . import config, scrapers_manager, binance_async_client
+from .core.exchangers_scraping.feed_replay import ReplayExchangerScraper
+from .core.exchangers_scraping.ingestion_process import IngestionProcess
+from . import config, scrapers_manager, storage_snapshot_writer, tick_journal, event_loop_lag_monitor
 
 
 # Init scrapers for scrapers manager instance and setup worker flow
-scrapers_manager.append_to_scrapers(*list(EXCHANGERS_MAPPING.values()))
+if config.FEED_REPLAY_PATH is not None:
+    # Offline mode: play back recorded upstream payloads instead of live exchanges
+    scrapers_manager.append_to_scrapers(*[
+        ReplayExchangerScraper.make_for(
+            scraper_type, config.FEED_REPLAY_PATH, replay_speed=config.FEED_REPLAY_SPEED)
+        for scraper_type in EXCHANGERS_MAPPING.values()])
+else:
+    scrapers_manager.append_to_scrapers(*list(EXCHANGERS_MAPPING.values()))
+
+# Init ingestion process (listeners are executed outside of API process)
+ingestion_process = None
+if config.INGESTION_PROCESS_ENABLED is True:
+    if config.FEED_REPLAY_PATH is not None:
+        logger.warning("Ingestion process is not supported in replay mode, listeners run in API process")
+    else:
+        ingestion_process = IngestionProcess(
+            scrapers_manager, list(EXCHANGERS_MAPPING.values()),
+            batch_max_size=config.INGESTION_BATCH_MAX_SIZE, flush_interval=config.INGESTION_FLUSH_INTERVAL,
+            feed_recording_path=config.FEED_RECORDING_PATH, pair_demand_half_life=config.PAIR_DEMAND_HALF_LIFE)
+        scrapers_manager.ingestion_process = ingestion_process
+
+async def load_currency_rates_in_background() -> None:
+    """ Initial loading of all currency rates after API startup (storage is warm from snapshot) """
+    try:
+        await scrapers_manager.update_all()
+    except Exception:
+        logger.error("Scrapers manager: initial currency rates loading failed!\n{}".format(traceback.format_exc()))
+    else:
+        logger.info("Scrapers manager: currency rates loaded in background")
+
+
+async def stop_application_workers(
+        initial_load_task: Optional[asyncio.Task] = None, snapshot_writer_started: Optional[bool] = False) -> None:
+    """ Stop everything started by application lifespan (after API shutdown or failed startup) """
+    await event_loop_lag_monitor.stop()
+    if initial_load_task is not None:
+        initial_load_task.cancel()
+        await asyncio.gather(initial_load_task, return_exceptions=True)
+    logger.info("Scrapers manager: Sending stop signal to workers...")
+    await scrapers_manager.stop_active_updater(timeout=config.STOP_SCRAPER_WORKERS_TIMEOUT)
+    if ingestion_process is not None:
+        await ingestion_process.stop(timeout=config.STOP_SCRAPER_WORKERS_TIMEOUT)
+    # Final snapshot is written only if snapshot writer was started: IF snapshot loading failed
+    #   storage may be incomplete, so existing snapshot file is kept
+    if storage_snapshot_writer is not None and snapshot_writer_started:
+        await storage_snapshot_writer.stop()
+    if tick_journal is not None:
+        await tick_journal.stop(timeout=config.STOP_SCRAPER_WORKERS_TIMEOUT)
+    if scrapers_manager.feed_recorder is not None:
+        await scrapers_manager.feed_recorder.stop(timeout=config.STOP_SCRAPER_WORKERS_TIMEOUT)
+    logger.info("Scrapers manager: clear!")
+
 
 @asynccontextmanager
 async def aplication_flow_lifespan(app: FastAPI):
     """ Pre-Setup aplication method (Startup API and scraper workers together in async loop)
-            - Pre-load data before API startup
-            - Startup all scraper workers process before API startup
-            - Waiting for all worker processes to start before starting API
-            - Stop all scraper workers process after API when API shuts down
+            - Load warm-start storage snapshot (if enabled) before any upstream fetching
+            - Start tick journal writer (if TICK_JOURNAL_PATH defined)
+            - Load exchange symbol indexes (from disk cache if SYMBOL_INDEX_CACHE_DIR defined)
+            - Startup all supervised scraper workers process before API startup
+                (in separate ingestion process if INGESTION_PROCESS_ENABLED)
+            - Pre-load data before API startup (concurrently with workers startup),
+                in background after API startup if storage snapshot was loaded
+            - Waiting until all worker processes signal readiness (not longer than WAIT_SCRAPER_WORKERS_TIMEOUT)
+            - Start event loop lag monitor (API admission control)
+            - Stop all scraper workers process after API when API shuts down (or if startup failed)
     """
-    logger.info("Scrapers manager: loading currency rates...")
-    await scrapers_manager.update_all()
-    logger.info("Scrapers manager: currency rates loaded. Ready for work!")
-    logger.info("Scrapers manager: setup worker tasks...")
-    await scrapers_manager.run_active_updater()
-    logger.info("Scrapers manager: check worker status...")
-    await asyncio.sleep(config.WAIT_SCRAPER_WORKERS_TIMEOUT)
-    scraper_status_mapping = {
-        scraper:
-            scraper.currency_listener_status async for scraper in scrapers_manager.iter_scrapers(
-                ) if scraper.LISTNER_AUTO_START is True}
-    if not all(list(scraper_status_mapping.values())):
+    snapshot_writer_started = False
+    initial_load_task = None
+    try:
+        snapshot_loaded = False
+        if storage_snapshot_writer is not None:
+            logger.info("Scrapers manager: loading storage snapshot...")
+            snapshot_loaded = await storage_snapshot_writer.load_snapshot() != 0
+            storage_snapshot_writer.start()
+            snapshot_writer_started = True
+        if tick_journal is not None:
+            tick_journal.start()
+        logger.info("Scrapers manager: loading exchange symbol indexes...")
+        await scrapers_manager.load_symbol_indexes()
+        if ingestion_process is not None:
+            logger.info("Scrapers manager: starting ingestion process...")
+            ingestion_process.start(
+                wait_ready_timeout=config.WAIT_SCRAPER_WORKERS_TIMEOUT,
+                stop_timeout=config.STOP_SCRAPER_WORKERS_TIMEOUT,
+                restart_backoff_min=config.SCRAPER_LISTENER_RESTART_BACKOFF_MIN,
+                restart_backoff_max=config.SCRAPER_LISTENER_RESTART_BACKOFF_MAX)
+            logger.info("Scrapers manager: waiting for ingestion process workers...")
+            # Ingestion process loads currency rates by itself before ready signal
+            scraper_status_mapping = await ingestion_process.wait_until_ready(
+                timeout=config.INGESTION_PROCESS_START_TIMEOUT)
+        else:
+            logger.info("Scrapers manager: setup worker tasks...")
+            await scrapers_manager.run_active_updater(
+                restart_backoff_min=config.SCRAPER_LISTENER_RESTART_BACKOFF_MIN,
+                restart_backoff_max=config.SCRAPER_LISTENER_RESTART_BACKOFF_MAX)
+            if snapshot_loaded:
+                # API serves snapshot data while currency rates are loaded
+                logger.info("Scrapers manager: loading currency rates in background and waiting for workers...")
+                initial_load_task = asyncio.create_task(
+                    load_currency_rates_in_background(), name="initial-currency-rates-loading")
+                scraper_status_mapping = await scrapers_manager.wait_until_ready(
+                    timeout=config.WAIT_SCRAPER_WORKERS_TIMEOUT)
+            else:
+                logger.info("Scrapers manager: loading currency rates and waiting for workers...")
+                _, scraper_status_mapping = await asyncio.gather(
+                    scrapers_manager.update_all(),
+                    scrapers_manager.wait_until_ready(timeout=config.WAIT_SCRAPER_WORKERS_TIMEOUT))
+        logger.info("Scrapers manager: currency rates loaded. Ready for work!")
+        if not all(list(scraper_status_mapping.values())):
+            raise RuntimeError("Scrapers manager: failed to start scrapers! ({})".format(
+                ",".join(
+                        [scraper_name for scraper_name, s_status in scraper_status_mapping.items(
+                        ) if s_status is False]
+                    )))
+        logger.info("Scrapers manager: Application ready for start!")
+        event_loop_lag_monitor.start()
+    except BaseException:
+        logger.error("Scrapers manager: application startup failed, stopping workers...")
         try:
-            await scrapers_manager.stop_active_updater()
-        except Exception as e:
+            await stop_application_workers(initial_load_task, snapshot_writer_started)
+        except Exception:
             logger.error(traceback.format_exc())
-        raise RuntimeError("Scrapers manager: failed to start scrapers! ({})".format(
-            ",".join(
-                    [scraper.EXCHANGER_UNIQ_NAME for scraper, s_status in scraper_status_mapping.items(
-                    ) if s_status is False]
-                )))
-    logger.info("Scrapers manager: Application ready for start!")
+        raise
     yield
-    logger.info("Scrapers manager: Sending stop signal to workers...")
-    await scrapers_manager.stop_active_updater()
-    await asyncio.sleep(config.STOP_SCRAPER_WORKERS_TIMEOUT)
-    try:
-        loop = asyncio.get_running_loop()
-    except Exception as e:
-        loop.close()
-    logger.info("Scrapers manager: clear!")
+    await stop_application_workers(initial_load_task, snapshot_writer_started)
 
 
 # Schema info
@@ -62,6 +153,14 @@ tags_metadata = [
         "name": "Root",
         "description": "Basic API",
     },
+    {
+        "name": "Monitoring",
+        "description": "Service metrics in Prometheus text format",
+    },
+    {
+        "name": "Admin",
+        "description": "Admin only API (API_ADMIN_AUTHENTICATION_TOKEN auth). Disabled if token not configured",
+    },
 ]
 
 
@@ -136,6 +235,12 @@ app = FastAPI(
 app.include_router(root.router)
 app.include_router(explorer.router)
 app.include_router(explorer.ws_router)
+app.include_router(metrics.router)
+app.include_router(admin.router)
+
+
+# Init middlewares
+app.add_middleware(ServerTimingMiddleware)
 
 
 # Init API flow
@@ -1,5 +1,5 @@
 from abc import ABC
-from typing import Optional, ClassVar, Dict
+from typing import Optional, ClassVar, Dict, Literal
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -13,34 +13,173 @@ class BaseConfig(BaseSettings, ABC):
         CONFIG VARS:
         - DEBUG: bool - Fast-API debug mode.
         - API_AUTHENTICATION_TOKEN: str - Secret token for secure API endoint's.
-        - WAIT_SCRAPER_WORKERS_TIMEOUT: float - time in seconds how long we wait before checking
-                                                    worker status on application startup.
-        - STOP_SCRAPER_WORKERS_TIMEOUT: float - time in seconds how long we wait after send stop
-                                                    workers signal after aplication finish api process.
+        - WAIT_SCRAPER_WORKERS_TIMEOUT: float - max time in seconds how long we wait for workers readiness
+                                                    on application startup.
+        - STOP_SCRAPER_WORKERS_TIMEOUT: float - max time in seconds how long we wait for workers finish after
+                                                    send stop signal (workers are cancelled after timeout).
+        - SCRAPER_LISTENER_RESTART_BACKOFF_MIN: float - first delay in seconds before restart of crashed
+                                                    scraper listener (doubled after each failed restart).
+        - SCRAPER_LISTENER_RESTART_BACKOFF_MAX: float - max delay in seconds before restart of crashed
+                                                    scraper listener.
         - DEFAULT_WEBSOCKET_UPDATER_FREQUENCY_TIMEOUT: float  - frequency  in seconds of updating the event on
                                                                 WebSocket currency listener connection
         - MAX_WEBSOCKET_UPDATER_FREQUENCY_TIMEOUT: float - max aviable frequency in seconds for WebSocket
                                                                 currency listener
         - MIN_WEBSOCKET_UPDATER_FREQUENCY_TIMEOUT: float - min aviable frequency in seconds for WebSocket
                                                                 currency listener
+        - STORAGE_BACKEND: str - currency data storage backend: dict (CurrencyScraperAsyncSafeDictStorage) or
+                                    snapshot (CurrencyScraperSnapshotStorage, copy-on-write consistent reads).
+        - STORAGE_MAX_PAIRS: int - max count of stored currency pair records (all exchanges), least requested
+                                    pairs are evicted over this budget, new pairs requested less than evicted
+                                    ones are not stored. IF not defined storage is not limited.
+        - STORAGE_ACCESS_HALF_LIFE: float - half-life in seconds of stored pair access counts (eviction order).
         - STORED_DATA_LIFETIME_FOR_UPDATE_ATEMP: float - lifetime of data stored in the cache
                                     if the data is older than this parameter
                                         in seconds will be made automatically update atemp
         - WEBSOCKET_UPDATER_CONNECTION_TIMEOUT_LIMIT: int - max aviable lifetime for WebSocket connection in
                                     currency listener.
+        - API_ADMIN_AUTHENTICATION_TOKEN: str - Secret token for admin endpoint's (profiler).
+                                    IF not defined admin endpoint's are disabled.
+        - SLOW_REQUEST_LOG_THRESHOLD: float - requests slower than this value in seconds will be logged
+                                    with phase timings. IF not defined slow requests are not logged.
+        - MAX_PROFILER_DURATION: float - max aviable duration in seconds for sampling profiler session.
+        - FEED_RECORDING_PATH: str - path to file for recording raw upstream payloads from scrapers.
+                                    IF not defined recording is disabled.
+        - FEED_REPLAY_PATH: str - path to recorded upstream payloads file. IF defined scrapers are replaced
+                                    by replay scrapers which play back this file instead of live exchanges.
+        - FEED_REPLAY_SPEED: float - replay speed (1 - original speed, N - N times faster, 0 - max speed)
+        - STORAGE_SNAPSHOT_PATH: str - path to warm-start storage snapshot file. Snapshot is loaded on startup
+                                    and periodically written. IF not defined snapshots are disabled.
+                                    Records older than STORED_DATA_LIFETIME_FOR_UPDATE_ATEMP are not loaded,
+                                        so this lifetime should cover expected restart duration.
+        - STORAGE_SNAPSHOT_INTERVAL: float - interval in seconds between storage snapshot writes.
+        - ADAPTIVE_POLLING_ENABLED: bool - poll REST-polling scrapers (with ADAPTIVE_POLLING_REQUESTS_PER_MINUTE
+                                    budget) by demand-aware scheduler: requested pairs are polled more often.
+                                    Scrapers are polled even if LISTNER_AUTO_START is False (more upstream
+                                        requests than without polling), so it is disabled by default.
+        - ADAPTIVE_POLLING_MIN_INTERVAL: float - min interval in seconds between polls of one hot pair.
+        - PAIR_DEMAND_HALF_LIFE: float - half-life in seconds of pair demand score (requests counter).
+        - BINANCE_DEMAND_STREAMS_ENABLED: bool - subscribe to per-symbol Binance streams only for requested pairs
+                                    instead of all-market ticker stream (used as fallback).
+        - BINANCE_DEMAND_STREAM_TYPE: str - per-symbol Binance stream type (bookTicker or miniTicker).
+        - BINANCE_MAX_DEMAND_STREAMS: int - max count of per-symbol streams, all-market stream is used
+                                    if more pairs are requested.
+        - BINANCE_DEMAND_SYNC_INTERVAL: float - interval in seconds between Binance subscriptions updates.
+        - BINANCE_API_URL: str - Binance REST API base url (like https://api.binance.com/api),
+                                    IF not defined python-binance default is used. Used by load tests stand-in servers.
+        - BINANCE_STREAM_URL: str - Binance WebSocket streams base url (like wss://stream.binance.com:9443/).
+        - KRAKEN_API_URL: str - Kraken public REST API base url (like https://api.kraken.com/0/public).
+        - RATE_HISTORY_ENABLED: bool - keep bounded in-memory history of stored rates (/currency/history).
+                                    Disabled by default (NumPy ring buffers memory).
+        - RATE_HISTORY_CAPACITY: int - max count of points kept in history of one exchange pair.
+        - RATE_HISTORY_MAX_SERIES: int - max count of exchange pairs with history
+                                    (memory limit: RATE_HISTORY_MAX_SERIES * RATE_HISTORY_CAPACITY * 16 bytes).
+        - ADMISSION_CONTROL_ENABLED: bool - shed API load: reject requests and new WebSocket connections
+                                    (503) while event loop lag is higher than EVENT_LOOP_LAG_THRESHOLD,
+                                    limit concurrent requests per client (429) and WebSocket connections.
+                                    Disabled by default.
+        - EVENT_LOOP_LAG_THRESHOLD: float - max event loop lag in seconds for admission of new requests.
+        - EVENT_LOOP_LAG_CHECK_INTERVAL: float - interval in seconds between event loop lag measurements.
+        - MAX_CONCURRENT_REQUESTS_PER_CLIENT: int - max count of concurrently executed requests of one client
+                                    (client address and auth token, API token is shared by all clients).
+                                    Clients behind same proxy are limited together.
+        - MAX_WEBSOCKET_CONNECTIONS: int - max count of open WebSocket connections.
+        - CIRCUIT_BREAKER_FAILURE_THRESHOLD: int - exchange upstream circuit is opened after this count of
+                                    consecutive failed (or slower than CIRCUIT_BREAKER_LATENCY_SLO) requests,
+                                    requests fail fast to stored data (like 5).
+                                    IF not defined (default) circuit breakers are disabled.
+        - CIRCUIT_BREAKER_LATENCY_SLO: float - upstream response slower than this value in seconds is failure.
+        - CIRCUIT_BREAKER_OPEN_DURATION: float - time in seconds before probe request to open circuit exchange.
+        - USER_REFRESH_DEADLINE: float - max time in seconds of user-triggered upstream refresh (stored data
+                                    is used after deadline, like 3). Used only if circuit breakers are enabled.
+                                    IF not defined refresh is not limited.
+        - HEDGE_USER_REFRESHES: bool - start second upstream request if user-triggered refresh is slower than
+                                    p95 latency of recent requests (first response wins).
+                                    Disabled by default (extra upstream request weight).
+        - INGEST_QUEUE_MAX_PAIRS: int - max count of pending pairs in queue between scraper listener and storage
+                                    (only latest update of each pair is kept, oldest one is dropped if full).
+        - TOP_MOVERS_ENABLED: bool - keep incremental leaderboard of pairs with biggest rate change
+                                    over 1m/5m/1h windows (/currency/top_movers). Disabled by default.
+        - TICK_JOURNAL_PATH: str - directory of append-only on-disk journal of stored ticks (history beyond RAM).
+                                    IF not defined journal is disabled.
+        - TICK_JOURNAL_SEGMENT_MAX_BYTES: int - tick journal segment file is closed after this size in bytes.
+        - TICK_JOURNAL_SEGMENT_MAX_AGE: float - tick journal segment file is closed after this time in seconds.
+        - TICK_JOURNAL_RETENTION: float - closed tick journal segments older than this value in seconds
+                                    are deleted. IF not defined segments are kept forever.
+        - INGESTION_PROCESS_ENABLED: bool - run scraper listeners in separate ingestion process, parsed data
+                                    is passed to API process by batches (API event loop is free of parse work).
+        - INGESTION_BATCH_MAX_SIZE: int - max count of records in one batch from ingestion process.
+        - INGESTION_FLUSH_INTERVAL: float - max delay in seconds before batch is sent from ingestion process.
+        - UPSTREAM_FETCH_BATCH_WINDOW: float - single pair refreshes of same exchange requested within this
+                                    window in seconds are fetched by one upstream request (like 0.005).
+                                    IF not defined (default) each refresh is separate request.
+        - SYMBOL_INDEX_CACHE_DIR: str - directory for exchange symbol indexes cache (instruments lists).
+                                    IF not defined indexes are loaded from exchanges on each startup.
+        - SYMBOL_INDEX_CACHE_LIFETIME: float - max age in seconds of cached symbol index.
+        - INGESTION_PROCESS_START_TIMEOUT: float - max time in seconds how long we wait for ingestion process
+                                    readiness (process startup and WAIT_SCRAPER_WORKERS_TIMEOUT included).
     """
     CONFIG_ENVIRONMENT: ClassVar[str]
     model_config = SettingsConfigDict(
         env_file='.env', env_file_encoding='utf-8', extra='ignore')
     DEBUG: Optional[bool] = False
     API_AUTHENTICATION_TOKEN: str
-    WAIT_SCRAPER_WORKERS_TIMEOUT: Optional[float] = 2 # seconds
-    STOP_SCRAPER_WORKERS_TIMEOUT: Optional[float] = 2 # seconds
+    WAIT_SCRAPER_WORKERS_TIMEOUT: Optional[float] = 10 # seconds
+    STOP_SCRAPER_WORKERS_TIMEOUT: Optional[float] = 5 # seconds
+    SCRAPER_LISTENER_RESTART_BACKOFF_MIN: Optional[float] = 1 # seconds
+    SCRAPER_LISTENER_RESTART_BACKOFF_MAX: Optional[float] = 60 # seconds
     DEFAULT_WEBSOCKET_UPDATER_FREQUENCY_TIMEOUT: Optional[float] = 1
     MAX_WEBSOCKET_UPDATER_FREQUENCY_TIMEOUT: Optional[float] = 60
     MIN_WEBSOCKET_UPDATER_FREQUENCY_TIMEOUT: Optional[float] = 0.1
+    STORAGE_BACKEND: Optional[Literal["dict", "snapshot"]] = "dict"
+    STORAGE_MAX_PAIRS: Optional[int] = None
+    STORAGE_ACCESS_HALF_LIFE: Optional[float] = 300 # seconds
     STORED_DATA_LIFETIME_FOR_UPDATE_ATEMP: Optional[float] = 10
     WEBSOCKET_UPDATER_CONNECTION_TIMEOUT_LIMIT: Optional[int] = 3000 # 50min
+    API_ADMIN_AUTHENTICATION_TOKEN: Optional[str] = None
+    SLOW_REQUEST_LOG_THRESHOLD: Optional[float] = None # seconds
+    MAX_PROFILER_DURATION: Optional[float] = 60 # seconds
+    FEED_RECORDING_PATH: Optional[str] = None
+    FEED_REPLAY_PATH: Optional[str] = None
+    FEED_REPLAY_SPEED: Optional[float] = 1
+    STORAGE_SNAPSHOT_PATH: Optional[str] = None
+    STORAGE_SNAPSHOT_INTERVAL: Optional[float] = 5 # seconds
+    ADAPTIVE_POLLING_ENABLED: Optional[bool] = False
+    ADAPTIVE_POLLING_MIN_INTERVAL: Optional[float] = 2 # seconds
+    PAIR_DEMAND_HALF_LIFE: Optional[float] = 300 # seconds
+    BINANCE_DEMAND_STREAMS_ENABLED: Optional[bool] = False
+    BINANCE_DEMAND_STREAM_TYPE: Optional[Literal["bookTicker", "miniTicker"]] = "bookTicker"
+    BINANCE_MAX_DEMAND_STREAMS: Optional[int] = 200
+    BINANCE_DEMAND_SYNC_INTERVAL: Optional[float] = 5 # seconds
+    BINANCE_API_URL: Optional[str] = None
+    BINANCE_STREAM_URL: Optional[str] = None
+    KRAKEN_API_URL: Optional[str] = None
+    UPSTREAM_FETCH_BATCH_WINDOW: Optional[float] = None # seconds
+    SYMBOL_INDEX_CACHE_DIR: Optional[str] = None
+    SYMBOL_INDEX_CACHE_LIFETIME: Optional[float] = 86400 # seconds
+    RATE_HISTORY_ENABLED: Optional[bool] = False
+    RATE_HISTORY_CAPACITY: Optional[int] = 1024
+    RATE_HISTORY_MAX_SERIES: Optional[int] = 4096
+    ADMISSION_CONTROL_ENABLED: Optional[bool] = False
+    EVENT_LOOP_LAG_THRESHOLD: Optional[float] = 0.25 # seconds
+    EVENT_LOOP_LAG_CHECK_INTERVAL: Optional[float] = 0.05 # seconds
+    MAX_CONCURRENT_REQUESTS_PER_CLIENT: Optional[int] = 256
+    MAX_WEBSOCKET_CONNECTIONS: Optional[int] = 5000
+    CIRCUIT_BREAKER_FAILURE_THRESHOLD: Optional[int] = None
+    CIRCUIT_BREAKER_LATENCY_SLO: Optional[float] = 5 # seconds
+    CIRCUIT_BREAKER_OPEN_DURATION: Optional[float] = 10 # seconds
+    USER_REFRESH_DEADLINE: Optional[float] = None # seconds
+    HEDGE_USER_REFRESHES: Optional[bool] = False
+    INGEST_QUEUE_MAX_PAIRS: Optional[int] = 100000
+    TOP_MOVERS_ENABLED: Optional[bool] = False
+    TICK_JOURNAL_PATH: Optional[str] = None
+    TICK_JOURNAL_SEGMENT_MAX_BYTES: Optional[int] = 64 * 1024 * 1024
+    TICK_JOURNAL_SEGMENT_MAX_AGE: Optional[float] = 3600 # seconds
+    TICK_JOURNAL_RETENTION: Optional[float] = 7 * 86400 # seconds
+    INGESTION_PROCESS_ENABLED: Optional[bool] = False
+    INGESTION_BATCH_MAX_SIZE: Optional[int] = 5000
+    INGESTION_FLUSH_INTERVAL: Optional[float] = 0.05 # seconds
+    INGESTION_PROCESS_START_TIMEOUT: Optional[float] = 30 # seconds
 
     @classmethod
     def get_environment_name(CLS):
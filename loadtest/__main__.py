@@ -0,0 +1,202 @@
+import os
+os.environ.setdefault("API_AUTHENTICATION_TOKEN", "loadtest")
+
+import asyncio
+import json
+import platform
+import resource
+import socket
+import subprocess
+import sys
+import time
+import aiohttp
+import click
+from typing import Dict, Any, List
+
+
+@click.group()
+def cli():
+    """ Offline load tests of full stack (API process with scrapers connected to local stand-in exchanges) """
+
+
+def _git_revision() -> str | None:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL).decode().strip()
+    except Exception:
+        return None
+
+
+def _raise_open_files_limit() -> None:
+    """ Thousands of WebSocket clients need more file descriptors than default soft limit """
+    soft_limit, hard_limit = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft_limit != hard_limit:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard_limit, hard_limit))
+
+
+def _free_port(host: str) -> int:
+    with socket.socket() as s:
+        s.bind((host, 0))
+        return s.getsockname()[1]
+
+
+async def _wait_api_ready(api_url: str, api_token: str, process: asyncio.subprocess.Process, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    async with aiohttp.ClientSession(headers={"Authorization": "Bearer {}".format(api_token)}) as session:
+        while time.monotonic() < deadline:
+            if process.returncode is not None:
+                raise click.ClickException("API process exited with code {}".format(process.returncode))
+            try:
+                async with session.get("{}/aviable_exchanges".format(api_url)) as response:
+                    if response.status == 200:
+                        return
+            except aiohttp.ClientError:
+                pass
+            await asyncio.sleep(0.2)
+    raise click.ClickException("API is not ready after {} seconds".format(timeout))
+
+
+async def run_load_test(
+        binance_symbols: int, kraken_symbols: int, tick_rate: float, ticks_per_frame: int,
+        rps: float, max_in_flight: int, all_pairs_ratio: float,
+        ws_clients: int, ws_frequency_timeout: float, ws_connect_rate: float,
+        duration: float, warmup: float, host: str, api_env: Dict[str, str],
+        api_log: str | None, ready_timeout: float) -> Dict[str, Any]:
+    from .stand_in_exchanges import BinanceStandInExchange, KrakenStandInExchange
+    from .driver import HttpLoadDriver, WebSocketClientsDriver, ProcessMemorySampler
+
+    binance = BinanceStandInExchange(
+        binance_symbols, tick_rate=tick_rate, ticks_per_frame=ticks_per_frame, host=host)
+    kraken = KrakenStandInExchange(
+        kraken_symbols, tick_rate=tick_rate, ticks_per_frame=ticks_per_frame, host=host)
+    await binance.start()
+    await kraken.start()
+
+    api_token = os.environ["API_AUTHENTICATION_TOKEN"]
+    api_url = "http://{}:{}".format(host, _free_port(host))
+    env = dict(os.environ)
+    env.update({
+        "API_AUTHENTICATION_TOKEN": api_token,
+        "BINANCE_API_URL": binance.api_url,
+        "BINANCE_STREAM_URL": binance.stream_url,
+        "KRAKEN_API_URL": kraken.api_url})
+    env.update(api_env)
+    log_file = open(api_log, "ab") if api_log is not None else subprocess.DEVNULL
+    process = await asyncio.create_subprocess_exec(
+        sys.executable, "-m", "uvicorn", "currencyexplorer.main:app",
+        "--host", host, "--port", api_url.rsplit(":", 1)[1], "--log-level", "warning",
+        env=env, stdout=log_file, stderr=log_file)
+    memory_sampler = ProcessMemorySampler(process.pid)
+    try:
+        started_at = time.monotonic()
+        await _wait_api_ready(api_url, api_token, process, ready_timeout)
+        startup_seconds = time.monotonic() - started_at
+        memory_sampler.start()
+        await asyncio.sleep(warmup)
+
+        # Clients request pairs of both exchanges (most of them are listed by both)
+        pair_titles: List[str] = sorted(set(binance.pair_titles) | set(kraken.pair_titles))
+        http_driver = HttpLoadDriver(
+            api_url, api_token, pair_titles, rps, max_in_flight=max_in_flight, all_pairs_ratio=all_pairs_ratio)
+        ws_driver = WebSocketClientsDriver(
+            api_url, api_token, pair_titles, ws_clients,
+            frequency_timeout=ws_frequency_timeout, connect_rate=ws_connect_rate)
+        upstream_before = {"binance": binance.stats(), "kraken": kraken.stats()}
+        await asyncio.gather(http_driver.run(duration), ws_driver.run(duration))
+        upstream_after = {"binance": binance.stats(), "kraken": kraken.stats()}
+    finally:
+        await memory_sampler.stop()
+        if process.returncode is None:
+            process.terminate()
+            await process.wait()
+        await binance.stop()
+        await kraken.stop()
+        if api_log is not None:
+            log_file.close()
+
+    upstream = {}
+    for exchange, stats in upstream_after.items():
+        upstream[exchange] = dict(stats)
+        for counter in ("frames_sent", "ticks_sent", "requests"):
+            upstream[exchange]["{}_per_second".format(counter)] = (
+                stats[counter] - upstream_before[exchange][counter]) / duration
+    return {
+        "startup_seconds": startup_seconds,
+        "http": http_driver.summary(),
+        "websocket": ws_driver.summary(),
+        "upstream": upstream,
+        "memory": memory_sampler.summary()}
+
+
+@cli.command("run")
+@click.option("--binance-symbols", type=int, default=2000, show_default=True,
+              help="Count of markets of Binance-like stand-in server")
+@click.option("--kraken-symbols", type=int, default=500, show_default=True,
+              help="Count of markets of Kraken-like stand-in server")
+@click.option("--tick-rate", type=float, default=1, show_default=True,
+              help="Price updates (stream frames) per second of each stand-in exchange")
+@click.option("--ticks-per-frame", type=int, default=500, show_default=True,
+              help="Count of markets with changed price in each update")
+@click.option("--rps", type=float, default=200, show_default=True, help="/currency requests per second")
+@click.option("--max-in-flight", type=int, default=1000, show_default=True,
+              help="Max concurrent /currency requests (over limit requests are skipped)")
+@click.option("--all-pairs-ratio", type=float, default=0, show_default=True,
+              help="Part of /currency requests without pair filter (all pairs of all exchanges)")
+@click.option("--ws-clients", type=int, default=1000, show_default=True,
+              help="Count of concurrent /currency_listener clients")
+@click.option("--ws-frequency-timeout", type=float, default=1, show_default=True,
+              help="frequency_timeout param of /currency_listener clients")
+@click.option("--ws-connect-rate", type=float, default=500, show_default=True,
+              help="New /currency_listener connections per second")
+@click.option("--duration", type=float, default=30, show_default=True, help="Load duration in seconds")
+@click.option("--warmup", type=float, default=5, show_default=True,
+              help="Delay in seconds between API readiness and load start")
+@click.option("--host", default="127.0.0.1", show_default=True)
+@click.option("--env", "api_env", multiple=True,
+              help="KEY=VALUE environment variable (setting) of API process (can be passed multiple times)")
+@click.option("--api-log", type=click.Path(dir_okay=False), default=None,
+              help="Write API process output to file (discarded by default)")
+@click.option("--ready-timeout", type=float, default=60, show_default=True,
+              help="Max time in seconds of API process startup")
+@click.option("--output", type=click.Path(dir_okay=False), default=None,
+              help="Write JSON results to file (stdout by default)")
+def run_command(
+        binance_symbols, kraken_symbols, tick_rate, ticks_per_frame, rps, max_in_flight, all_pairs_ratio,
+        ws_clients, ws_frequency_timeout, ws_connect_rate, duration, warmup, host, api_env, api_log,
+        ready_timeout, output):
+    """ Start stand-in exchanges and API process, run load and print machine-readable JSON report """
+    api_env_mapping = {}
+    for item in api_env:
+        key, separator, value = item.partition("=")
+        if separator == "":
+            raise click.BadParameter("{} should be in KEY=VALUE format".format(item))
+        api_env_mapping[key] = value
+    _raise_open_files_limit()
+    config = dict(
+        binance_symbols=binance_symbols, kraken_symbols=kraken_symbols, tick_rate=tick_rate,
+        ticks_per_frame=ticks_per_frame, rps=rps, max_in_flight=max_in_flight, all_pairs_ratio=all_pairs_ratio,
+        ws_clients=ws_clients, ws_frequency_timeout=ws_frequency_timeout, ws_connect_rate=ws_connect_rate,
+        duration=duration, warmup=warmup)
+    results = asyncio.run(run_load_test(
+        host=host, api_env=api_env_mapping, api_log=api_log, ready_timeout=ready_timeout, **config))
+    report = {
+        "meta": {
+            "git_revision": _git_revision(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "timestamp": time.time(),
+        },
+        "config": dict(config, api_env=api_env_mapping),
+        "results": results,
+    }
+    report_json = json.dumps(report, indent=2)
+    if output is None:
+        click.echo(report_json)
+    else:
+        with open(output, "w") as f:
+            f.write(report_json)
+
+
+if __name__ == "__main__":
+    cli()
@@ -0,0 +1,223 @@
+import asyncio
+import json
+import random
+import time
+import aiohttp
+from array import array
+from typing import Optional, List, Dict, Any
+
+
+def summarize_timings(timings: "array[float]") -> Dict[str, Optional[float]]:
+    """ p50/p99/max of timings in seconds (as milliseconds) """
+    if len(timings) == 0:
+        return {"p50_ms": None, "p99_ms": None, "max_ms": None}
+    ordered = sorted(timings)
+
+    def percentile(quantile: float) -> float:
+        return ordered[min(int(len(ordered) * quantile), len(ordered) - 1)] * 1000
+
+    return {"p50_ms": percentile(0.5), "p99_ms": percentile(0.99), "max_ms": ordered[-1] * 1000}
+
+
+class ProcessMemorySampler:
+    """ Sample resident memory (VmRSS from /proc, Linux only) of process every `interval` seconds """
+
+    def __init__(self, pid: int, interval: Optional[float] = 0.5) -> None:
+        self.pid = int(pid)
+        self.interval = float(interval)
+        self.samples: List[int] = []
+        self._sampler_task: Optional[asyncio.Task] = None
+
+    def read_rss(self) -> Optional[int]:
+        try:
+            with open("/proc/{}/status".format(self.pid)) as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        return int(line.split()[1]) * 1024
+        except OSError:
+            return None
+
+    async def _sampler_process(self) -> None:
+        while True:
+            rss = self.read_rss()
+            if rss is not None:
+                self.samples.append(rss)
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        self._sampler_task = asyncio.create_task(self._sampler_process())
+
+    async def stop(self) -> None:
+        if self._sampler_task is not None:
+            self._sampler_task.cancel()
+            await asyncio.gather(self._sampler_task, return_exceptions=True)
+
+    def summary(self) -> Dict[str, Optional[float]]:
+        if len(self.samples) == 0:
+            return {"rss_start_mb": None, "rss_peak_mb": None, "rss_end_mb": None}
+        return {
+            "rss_start_mb": self.samples[0] / 1024 ** 2,
+            "rss_peak_mb": max(self.samples) / 1024 ** 2,
+            "rss_end_mb": self.samples[-1] / 1024 ** 2}
+
+
+class HttpLoadDriver:
+    """ Open-loop `/currency` load: requests are started at fixed rate (`rps`) regardless of responses.
+            Latency is measured from scheduled start time, so queueing of late requests is included.
+                Requests over `max_in_flight` are not sent and counted as skipped.
+    """
+
+    def __init__(
+            self, api_url: str, api_token: str, pair_titles: List[str], rps: float,
+            max_in_flight: Optional[int] = 1000, all_pairs_ratio: Optional[float] = 0, seed: Optional[int] = 7) -> None:
+        self.api_url = str(api_url).rstrip("/")
+        self.headers = {"Authorization": "Bearer {}".format(api_token)}
+        self.pair_titles = list(pair_titles)
+        self.rps = float(rps)
+        self.max_in_flight = int(max_in_flight)
+        self.all_pairs_ratio = float(all_pairs_ratio)
+        self._rnd = random.Random(seed)
+        self.latencies = array("d")
+        self.status_counts: Dict[str, int] = {}
+        self.skipped = 0
+        self._in_flight = 0
+        self._elapsed = 0.0
+
+    async def _request(self, session: aiohttp.ClientSession, scheduled_at: float) -> None:
+        params = {} if self._rnd.random() < self.all_pairs_ratio else {"pair": self._rnd.choice(self.pair_titles)}
+        try:
+            async with session.get("{}/currency".format(self.api_url), params=params) as response:
+                await response.read()
+                status = str(response.status)
+        except Exception as e:
+            status = type(e).__name__
+        finally:
+            self._in_flight -= 1
+        self.status_counts[status] = self.status_counts.get(status, 0) + 1
+        if status == "200":
+            self.latencies.append(time.monotonic() - scheduled_at)
+
+    async def run(self, duration: float) -> None:
+        if self.rps <= 0:
+            return
+        interval = 1 / self.rps
+        connector = aiohttp.TCPConnector(limit=self.max_in_flight)
+        async with aiohttp.ClientSession(headers=self.headers, connector=connector) as session:
+            requests = set()
+            started_at = time.monotonic()
+            request_index = 0
+            while True:
+                scheduled_at = started_at + request_index * interval
+                if scheduled_at - started_at >= duration:
+                    break
+                await asyncio.sleep(max(scheduled_at - time.monotonic(), 0))
+                request_index += 1
+                if self._in_flight >= self.max_in_flight:
+                    self.skipped += 1
+                    continue
+                self._in_flight += 1
+                request = asyncio.create_task(self._request(session, scheduled_at))
+                requests.add(request)
+                request.add_done_callback(requests.discard)
+            await asyncio.gather(*requests, return_exceptions=True)
+            self._elapsed = time.monotonic() - started_at
+
+    def summary(self) -> Dict[str, Any]:
+        ok_count = self.status_counts.get("200", 0)
+        return {
+            "target_rps": self.rps,
+            "requests": sum(self.status_counts.values()),
+            "skipped": self.skipped,
+            "statuses": self.status_counts,
+            "throughput_rps": ok_count / self._elapsed if self._elapsed else None,
+            "latency": summarize_timings(self.latencies)}
+
+
+class WebSocketClientsDriver:
+    """ `clients` concurrent `/currency_listener` clients (one random pair each).
+            Connections are opened with `connect_rate` per second.
+                Delivery lag: receive time - newest `last_update_timestamp` of message with new tick
+                    (time since scraper parsed tick, includes listener `frequency_timeout` period).
+    """
+
+    def __init__(
+            self, api_url: str, api_token: str, pair_titles: List[str], clients: int,
+            frequency_timeout: Optional[float] = 1, connect_rate: Optional[float] = 500,
+            seed: Optional[int] = 11) -> None:
+        self.ws_url = str(api_url).rstrip("/").replace("http", "ws", 1)
+        self.headers = {"Authorization": "Bearer {}".format(api_token)}
+        self.pair_titles = list(pair_titles)
+        self.clients = int(clients)
+        self.frequency_timeout = float(frequency_timeout)
+        self.connect_rate = float(connect_rate)
+        self._rnd = random.Random(seed)
+        self.delivery_lags = array("d")
+        self.connect_timings = array("d")
+        self.connect_errors: Dict[str, int] = {}
+        self.messages = 0
+        self.closed_by_server = 0
+        self._elapsed = 0.0
+
+    async def _client(self, session: aiohttp.ClientSession, stop_event: asyncio.Event) -> None:
+        params = {"pair": self._rnd.choice(self.pair_titles), "frequency_timeout": self.frequency_timeout}
+        connect_started_at = time.monotonic()
+        try:
+            ws = await session.ws_connect("{}/currency_listener".format(self.ws_url), params=params)
+        except Exception as e:
+            error = getattr(e, "status", None) or type(e).__name__
+            self.connect_errors[str(error)] = self.connect_errors.get(str(error), 0) + 1
+            return
+        self.connect_timings.append(time.monotonic() - connect_started_at)
+        stop_task = asyncio.create_task(stop_event.wait())
+        delivered_last_update = 0.0
+        try:
+            while not stop_event.is_set():
+                receive_task = asyncio.create_task(ws.receive())
+                await asyncio.wait((receive_task, stop_task), return_when=asyncio.FIRST_COMPLETED)
+                if not receive_task.done():
+                    receive_task.cancel()
+                    break
+                message = receive_task.result()
+                if message.type != aiohttp.WSMsgType.TEXT:
+                    self.closed_by_server += 1
+                    break
+                received_at = time.time()
+                self.messages += 1
+                last_updates = [
+                    exchange["last_update_timestamp"]
+                    for pair in json.loads(message.data).get("result") or []
+                    for exchange in pair["exchanges"] if exchange.get("last_update_timestamp") is not None]
+                # Repeated messages without new ticks are not delivery of data
+                if len(last_updates) != 0 and max(last_updates) > delivered_last_update:
+                    delivered_last_update = max(last_updates)
+                    self.delivery_lags.append(received_at - delivered_last_update)
+        finally:
+            stop_task.cancel()
+            await ws.close()
+
+    async def run(self, duration: float) -> None:
+        if self.clients <= 0:
+            return
+        stop_event = asyncio.Event()
+        connector = aiohttp.TCPConnector(limit=0)
+        async with aiohttp.ClientSession(headers=self.headers, connector=connector) as session:
+            started_at = time.monotonic()
+            clients = []
+            for client_index in range(self.clients):
+                await asyncio.sleep(max(started_at + client_index / self.connect_rate - time.monotonic(), 0))
+                clients.append(asyncio.create_task(self._client(session, stop_event)))
+            await asyncio.sleep(max(started_at + duration - time.monotonic(), 0))
+            stop_event.set()
+            await asyncio.gather(*clients, return_exceptions=True)
+            self._elapsed = time.monotonic() - started_at
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "clients": self.clients,
+            "connected": len(self.connect_timings),
+            "connect_errors": self.connect_errors,
+            "closed_by_server": self.closed_by_server,
+            "messages": self.messages,
+            "messages_per_second": self.messages / self._elapsed if self._elapsed else None,
+            "connect_latency": summarize_timings(self.connect_timings),
+            "delivery_lag": summarize_timings(self.delivery_lags)}
@@ -0,0 +1,239 @@
+import asyncio
+import json
+import random
+import time
+from aiohttp import web, WSMsgType
+from typing import Optional, List, Dict, Set, Tuple
+from benchmarks.synthetic import make_pair_titles
+
+
+class StandInExchange:
+    """ Local stand-in exchange server (aiohttp) with synthetic markets.
+            Prices of `ticks_per_frame` random markets are changed `tick_rate` times per second
+                (each change is sent to stream subscribers as one frame by exchanges with streams).
+    """
+
+    def __init__(
+            self, symbols_count: int, tick_rate: Optional[float] = 1, ticks_per_frame: Optional[int] = 100,
+            host: Optional[str] = "127.0.0.1", port: Optional[int] = 0, seed: Optional[int] = 42) -> None:
+        self.tick_rate = float(tick_rate)
+        self.ticks_per_frame = int(ticks_per_frame)
+        self.host = str(host)
+        self.port = int(port)
+        self._rnd = random.Random(seed)
+        # [(native_symbol, base_asset, quote_asset)] and current price of each market
+        self.markets: List[Tuple[str, str, str]] = [
+            (pair_title.replace("_", ""), *pair_title.split("_")) for pair_title in make_pair_titles(symbols_count)]
+        self.prices: Dict[str, float] = {
+            native_symbol: self._rnd.uniform(0.0001, 50000) for native_symbol, _, _ in self.markets}
+        self.frames_sent = 0
+        self.ticks_sent = 0
+        self.requests_count = 0
+        self._runner: Optional[web.AppRunner] = None
+        self._ticker_task: Optional[asyncio.Task] = None
+
+    @property
+    def pair_titles(self) -> List[str]:
+        return ["{}_{}".format(base_asset, quote_asset) for _, base_asset, quote_asset in self.markets]
+
+    def make_app(self) -> web.Application:
+        raise NotImplementedError
+
+    def tick(self) -> List[str]:
+        """ Move prices of random markets, return changed native symbols """
+        changed_symbols = self._rnd.sample(
+            list(self.prices), k=min(self.ticks_per_frame, len(self.prices)))
+        for native_symbol in changed_symbols:
+            self.prices[native_symbol] *= 1 + self._rnd.uniform(-0.001, 0.001)
+        return changed_symbols
+
+    async def handle_tick(self, changed_symbols: List[str]) -> None:
+        """ Send changed prices to stream subscribers (exchanges without streams only change prices) """
+
+    async def _ticker_process(self) -> None:
+        interval = 1 / self.tick_rate
+        next_tick_at = time.monotonic()
+        while True:
+            await self.handle_tick(self.tick())
+            next_tick_at += interval
+            await asyncio.sleep(max(next_tick_at - time.monotonic(), 0))
+
+    async def start(self) -> None:
+        self._runner = web.AppRunner(self.make_app(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        # Real port if random free port (0) requested
+        self.port = site._server.sockets[0].getsockname()[1]
+        if self.tick_rate > 0:
+            self._ticker_task = asyncio.create_task(self._ticker_process())
+
+    async def stop(self) -> None:
+        if self._ticker_task is not None:
+            self._ticker_task.cancel()
+            await asyncio.gather(self._ticker_task, return_exceptions=True)
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "markets": len(self.markets), "frames_sent": self.frames_sent,
+            "ticks_sent": self.ticks_sent, "requests": self.requests_count}
+
+
+class BinanceStandInExchange(StandInExchange):
+    """ Binance-like server: REST exchangeInfo/ticker, all-market `!ticker@arr` stream
+            and combined per-symbol streams (`/stream` with SUBSCRIBE/UNSUBSCRIBE)
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._all_market_sockets: Set[web.WebSocketResponse] = set()
+        # {combined stream socket: {stream name}}
+        self._combined_stream_sockets: Dict[web.WebSocketResponse, Set[str]] = {}
+
+    @property
+    def api_url(self) -> str:
+        return "http://{}:{}/api".format(self.host, self.port)
+
+    @property
+    def stream_url(self) -> str:
+        return "ws://{}:{}/".format(self.host, self.port)
+
+    def make_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get("/api/v3/ping", self._ping)
+        app.router.add_get("/api/v3/exchangeInfo", self._exchange_info)
+        app.router.add_get("/api/v3/ticker/24hr", self._ticker)
+        app.router.add_get("/ws/!ticker@arr", self._all_market_stream)
+        app.router.add_get("/stream", self._combined_stream)
+        return app
+
+    def _ticker_item(self, native_symbol: str) -> Dict[str, str]:
+        price = self.prices[native_symbol]
+        return {
+            "symbol": native_symbol, "lastPrice": "{:.8f}".format(price),
+            "bidPrice": "{:.8f}".format(price * 0.9995), "askPrice": "{:.8f}".format(price * 1.0005)}
+
+    async def _ping(self, request: web.Request) -> web.Response:
+        return web.json_response({})
+
+    async def _exchange_info(self, request: web.Request) -> web.Response:
+        self.requests_count += 1
+        return web.json_response({"symbols": [
+            {"symbol": native_symbol, "status": "TRADING", "baseAsset": base_asset, "quoteAsset": quote_asset}
+            for native_symbol, base_asset, quote_asset in self.markets]})
+
+    async def _ticker(self, request: web.Request) -> web.Response:
+        self.requests_count += 1
+        if "symbol" in request.query:
+            native_symbol = request.query["symbol"]
+            if native_symbol not in self.prices:
+                return web.json_response({"code": -1121, "msg": "Invalid symbol."}, status=400)
+            return web.json_response(self._ticker_item(native_symbol))
+        if "symbols" in request.query:
+            native_symbols = json.loads(request.query["symbols"])
+            # Same as Binance: whole request is rejected if any symbol is unknown
+            if any(native_symbol not in self.prices for native_symbol in native_symbols):
+                return web.json_response({"code": -1121, "msg": "Invalid symbol."}, status=400)
+        else:
+            native_symbols = list(self.prices)
+        return web.json_response([self._ticker_item(native_symbol) for native_symbol in native_symbols])
+
+    async def _all_market_stream(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self._all_market_sockets.add(ws)
+        try:
+            async for _ in ws:
+                pass
+        finally:
+            self._all_market_sockets.discard(ws)
+        return ws
+
+    async def _combined_stream(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        streams = self._combined_stream_sockets[ws] = set()
+        try:
+            async for message in ws:
+                if message.type != WSMsgType.TEXT:
+                    continue
+                command = json.loads(message.data)
+                if command.get("method") == "SUBSCRIBE":
+                    streams.update(command.get("params", []))
+                elif command.get("method") == "UNSUBSCRIBE":
+                    streams.difference_update(command.get("params", []))
+                await ws.send_str(json.dumps({"result": None, "id": command.get("id")}))
+        finally:
+            self._combined_stream_sockets.pop(ws, None)
+        return ws
+
+    async def handle_tick(self, changed_symbols: List[str]) -> None:
+        event_time = int(time.time() * 1000)
+        sends = []
+        if len(self._all_market_sockets) != 0:
+            frame = json.dumps([{
+                "e": "24hrTicker", "E": event_time, "s": native_symbol,
+                "x": "{:.8f}".format(self.prices[native_symbol]), "c": "{:.8f}".format(self.prices[native_symbol]),
+                "b": "{:.8f}".format(self.prices[native_symbol] * 0.9995),
+                "a": "{:.8f}".format(self.prices[native_symbol] * 1.0005)}
+                for native_symbol in changed_symbols])
+            for ws in list(self._all_market_sockets):
+                sends.append(ws.send_str(frame))
+                self.frames_sent += 1
+                self.ticks_sent += len(changed_symbols)
+        for ws, streams in list(self._combined_stream_sockets.items()):
+            for native_symbol in changed_symbols:
+                price = self.prices[native_symbol]
+                for stream_type, data in (
+                        ("bookTicker", {
+                            "s": native_symbol, "b": "{:.8f}".format(price * 0.9995),
+                            "a": "{:.8f}".format(price * 1.0005)}),
+                        ("miniTicker", {"e": "24hrMiniTicker", "E": event_time, "s": native_symbol,
+                                        "c": "{:.8f}".format(price)})):
+                    stream = "{}@{}".format(native_symbol.lower(), stream_type)
+                    if stream in streams:
+                        sends.append(ws.send_str(json.dumps({"stream": stream, "data": data})))
+                        self.frames_sent += 1
+                        self.ticks_sent += 1
+        # Closed subscriber sockets are removed by their handlers
+        await asyncio.gather(*sends, return_exceptions=True)
+
+
+class KrakenStandInExchange(StandInExchange):
+    """ Kraken-like server: public REST AssetPairs and Ticker (Kraken scraper is REST-polling only) """
+
+    @property
+    def api_url(self) -> str:
+        return "http://{}:{}/0/public".format(self.host, self.port)
+
+    def make_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get("/0/public/AssetPairs", self._asset_pairs)
+        app.router.add_get("/0/public/Ticker", self._ticker)
+        return app
+
+    async def _asset_pairs(self, request: web.Request) -> web.Response:
+        self.requests_count += 1
+        return web.json_response({"error": [], "result": {
+            native_symbol: {"altname": native_symbol, "wsname": "{}/{}".format(base_asset, quote_asset)}
+            for native_symbol, base_asset, quote_asset in self.markets}})
+
+    async def _ticker(self, request: web.Request) -> web.Response:
+        self.requests_count += 1
+        if "pair" in request.query:
+            native_symbols = [s for s in request.query["pair"].split(",") if s in self.prices]
+            if len(native_symbols) == 0:
+                return web.json_response({"error": ["EQuery:Unknown asset pair"]})
+        else:
+            native_symbols = list(self.prices)
+        result = {}
+        for native_symbol in native_symbols:
+            price = self.prices[native_symbol]
+            result[native_symbol] = {
+                "a": ["{:.8f}".format(price * 1.0005), "1", "1.000"],
+                "b": ["{:.8f}".format(price * 0.9995), "1", "1.000"],
+                "c": ["{:.8f}".format(price), "0.1"]}
+            self.ticks_sent += 1
+        return web.json_response({"error": [], "result": result})
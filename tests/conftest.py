@@ -0,0 +1,4 @@
+import os
+
+# Application config is loaded on import of currencyexplorer package
+os.environ.setdefault("API_AUTHENTICATION_TOKEN", "tests")
@@ -0,0 +1,91 @@
+import asyncio
+import time
+from fastapi import FastAPI, Depends
+from httpx import AsyncClient, ASGITransport
+from app.dependencies import http_admission_control
+from app.utils.admission_control import AdmissionController, admission_controller
+from currencyexplorer.core.monitoring import EventLoopLagMonitor
+
+
+def test_loop_lag_monitor_measures_blocked_loop():
+    async def run():
+        monitor = EventLoopLagMonitor(interval=0.01)
+        monitor.start()
+        await asyncio.sleep(0.05)
+        idle_lag = monitor.lag
+        # Loop is blocked: current stall is reported before monitor task is woken up
+        time.sleep(0.2)
+        blocked_lag = monitor.lag
+        await monitor.stop()
+        return idle_lag, blocked_lag
+
+    idle_lag, blocked_lag = asyncio.run(run())
+    assert idle_lag < 0.1
+    assert blocked_lag > 0.15
+
+
+def test_controller_rejects_by_loop_lag_and_client_concurrency():
+    async def run():
+        monitor = EventLoopLagMonitor(interval=0.01)
+        controller = AdmissionController(monitor, lag_threshold=0.1, max_concurrent_per_client=2)
+        monitor.start()
+        await asyncio.sleep(0.05)
+        reasons = [controller.admit_request("a"), controller.admit_request("a"), controller.admit_request("a"),
+                   controller.admit_request("b")]
+        controller.release_request("a")
+        reasons.append(controller.admit_request("a"))
+        time.sleep(0.2)
+        reasons.append(controller.admit_request("c"))
+        reasons.append(controller.admit_websocket())
+        await monitor.stop()
+        return reasons
+
+    assert asyncio.run(run()) == [None, None, "client_concurrency", None, None, "loop_lag", "loop_lag"]
+
+
+class StubLoopLagMonitor:
+    lag = 0.0
+
+
+def make_app(request_started, request_allowed):
+    app = FastAPI()
+
+    @app.get("/rates", dependencies=[Depends(http_admission_control)])
+    async def rates():
+        request_started.set()
+        await request_allowed.wait()
+        return {}
+
+    return app
+
+
+def test_http_requests_are_rejected_with_503_under_loop_lag_and_429_over_client_limit(monkeypatch):
+    loop_lag_monitor = StubLoopLagMonitor()
+    monkeypatch.setattr(admission_controller, "loop_lag_monitor", loop_lag_monitor)
+    monkeypatch.setattr(admission_controller, "lag_threshold", 0.1)
+    monkeypatch.setattr(admission_controller, "max_concurrent_per_client", 1)
+
+    async def run():
+        request_started, request_allowed = asyncio.Event(), asyncio.Event()
+        transport = ASGITransport(app=make_app(request_started, request_allowed))
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            loop_lag_monitor.lag = 0.5
+            overloaded_response = await client.get("/rates")
+            loop_lag_monitor.lag = 0.0
+            first_request = asyncio.create_task(client.get("/rates", headers={"Authorization": "Bearer a"}))
+            await asyncio.wait_for(request_started.wait(), timeout=5)
+            # Same client has request in progress, other client is admitted
+            limited_response = await client.get("/rates", headers={"Authorization": "Bearer a"})
+            other_client_request = asyncio.create_task(
+                client.get("/rates", headers={"Authorization": "Bearer b"}))
+            await asyncio.sleep(0.05)
+            request_allowed.set()
+            first_response, other_client_response = await asyncio.gather(first_request, other_client_request)
+            # Slot is released after response
+            next_response = await client.get("/rates", headers={"Authorization": "Bearer a"})
+        return overloaded_response, limited_response, first_response, other_client_response, next_response
+
+    overloaded, limited, first, other_client, following = asyncio.run(run())
+    assert overloaded.status_code == 503 and overloaded.headers["retry-after"] == "1"
+    assert limited.status_code == 429
+    assert (first.status_code, other_client.status_code, following.status_code) == (200, 200, 200)
@@ -0,0 +1,25 @@
+import asyncio
+from currencyexplorer import config
+from app.scrapers.binance import BinanceExchangerCurrencyScraper
+from loadtest.stand_in_exchanges import BinanceStandInExchange
+
+
+def test_batch_without_symbol_index_skips_unknown_symbol(monkeypatch):
+    async def failed_symbol_index_fetch():
+        raise RuntimeError("exchangeInfo is not available")
+
+    async def run():
+        exchange = BinanceStandInExchange(3, tick_rate=0)
+        await exchange.start()
+        monkeypatch.setattr(config, "BINANCE_API_URL", exchange.api_url)
+        scraper = BinanceExchangerCurrencyScraper()
+        monkeypatch.setattr(scraper, "fetch_symbol_index", failed_symbol_index_fetch)
+        try:
+            data_list = await scraper.get_currencies(exchange.pair_titles[:2] + ["S99999_BTC"])
+        finally:
+            await (await scraper._get_binance_client()).close_connection()
+            await exchange.stop()
+        return exchange, data_list
+
+    exchange, data_list = asyncio.run(run())
+    assert sorted(data.currency_pair_title for data in data_list) == sorted(exchange.pair_titles[:2])
@@ -0,0 +1,96 @@
+import asyncio
+import pytest
+from currencyexplorer.core.exchangers_scraping import (
+    UpstreamCircuitBreaker, CircuitBreakerState, UpstreamUnavailableException, UpstreamRateLimitExceededException)
+from currencyexplorer.core.exchangers_scraping import circuit_breaker as circuit_breaker_module
+
+
+class ManualClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    manual_clock = ManualClock()
+    # Only circuit breaker module time is replaced (event loop keeps real clock)
+    monkeypatch.setattr(circuit_breaker_module, "time", manual_clock)
+    return manual_clock
+
+
+async def succeeded():
+    return "ok"
+
+
+async def failed():
+    raise ConnectionError("upstream connection reset")
+
+
+def call(breaker, request, **kwargs):
+    return asyncio.run(breaker.call(request, **kwargs))
+
+
+def test_circuit_opens_after_consecutive_failures_only(clock):
+    breaker = UpstreamCircuitBreaker("test", failure_threshold=3)
+    for request in (failed, failed, succeeded, failed, failed):
+        try:
+            call(breaker, request)
+        except ConnectionError:
+            pass
+    # Success resets failures counter
+    assert breaker.state == CircuitBreakerState.CLOSED
+
+    with pytest.raises(ConnectionError):
+        call(breaker, failed)
+    assert breaker.state == CircuitBreakerState.OPEN
+
+    requests_count = 0
+
+    async def counted():
+        nonlocal requests_count
+        requests_count += 1
+
+    with pytest.raises(UpstreamUnavailableException):
+        call(breaker, counted)
+    assert requests_count == 0
+
+
+def test_half_open_probe_closes_or_reopens_circuit(clock):
+    breaker = UpstreamCircuitBreaker("test", failure_threshold=1, open_duration=10)
+    with pytest.raises(ConnectionError):
+        call(breaker, failed)
+    clock.now += 10
+    assert breaker.state == CircuitBreakerState.HALF_OPEN
+
+    # Only one probe request is allowed
+    assert breaker.allow_request() is True
+    assert breaker.allow_request() is False
+    breaker.record_failure()
+    assert breaker.state == CircuitBreakerState.OPEN
+
+    clock.now += 10
+    assert call(breaker, succeeded) == "ok"
+    assert breaker.state == CircuitBreakerState.CLOSED
+
+
+def test_slow_response_is_failure_and_local_rate_limit_is_not(clock):
+    breaker = UpstreamCircuitBreaker("test", failure_threshold=2, latency_slo=1)
+
+    async def rate_limited():
+        raise UpstreamRateLimitExceededException()
+
+    async def slow():
+        clock.now += 2
+        return "late"
+
+    for _ in range(3):
+        with pytest.raises(UpstreamRateLimitExceededException):
+            call(breaker, rate_limited)
+    assert breaker.to_dict()["consecutive_failures"] == 0
+
+    assert call(breaker, slow) == "late"
+    assert call(breaker, slow) == "late"
+    assert breaker.state == CircuitBreakerState.OPEN
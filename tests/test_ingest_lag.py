@@ -0,0 +1,44 @@
+import asyncio
+import time
+from currencyexplorer.core.exchangers_scraping import ExchangersScrapingManager
+from currencyexplorer.core.monitoring import SCRAPER_INGEST_LAG_SECONDS
+from app.scrapers.binance import BinanceExchangerCurrencyScraper
+
+
+def ingest_lag_samples(exchange):
+    """ (count, sum) of ingestion lag histogram for exchange """
+    samples = {}
+    for line in SCRAPER_INGEST_LAG_SECONDS.collect():
+        name, value = line.rsplit(" ", 1)
+        samples[name] = float(value)
+    labels = '{{exchange="{}"}}'.format(exchange)
+    return (samples.get("currencyexplorer_scraper_ingest_lag_seconds_count" + labels, 0),
+            samples.get("currencyexplorer_scraper_ingest_lag_seconds_sum" + labels, 0))
+
+
+def test_binance_stream_event_time_is_parsed():
+    async def run():
+        scraper = BinanceExchangerCurrencyScraper()
+        return await scraper._ticker_response_to_data_list(
+            [{"s": "BTCUSDT", "a": "2", "b": "1", "E": 1700000000123}, {"s": "ETHUSDT", "a": "2", "b": "1"}],
+            message_title_mapping={"askPrice": "a", "bidPrice": "b", "symbol": "s"})
+
+    with_event_time, without_event_time = asyncio.run(run())
+    assert with_event_time.event_time == 1700000000.123
+    assert without_event_time.event_time is None
+
+
+def test_ingest_lag_is_observed_from_exchange_event_time():
+    event_time = time.time() - 2
+
+    async def run():
+        manager = ExchangersScrapingManager([])
+        await manager.store_ingested_batch([
+            ("lag_test", "BTC_USDT", 1.0, time.time(), event_time),
+            ("lag_test", "ETH_USDT", 1.0, time.time(), None)])
+
+    asyncio.run(run())
+    count, lag_sum = ingest_lag_samples("lag_test")
+    # Record without exchange event time is not observed, lag is not measured from parse time
+    assert count == 1
+    assert 2 <= lag_sum < 3
@@ -0,0 +1,81 @@
+import asyncio
+from currencyexplorer.core.exchangers_scraping import (
+    AbstractExchangerScraper, ExchangersScrapingManager, ScraperStorageBackendPairData)
+from currencyexplorer.core.exchangers_scraping.ingest_queue import ConflatingIngestQueue
+from currencyexplorer.core.monitoring import SCRAPER_INGEST_CONFLATED_TICKS, SCRAPER_INGEST_DROPPED_TICKS
+
+
+def tick(pair_title, rate):
+    return ScraperStorageBackendPairData("queue_test", pair_title, currency_rate=rate, last_update=1000.0)
+
+
+def test_pending_update_is_replaced_by_latest_one():
+    conflated_before = SCRAPER_INGEST_CONFLATED_TICKS.get(exchange="queue_test")
+    ingest_queue = ConflatingIngestQueue("queue_test", max_pairs=10)
+    ingest_queue.put([tick("BTC_USDT", 1.0), tick("ETH_USDT", 2.0)])
+    ingest_queue.put([tick("BTC_USDT", 3.0), tick("BTC_USDT", 4.0)])
+
+    assert len(ingest_queue) == 2
+    assert [(data.currency_pair_title, data.currency_rate) for data in ingest_queue.get_nowait()] == [
+        ("BTC_USDT", 4.0), ("ETH_USDT", 2.0)]
+    assert SCRAPER_INGEST_CONFLATED_TICKS.get(exchange="queue_test") - conflated_before == 2
+    assert ingest_queue.get_nowait() == []
+
+
+def test_oldest_pending_pair_is_dropped_when_full():
+    dropped_before = SCRAPER_INGEST_DROPPED_TICKS.get(exchange="queue_test")
+    ingest_queue = ConflatingIngestQueue("queue_test", max_pairs=3)
+    ingest_queue.put([tick("AAA_USDT", 1.0), tick("BBB_USDT", 1.0), tick("CCC_USDT", 1.0)])
+    # Update of pending pair is conflated, it does not move pair in drop order
+    ingest_queue.put([tick("AAA_USDT", 2.0), tick("DDD_USDT", 1.0), tick("EEE_USDT", 1.0)])
+
+    assert [data.currency_pair_title for data in ingest_queue.get_nowait()] == ["CCC_USDT", "DDD_USDT", "EEE_USDT"]
+    assert SCRAPER_INGEST_DROPPED_TICKS.get(exchange="queue_test") - dropped_before == 2
+
+
+def test_get_waits_for_pending_updates():
+    async def run():
+        ingest_queue = ConflatingIngestQueue("queue_test")
+        getter = asyncio.create_task(ingest_queue.get())
+        await asyncio.sleep(0)
+        assert not getter.done()
+        ingest_queue.put([tick("BTC_USDT", 1.0)])
+        return await asyncio.wait_for(getter, timeout=1)
+
+    assert [data.currency_rate for data in asyncio.run(run())] == [1.0]
+
+
+def test_closed_queue_returns_pending_updates_then_none():
+    async def run():
+        ingest_queue = ConflatingIngestQueue("queue_test")
+        ingest_queue.put([tick("BTC_USDT", 1.0)])
+        ingest_queue.close()
+        return await ingest_queue.get(), await ingest_queue.get()
+
+    pending, after_close = asyncio.run(run())
+    assert [data.currency_rate for data in pending] == [1.0]
+    assert after_close is None
+
+
+class FiniteListenerScraper(AbstractExchangerScraper, EXCHANGER_UNIQ_NAME="queue_test"):
+    async def get_currency(self, pair_title=None):
+        return []
+
+    async def attach_currency_listener(self, *args, **kwargs):
+        yield [tick("BTC_USDT", 1.0)]
+        # Store stage takes first batch and is storing it when listener finishes
+        await asyncio.sleep(0.01)
+        yield [tick("ETH_USDT", 2.0)]
+
+
+def test_updater_stores_batch_taken_by_store_stage_when_listener_finishes(monkeypatch):
+    manager = ExchangersScrapingManager([])
+    stored_pair_titles = []
+
+    async def slow_store_received_data(scraper, pair_data_list):
+        await asyncio.sleep(0.05)
+        stored_pair_titles.extend(data.currency_pair_title for data in pair_data_list)
+
+    monkeypatch.setattr(manager, "_store_received_data", slow_store_received_data)
+    asyncio.run(manager._updater_process(FiniteListenerScraper()))
+    assert stored_pair_titles == ["BTC_USDT", "ETH_USDT"]
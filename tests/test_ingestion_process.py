@@ -0,0 +1,51 @@
+import asyncio
+import time
+from typing import Optional
+from currencyexplorer.core.exchangers_scraping import (
+    AbstractExchangerScraper, ExchangersScrapingManager, CurrencyScraperAsyncSafeDictStorage,
+    ScraperStorageBackendPairData)
+from currencyexplorer.core.exchangers_scraping.ingestion_process import IngestionProcess
+
+
+class StaticRatesScraper(AbstractExchangerScraper, EXCHANGER_UNIQ_NAME="static", LISTNER_AUTO_START=True):
+    """ Scraper without upstream (module level class: ingestion process is started with spawn method) """
+
+    async def get_currency(self, pair_title: Optional[str] = None):
+        return [ScraperStorageBackendPairData(self.EXCHANGER_UNIQ_NAME, "BTC_USDT", currency_rate=100.0)]
+
+    async def attach_currency_listener(
+            self, *args, delay_seconds: Optional[float] = None, max_update_iteration: Optional[int] = None,
+            **kwargs):
+        self._worker_running_status = True
+        while not self._worker_stop_signal:
+            yield [ScraperStorageBackendPairData(self.EXCHANGER_UNIQ_NAME, "ETH_USDT", currency_rate=10.0)]
+            await asyncio.sleep(0.05)
+        self._worker_running_status = False
+
+
+def test_ingestion_process_sends_ready_batches_and_stopped():
+    async def run():
+        storage = CurrencyScraperAsyncSafeDictStorage()
+        manager = ExchangersScrapingManager([], storage_backend=storage)
+        ingestion_process = IngestionProcess(manager, [StaticRatesScraper], flush_interval=0.02)
+        ingestion_process.start(wait_ready_timeout=10, stop_timeout=5)
+        try:
+            scraper_status_mapping = await ingestion_process.wait_until_ready(timeout=30)
+            # Initial fetch is flushed before ready signal, listener ticks are sent by flusher
+            btc_data = await storage.get_pair_data("BTC_USDT", exchanger_uniq_name="static")
+            for _ in range(100):
+                eth_data = await storage.get_pair_data("ETH_USDT", exchanger_uniq_name="static")
+                if eth_data.currency_rate is not None:
+                    break
+                await asyncio.sleep(0.05)
+        finally:
+            stop_started_at = time.monotonic()
+            await ingestion_process.stop(timeout=10)
+        # Stop doesn't wait for timeout: stopped message is received after final flush
+        return scraper_status_mapping, btc_data, eth_data, time.monotonic() - stop_started_at
+
+    scraper_status_mapping, btc_data, eth_data, stop_seconds = asyncio.run(run())
+    assert scraper_status_mapping == {"static": True}
+    assert btc_data.currency_rate == 100.0
+    assert eth_data.currency_rate == 10.0
+    assert stop_seconds < 5
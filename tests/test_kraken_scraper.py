@@ -0,0 +1,24 @@
+import asyncio
+import pytest
+from currencyexplorer import config
+from currencyexplorer.core.exchangers_scraping import (
+    ExchangersScrapingManager, UpstreamRequestPriority, UpstreamUnavailableException)
+from app.scrapers.kraken import KrakenExchangerCurrencyScraper
+
+
+def test_unreachable_upstream_opens_circuit_breaker(monkeypatch):
+    # Nothing listens on discard port, each request fails by connection error
+    monkeypatch.setattr(config, "KRAKEN_API_URL", "http://127.0.0.1:9/0/public")
+
+    async def run():
+        manager = ExchangersScrapingManager(
+            [KrakenExchangerCurrencyScraper],
+            circuit_breaker_failure_threshold=3, circuit_breaker_open_duration=60)
+        for _ in range(5):
+            with pytest.raises(UpstreamUnavailableException):
+                await manager.update_from_scraper(
+                    "kraken", pair_title="BTC_USD", priority=UpstreamRequestPriority.USER)
+        return manager.get_circuit_breakers()
+
+    circuit_breakers = asyncio.run(run())
+    assert circuit_breakers["kraken"]["state"] == "open"
@@ -0,0 +1,30 @@
+import asyncio
+import threading
+import pytest
+from currencyexplorer import main
+from currencyexplorer.core.exchangers_scraping.tick_journal import TickJournalWriter
+
+
+def test_failed_initial_loading_stops_started_workers(monkeypatch, tmp_path):
+    async def no_op(*args, **kwargs):
+        return {}
+
+    async def failed_update_all():
+        raise RuntimeError("upstream is not available")
+
+    tick_journal = TickJournalWriter(str(tmp_path / "journal"))
+    monkeypatch.setattr(main, "tick_journal", tick_journal)
+    monkeypatch.setattr(main, "ingestion_process", None)
+    monkeypatch.setattr(main, "storage_snapshot_writer", None)
+    monkeypatch.setattr(main.scrapers_manager, "load_symbol_indexes", no_op)
+    monkeypatch.setattr(main.scrapers_manager, "run_active_updater", no_op)
+    monkeypatch.setattr(main.scrapers_manager, "wait_until_ready", no_op)
+    monkeypatch.setattr(main.scrapers_manager, "update_all", failed_update_all)
+
+    async def run():
+        async with main.aplication_flow_lifespan(main.app):
+            pass
+
+    with pytest.raises(RuntimeError, match="upstream is not available"):
+        asyncio.run(run())
+    assert "tick-journal-writer" not in [thread.name for thread in threading.enumerate()]
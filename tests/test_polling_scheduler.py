@@ -0,0 +1,93 @@
+import asyncio
+import types
+import pytest
+from currencyexplorer.core.exchangers_scraping import ExchangersScrapingManager
+from currencyexplorer.core.exchangers_scraping import polling_scheduler as polling_scheduler_module
+from currencyexplorer.core.exchangers_scraping.polling_scheduler import PairDemandTracker, AdaptivePollingScheduler
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    manual_clock = types.SimpleNamespace(now=1000.0)
+    manual_clock.monotonic = lambda: manual_clock.now
+    monkeypatch.setattr(polling_scheduler_module, "time", manual_clock)
+    return manual_clock
+
+
+def test_demand_is_decayed_and_merged_with_exchange_less_requests(clock):
+    tracker = PairDemandTracker(half_life=60)
+    for _ in range(4):
+        tracker.record("kraken", "BTC_USD")
+    tracker.record(None, "ETH_USD")
+    tracker.record("binance", "SOL_USDT", weight=2)
+    clock.now += 60
+    tracker.record("kraken", "ETH_USD")
+
+    assert tracker.get_demand("kraken") == pytest.approx({"BTC_USD": 2, "ETH_USD": 1.5})
+    assert tracker.hot_pairs("kraken") == ["BTC_USD", "ETH_USD"]
+    assert tracker.hot_pairs("binance", limit=1) == ["SOL_USDT"]
+
+
+def test_full_tracker_drops_new_pairs_until_tracked_ones_are_forgotten(clock):
+    tracker = PairDemandTracker(half_life=60, max_pairs=2)
+    tracker.record(None, "BTC_USD")
+    tracker.record(None, "ETH_USD")
+    for i in range(1000):
+        tracker.record(None, "X{}_USD".format(i))
+    assert len(tracker) == 2
+    assert set(tracker.get_demand("kraken")) == {"BTC_USD", "ETH_USD"}
+
+    # Forgotten pairs (score < min_score after ~7 half-lives) are pruned by record
+    clock.now += 60 * 7
+    tracker.record(None, "SOL_USD")
+    assert tracker.get_demand("kraken") == {"SOL_USD": 1}
+
+
+def test_manager_without_demand_consumer_does_not_record_demand():
+    manager = ExchangersScrapingManager([])
+    manager.record_pair_demand("kraken", "BTC_USD")
+    assert manager.pair_demand_tracker is None
+    assert ExchangersScrapingManager([], adaptive_polling=True).pair_demand_tracker is not None
+
+
+def test_polling_budget_is_split_proportionally_to_demand(clock):
+    tracker = PairDemandTracker(half_life=60)
+    for _ in range(3):
+        tracker.record("kraken", "BTC_USD")
+    tracker.record("kraken", "ETH_USD")
+    tracker.record("kraken", "XRP_USD", weight=0.01)
+    scheduler = AdaptivePollingScheduler(
+        types.SimpleNamespace(EXCHANGER_UNIQ_NAME="kraken"), tracker,
+        requests_per_minute=61, full_refresh_interval=60, poll_pairs=None, min_interval=0.5)
+
+    intervals = scheduler.calculate_pair_intervals()
+    # 60 targeted requests per minute: 3/4 for BTC_USD, 1/4 for ETH_USD,
+    #   XRP_USD interval would be longer than full refresh interval
+    assert intervals == pytest.approx({"BTC_USD": 60 / 45, "ETH_USD": 60 / 15}, rel=0.01)
+
+
+def test_poll_once_makes_full_refresh_and_batched_hot_pairs_polls():
+    tracker = PairDemandTracker(half_life=60)
+    for pair_title in ("BTC_USD", "ETH_USD", "SOL_USD"):
+        tracker.record("kraken", pair_title)
+    tracker.record("binance", "XRP_USDT")
+    polls = []
+
+    async def poll_pairs(scraper, pair_titles):
+        polls.append(pair_titles)
+        return 0
+
+    scheduler = AdaptivePollingScheduler(
+        types.SimpleNamespace(EXCHANGER_UNIQ_NAME="kraken"), tracker,
+        requests_per_minute=6000, full_refresh_interval=3600, poll_pairs=poll_pairs,
+        min_interval=60, max_pairs_per_request=2)
+
+    async def run():
+        await scheduler.poll_once()
+        # Nothing is due right after polls
+        await scheduler.poll_once()
+
+    asyncio.run(run())
+    assert polls[0] is None
+    assert sorted(pair_title for batch in polls[1:] for pair_title in batch) == ["BTC_USD", "ETH_USD", "SOL_USD"]
+    assert [len(batch) for batch in polls[1:]] == [2, 1]
@@ -0,0 +1,58 @@
+from currencyexplorer.core.exchangers_scraping import ScraperStorageBackendPairData
+from currencyexplorer.core.exchangers_scraping.rate_history import RateHistoryBuffers
+
+
+def store_ticks(history, ticks):
+    history.handle_stored_batch([
+        ScraperStorageBackendPairData("binance", "BTC_USDT", currency_rate=rate, last_update=timestamp)
+        for timestamp, rate in ticks])
+
+
+def candles_to_list(candles):
+    return list(zip(
+        candles.timestamps.tolist(), candles.open.tolist(), candles.high.tolist(),
+        candles.low.tolist(), candles.close.tolist(), candles.ticks_count.tolist()))
+
+
+def test_ticks_are_downsampled_to_ohlc_buckets():
+    history = RateHistoryBuffers(capacity=16)
+    store_ticks(history, [(100.0, 5.0), (101.0, 7.0), (105.0, 3.0), (109.0, 4.0), (110.0, 6.0), (125.0, 8.0)])
+
+    candles = history.get_candles("binance", "BTC_USDT", resolution=10)
+    assert candles_to_list(candles) == [
+        (100.0, 5.0, 7.0, 3.0, 4.0, 4), (110.0, 6.0, 6.0, 6.0, 6.0, 1), (120.0, 8.0, 8.0, 8.0, 8.0, 1)]
+    # Range is applied to ticks (until is exclusive)
+    candles = history.get_candles("binance", "BTC_USDT", resolution=10, since=101, until=110)
+    assert candles_to_list(candles) == [(100.0, 7.0, 7.0, 3.0, 4.0, 3)]
+    assert history.get_candles("binance", "ETH_USDT", resolution=10) is None
+
+
+def test_only_latest_ticks_are_kept_after_ring_wrap_around():
+    history = RateHistoryBuffers(capacity=4)
+    store_ticks(history, [(100.0 + i, float(i)) for i in range(7)])
+
+    candles = history.get_candles("binance", "BTC_USDT", resolution=2)
+    # Ticks 0-2 are overwritten, buckets are built from oldest to newest of remaining ticks
+    assert candles_to_list(candles) == [(102.0, 3.0, 3.0, 3.0, 3.0, 1), (104.0, 4.0, 5.0, 4.0, 5.0, 2),
+                                        (106.0, 6.0, 6.0, 6.0, 6.0, 1)]
+
+
+def test_unordered_ticks_are_sorted_before_bucketing():
+    history = RateHistoryBuffers(capacity=3)
+    # Late tick (received after newer one) and wrap-around: ring holds 112, 103, 111
+    store_ticks(history, [(100.0, 1.0), (112.0, 9.0), (103.0, 2.0), (111.0, 5.0)])
+
+    candles = history.get_candles("binance", "BTC_USDT", resolution=10)
+    # Each bucket boundary of reduceat is taken from sorted timestamps
+    assert candles_to_list(candles) == [(100.0, 2.0, 2.0, 2.0, 2.0, 1), (110.0, 5.0, 9.0, 5.0, 9.0, 2)]
+
+
+def test_new_pairs_over_series_limit_are_not_tracked():
+    history = RateHistoryBuffers(capacity=4, max_series=1)
+    store_ticks(history, [(100.0, 1.0)])
+    history.handle_stored_batch([
+        ScraperStorageBackendPairData("kraken", "BTC_USD", currency_rate=1.0, last_update=100.0)])
+
+    assert history.series_count == 1
+    assert history.get_exchanges("BTC_USDT") == ["binance"]
+    assert history.get_exchanges("BTC_USD") == []
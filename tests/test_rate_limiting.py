@@ -0,0 +1,89 @@
+import asyncio
+import types
+import pytest
+from currencyexplorer.core.exchangers_scraping import (
+    UpstreamRateLimitGovernor, UpstreamRequestPriority, upstream_request_priority, rate_limiting)
+from currencyexplorer.core.exchangers_scraping.exceptions import UpstreamRateLimitExceededException
+
+
+class ManualClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        """ Waiting moves clock forward (other tasks still get control) """
+        self.now += seconds
+        await asyncio.sleep(0)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = ManualClock()
+    monkeypatch.setattr(rate_limiting, "time", clock)
+    monkeypatch.setattr(rate_limiting, "asyncio", types.SimpleNamespace(sleep=clock.sleep))
+    return clock
+
+
+def test_weighted_acquire_and_refill(clock):
+    governor = UpstreamRateLimitGovernor("test", capacity=10, refill_per_second=2)
+
+    asyncio.run(governor.acquire(4, priority=UpstreamRequestPriority.USER))
+    assert governor.remaining == 6
+    clock.now += 1
+    assert governor.remaining == 8
+    clock.now += 100
+    assert governor.remaining == 10
+
+
+def test_request_waits_for_refill_and_is_dropped_when_budget_exhausted(clock):
+    governor = UpstreamRateLimitGovernor("test", capacity=10, refill_per_second=1, user_max_wait=3)
+
+    async def run():
+        await governor.acquire(10, priority=UpstreamRequestPriority.USER)
+        started_at = clock.now
+        await governor.acquire(2, priority=UpstreamRequestPriority.USER)
+        waited = clock.now - started_at
+        # 5 tokens can't be refilled in 3 seconds
+        with pytest.raises(UpstreamRateLimitExceededException):
+            await governor.acquire(5, priority=UpstreamRequestPriority.USER)
+        return waited
+
+    assert asyncio.run(run()) == pytest.approx(2)
+
+
+def test_background_request_keeps_reserve_and_priority_is_taken_from_context(clock):
+    governor = UpstreamRateLimitGovernor(
+        "test", capacity=10, refill_per_second=1, background_reserve=0.2, background_max_wait=0.5)
+
+    async def run():
+        # Background requests can't take last 2 tokens (reserve of user requests)
+        await governor.acquire(8, priority=UpstreamRequestPriority.BACKGROUND)
+        with pytest.raises(UpstreamRateLimitExceededException):
+            await governor.acquire(1, priority=UpstreamRequestPriority.BACKGROUND)
+        with upstream_request_priority(UpstreamRequestPriority.USER):
+            await governor.acquire(2)
+
+    asyncio.run(run())
+    assert governor.remaining == 0
+
+
+def test_background_request_yields_to_waiting_user_request(clock):
+    governor = UpstreamRateLimitGovernor(
+        "test", capacity=10, refill_per_second=1, background_reserve=0.2, background_max_wait=10)
+    acquired_order = []
+
+    async def acquire(weight, priority):
+        await governor.acquire(weight, priority=priority)
+        acquired_order.append(priority)
+
+    async def run():
+        await governor.acquire(10, priority=UpstreamRequestPriority.USER)
+        # Background request needs fewer tokens, but doesn't take them while user request is waiting
+        await asyncio.gather(
+            acquire(4, UpstreamRequestPriority.USER), acquire(1, UpstreamRequestPriority.BACKGROUND))
+
+    asyncio.run(run())
+    assert acquired_order == [UpstreamRequestPriority.USER, UpstreamRequestPriority.BACKGROUND]
@@ -0,0 +1,80 @@
+import asyncio
+import time
+import pytest
+from currencyexplorer.core.exchangers_scraping import (
+    CurrencyScraperAsyncSafeDictStorage, CurrencyScraperSnapshotStorage, ScraperStorageBackendPairData)
+
+
+def filtered_by_scan(stored_data, base_asset=None, quote_asset=None):
+    """ Assets filter by full scan of storage data (reference for assets index) """
+    response = {}
+    for exchanger_name, exchanger_data in stored_data.items():
+        for pair_title, pair_data in exchanger_data.items():
+            pair_base_asset, pair_quote_asset = pair_title.split("_")
+            if (base_asset is None or pair_base_asset == base_asset) and (
+                    quote_asset is None or pair_quote_asset == quote_asset):
+                response.setdefault(exchanger_name, {})[pair_title] = pair_data
+    return response
+
+
+def test_published_snapshot_is_not_changed_by_next_store():
+    async def run():
+        storage = CurrencyScraperSnapshotStorage()
+        await storage.store_pair_data_list([
+            ScraperStorageBackendPairData("binance", "BTC_USDT", currency_rate=1.0),
+            ScraperStorageBackendPairData("kraken", "BTC_USD", currency_rate=2.0)])
+        reader_snapshot = await storage.get_all()
+        reader_generation = storage.snapshot_generation
+        await storage.store_pair_data_list([
+            ScraperStorageBackendPairData("binance", "BTC_USDT", currency_rate=3.0),
+            ScraperStorageBackendPairData("binance", "ETH_USDT", currency_rate=4.0)])
+        return storage, reader_snapshot, reader_generation, await storage.get_all()
+
+    storage, reader_snapshot, reader_generation, current_snapshot = asyncio.run(run())
+    assert storage.snapshot_generation == reader_generation + 1
+    assert reader_snapshot["binance"]["BTC_USDT"].currency_rate == 1.0
+    assert "ETH_USDT" not in reader_snapshot["binance"]
+    assert current_snapshot["binance"]["BTC_USDT"].currency_rate == 3.0
+    # Only changed exchange dict is copied, unchanged one is shared by both snapshots
+    assert current_snapshot["binance"] is not reader_snapshot["binance"]
+    assert current_snapshot["kraken"] is reader_snapshot["kraken"]
+
+
+def test_empty_batch_does_not_publish_snapshot():
+    async def run():
+        storage = CurrencyScraperSnapshotStorage()
+        await storage.store_pair_data_list([])
+        return storage.snapshot_generation
+
+    assert asyncio.run(run()) == 0
+
+
+@pytest.mark.parametrize("storage_class", [CurrencyScraperAsyncSafeDictStorage, CurrencyScraperSnapshotStorage])
+def test_assets_index_matches_stored_data_after_expiry_and_eviction(storage_class):
+    now = time.time()
+    kwargs = {"cleanup_interval": 0} if storage_class is CurrencyScraperSnapshotStorage else {}
+
+    async def run():
+        storage = storage_class(stored_data_lifetime=60, max_stored_pairs=6, access_half_life=3600, **kwargs)
+        await storage.store_pair_data_list([
+            ScraperStorageBackendPairData("binance", "BTC_USDT", currency_rate=1.0, last_update=now),
+            ScraperStorageBackendPairData("kraken", "BTC_USDT", currency_rate=1.0, last_update=now - 120),
+            ScraperStorageBackendPairData("binance", "ETH_USDT", currency_rate=1.0, last_update=now),
+            ScraperStorageBackendPairData("binance", "ETH_BTC", currency_rate=1.0, last_update=now - 120)])
+        await storage.get_all(only_for_pair_title="BTC_USDT")
+        # New exchange batch over budget: never requested pairs are evicted
+        await storage.store_pair_data_list([
+            ScraperStorageBackendPairData("kucoin", "{}_USDT".format(asset), currency_rate=1.0, last_update=now)
+            for asset in ("SOL", "XRP", "ADA", "DOT", "BTC")])
+        stored_data = await storage.get_all()
+        queries = [("BTC", None), (None, "USDT"), ("ETH", None), (None, "BTC"), ("SOL", "USDT")]
+        return stored_data, [
+            (await storage.get_all(base_asset=base_asset, quote_asset=quote_asset), base_asset, quote_asset)
+            for base_asset, quote_asset in queries]
+
+    stored_data, indexed_responses = asyncio.run(run())
+    assert "BTC_USDT" not in stored_data.get("kraken", {})
+    assert "ETH_BTC" not in stored_data["binance"]
+    assert stored_data["binance"]["BTC_USDT"].currency_rate == 1.0
+    for indexed_response, base_asset, quote_asset in indexed_responses:
+        assert indexed_response == filtered_by_scan(stored_data, base_asset, quote_asset)
@@ -0,0 +1,98 @@
+import asyncio
+import types
+import pytest
+from currencyexplorer.core.exchangers_scraping import (
+    CurrencyScraperAsyncSafeDictStorage, CurrencyScraperSnapshotStorage, ScraperStorageBackendPairData,
+    PairAccessFrequencyEviction)
+from currencyexplorer.core.exchangers_scraping import storage_eviction as storage_eviction_module
+from currencyexplorer.core.monitoring import STORAGE_EVICTED_PAIRS
+
+
+def market_frame(pairs_count, last_update):
+    """ All-market listener frame: one tick of each of `pairs_count` pairs """
+    return [
+        ScraperStorageBackendPairData("binance", "{}_USDT".format(chr(65 + i // 26) + chr(65 + i % 26)),
+                                      currency_rate=1.0, last_update=last_update)
+        for i in range(pairs_count)]
+
+
+@pytest.mark.parametrize("storage_class", [CurrencyScraperAsyncSafeDictStorage, CurrencyScraperSnapshotStorage])
+def test_full_market_feed_reaches_steady_state_over_budget(storage_class):
+    requested_pairs = ["AA_USDT", "KZ_USDT", "ZZ_USDT"]
+
+    async def run():
+        storage = storage_class(max_stored_pairs=100, access_half_life=3600)
+        for pair_title in requested_pairs:
+            await storage.get_all(only_for_pair_title=pair_title)
+        evicted_per_frame = []
+        for frame_index in range(20):
+            evicted_before = STORAGE_EVICTED_PAIRS.get()
+            await storage.store_pair_data_list(market_frame(676, last_update=1000.0 + frame_index))
+            evicted_per_frame.append(STORAGE_EVICTED_PAIRS.get() - evicted_before)
+            for pair_title in requested_pairs:
+                await storage.get_all(only_for_pair_title=pair_title)
+        return storage, evicted_per_frame, await storage.get_all()
+
+    storage, evicted_per_frame, stored_data = asyncio.run(run())
+    assert storage.stored_pairs_count <= 100
+    # Budget is reached by first frame, later frames only update admitted pairs (no churn)
+    assert evicted_per_frame[0] > 0
+    assert evicted_per_frame[1:] == [0] * 19
+    for pair_title in requested_pairs:
+        assert pair_title in stored_data["binance"]
+    assert stored_data["binance"]["AA_USDT"].last_update == 1019.0
+
+
+def test_requested_missing_pair_is_admitted_to_full_storage():
+    async def run():
+        storage = CurrencyScraperSnapshotStorage(max_stored_pairs=100, access_half_life=3600)
+        await storage.store_pair_data_list(market_frame(676, last_update=1000.0))
+        # First pairs (by title) are evicted among never requested pairs with same last_update
+        cold_pair_data = market_frame(1, last_update=1001.0)[0]
+        await storage.store_pair_data_list([cold_pair_data])
+        rejected_before_request = await storage.get_all(only_for_pair_title=cold_pair_data.currency_pair_title)
+        # Refetch after user request
+        await storage.store_pair_data_list([cold_pair_data])
+        return rejected_before_request, await storage.get_all(only_for_pair_title=cold_pair_data.currency_pair_title)
+
+    rejected_before_request, stored_after_request = asyncio.run(run())
+    assert rejected_before_request == {}
+    assert "binance" in stored_after_request
+
+
+def test_least_requested_then_oldest_updated_pairs_are_evicted():
+    eviction = PairAccessFrequencyEviction(max_pairs=4, eviction_batch_ratio=0.25)
+    for pair_title in ("AAA_USDT", "AAA_USDT", "BBB_USDT", "CCC_USDT"):
+        eviction.record_access(pair_title)
+    stored_data = {
+        "binance": {
+            pair_title: ScraperStorageBackendPairData("binance", pair_title, currency_rate=1.0, last_update=last_update)
+            for pair_title, last_update in (
+                ("AAA_USDT", 1.0), ("BBB_USDT", 5.0), ("CCC_USDT", 2.0), ("DDD_USDT", 9.0), ("EEE_USDT", 8.0))}}
+
+    assert eviction.select_evicted(stored_data, stored_pairs_count=4) == []
+    # Evicted down to max_pairs * (1 - eviction_batch_ratio) records by one selection
+    assert eviction.select_evicted(stored_data, stored_pairs_count=5) == [
+        ("binance", "EEE_USDT"), ("binance", "DDD_USDT")]
+    assert eviction.admission_threshold == 0
+
+
+def test_access_counts_are_halved_every_half_life(monkeypatch):
+    clock = types.SimpleNamespace(now=1000.0)
+    clock.monotonic = lambda: clock.now
+    monkeypatch.setattr(storage_eviction_module, "time", clock)
+    eviction = PairAccessFrequencyEviction(max_pairs=10, half_life=60)
+    for _ in range(4):
+        eviction.record_access("BTC_USDT")
+    eviction.record_access("ETH_USDT")
+
+    clock.now += 30
+    eviction.record_access("SOL_USDT")
+    assert eviction.access_count("BTC_USDT") == 4
+
+    for _ in range(4):
+        clock.now += 60
+        eviction.record_access("SOL_USDT")
+    assert eviction.access_count("BTC_USDT") == 0.25
+    # Pair without requests for several half-lives is forgotten
+    assert eviction.access_count("ETH_USDT") == 0
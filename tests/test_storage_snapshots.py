@@ -0,0 +1,28 @@
+import asyncio
+import time
+from currencyexplorer.core.exchangers_scraping import (
+    CurrencyScraperAsyncSafeDictStorage, ScraperStorageBackendPairData, StorageSnapshotWriter)
+
+
+def test_snapshot_round_trip_skips_records_older_than_max_age(tmp_path):
+    snapshot_path = str(tmp_path / "storage.snapshot")
+    now = time.time()
+
+    async def run():
+        source = CurrencyScraperAsyncSafeDictStorage()
+        await source.store_pair_data_list([
+            ScraperStorageBackendPairData("binance", "BTC_USDT", currency_rate=65000.5, last_update=now),
+            ScraperStorageBackendPairData("kraken", "BTC_USDT", currency_rate=None, last_update=now - 5),
+            ScraperStorageBackendPairData("kraken", "ETH_USDT", currency_rate=3000.0, last_update=now - 600)])
+        await StorageSnapshotWriter(source, snapshot_path).write_snapshot()
+
+        target = CurrencyScraperAsyncSafeDictStorage()
+        loaded_count = await StorageSnapshotWriter(target, snapshot_path, max_record_age=60).load_snapshot()
+        return loaded_count, await target.get_all()
+
+    loaded_count, stored_data = asyncio.run(run())
+    assert loaded_count == 2
+    assert stored_data["binance"]["BTC_USDT"].currency_rate == 65000.5
+    assert stored_data["binance"]["BTC_USDT"].last_update == now
+    assert stored_data["kraken"]["BTC_USDT"].currency_rate is None
+    assert "ETH_USDT" not in stored_data["kraken"]
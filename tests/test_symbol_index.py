@@ -0,0 +1,82 @@
+import asyncio
+import pytest
+from currencyexplorer import config
+from currencyexplorer.core.exchangers_scraping import ExchangeSymbolIndex
+from app.scrapers.binance import BinanceExchangerCurrencyScraper
+from app.scrapers.kraken import KrakenExchangerCurrencyScraper
+from loadtest.stand_in_exchanges import BinanceStandInExchange, KrakenStandInExchange
+
+
+def use_markets(exchange, markets):
+    """ Replace generated markets of stand-in exchange: {native_symbol: (base_asset, quote_asset, price)} """
+    exchange.markets = [(native_symbol, base, quote) for native_symbol, (base, quote, _) in markets.items()]
+    exchange.prices = {native_symbol: price for native_symbol, (_, _, price) in markets.items()}
+
+
+def test_index_maps_native_symbols_and_pair_orientation(tmp_path):
+    symbol_index = ExchangeSymbolIndex("test", markets=[("BTCUSDT", "BTC", "USDT"), ("DOGEBTC", "DOGE", "BTC")])
+
+    assert symbol_index.pair_title_for("DOGEBTC") == "DOGE_BTC"
+    assert symbol_index.pair_title_for("ETHUSDT") is None
+    assert symbol_index.native_symbol_for("BTC_USDT") == ("BTCUSDT", False)
+    assert symbol_index.native_symbol_for("USDT_BTC") == ("BTCUSDT", True)
+    assert symbol_index.native_symbol_for("ETH_USDT") is None
+    assert len(symbol_index) == 2 and "DOGEBTC" in symbol_index
+
+    index_path = str(tmp_path / "test.symbols.json")
+    symbol_index.save(index_path)
+    loaded_index = ExchangeSymbolIndex.load(index_path)
+    assert loaded_index.exchanger_uniq_name == "test"
+    assert loaded_index.native_symbol_for("USDT_BTC") == ("BTCUSDT", True)
+    assert ExchangeSymbolIndex.load(index_path, max_age=-1) is None
+    assert ExchangeSymbolIndex.load(str(tmp_path / "missing.json")) is None
+
+
+def test_binance_index_is_made_from_exchange_info(monkeypatch):
+    async def run():
+        exchange = BinanceStandInExchange(0, tick_rate=0)
+        use_markets(exchange, {"BTCUSDT": ("BTC", "USDT", 50000.0), "DOGEBTC": ("DOGE", "BTC", 0.000002)})
+        await exchange.start()
+        monkeypatch.setattr(config, "BINANCE_API_URL", exchange.api_url)
+        scraper = BinanceExchangerCurrencyScraper()
+        try:
+            symbol_index = await scraper.load_symbol_index()
+            data_list = await scraper.get_currency()
+        finally:
+            await (await scraper._get_binance_client()).close_connection()
+            await exchange.stop()
+        return symbol_index, data_list
+
+    symbol_index, data_list = asyncio.run(run())
+    assert symbol_index.native_symbol_for("USDT_BTC") == ("BTCUSDT", True)
+    # Symbols are not sliced by 3 letters when index is loaded
+    assert sorted(data.currency_pair_title for data in data_list) == ["BTC_USDT", "DOGE_BTC"]
+
+
+def test_kraken_index_aliases_assets_and_maps_native_pairs(monkeypatch):
+    async def run():
+        exchange = KrakenStandInExchange(0, tick_rate=0)
+        use_markets(exchange, {
+            "XXBTZUSD": ("XBT", "USD", 50000.0), "XDGUSD": ("XDG", "USD", 0.1), "XETHXXBT": ("ETH", "XBT", 0.05)})
+        await exchange.start()
+        monkeypatch.setattr(config, "KRAKEN_API_URL", exchange.api_url)
+        scraper = KrakenExchangerCurrencyScraper()
+        try:
+            symbol_index = await scraper.load_symbol_index()
+            direct_data = await scraper.get_currency(pair_title="BTC_USD")
+            reversed_data = await scraper.get_currency(pair_title="USD_BTC")
+            missing_data = await scraper.get_currency(pair_title="BTC_EUR")
+        finally:
+            await exchange.stop()
+        return symbol_index, direct_data, reversed_data, missing_data
+
+    symbol_index, direct_data, reversed_data, missing_data = asyncio.run(run())
+    # XBT/XDG asset codes are mapped to common BTC/DOGE titles
+    assert symbol_index.pair_title_for("XXBTZUSD") == "BTC_USD"
+    assert symbol_index.pair_title_for("XDGUSD") == "DOGE_USD"
+    assert symbol_index.pair_title_for("XETHXXBT") == "ETH_BTC"
+    assert symbol_index.native_symbol_for("BTC_ETH") == ("XETHXXBT", True)
+    assert [(data.currency_pair_title, data.currency_rate) for data in direct_data] == [("BTC_USD", 50000.0)]
+    assert [data.currency_pair_title for data in reversed_data] == ["USD_BTC"]
+    assert reversed_data[0].currency_rate == pytest.approx(1 / 50000.0)
+    assert missing_data == []
@@ -0,0 +1,73 @@
+import asyncio
+import os
+import time
+import numpy as np
+from currencyexplorer.core.exchangers_scraping import ScraperStorageBackendPairData
+from currencyexplorer.core.exchangers_scraping.tick_journal import (
+    TickJournalWriter, TickJournalReader, TICK_JOURNAL_RECORD_DTYPE, list_tick_journal_segments)
+
+
+def write_ticks(journal_path, batches, **writer_kwargs):
+    """ Write each batch of (exchange, pair, rate, timestamp) by separate writer call and stop writer """
+    async def run():
+        writer = TickJournalWriter(journal_path, **writer_kwargs)
+        writer.start()
+        for batch in batches:
+            writer.handle_stored_batch([
+                ScraperStorageBackendPairData(exchange, pair_title, currency_rate=rate, last_update=timestamp)
+                for exchange, pair_title, rate, timestamp in batch])
+            # Let writer thread take batch, so batches are not merged into one write
+            await asyncio.sleep(0.05)
+        await writer.stop()
+
+    asyncio.run(run())
+
+
+def test_segments_are_rotated_by_size_and_read_across_segments(tmp_path):
+    journal_path = str(tmp_path)
+    record_size = TICK_JOURNAL_RECORD_DTYPE.itemsize
+    write_ticks(journal_path, [
+        [("binance", "BTC_USDT", 100.0 + i, 1000.0 + i), ("kraken", "BTC_USD", 50.0, 1000.5 + i)]
+        for i in range(5)], segment_max_bytes=4 * record_size, retention=None)
+
+    segments = list_tick_journal_segments(journal_path)
+    assert len(segments) == 3
+    assert all(segment.last_timestamp is not None for segment in segments)
+    assert [segment.first_timestamp for segment in segments] == [1000.0, 1002.0, 1004.0]
+
+    reader = TickJournalReader(journal_path)
+    ticks = reader.read_ticks("binance", "BTC_USDT", since=1001, until=1004)
+    assert ticks.timestamps.tolist() == [1001.0, 1002.0, 1003.0]
+    assert ticks.rates.tolist() == [101.0, 102.0, 103.0]
+    # Segments outside of window are not scanned
+    assert len(reader.get_segments(since=1004.2)) == 1
+
+
+def test_rotation_removes_segments_older_than_retention(tmp_path):
+    journal_path = str(tmp_path)
+    recent_timestamp = float(int(time.time()))
+    write_ticks(journal_path, [
+        [("binance", "BTC_USDT", 100.0, timestamp)] for timestamp in (1000.0, 1001.0, recent_timestamp)],
+        segment_max_bytes=TICK_JOURNAL_RECORD_DTYPE.itemsize, retention=3600)
+
+    # Segment is rotated after each record, each rotation removes expired segments
+    assert [segment.first_timestamp for segment in list_tick_journal_segments(journal_path)] == [recent_timestamp]
+
+
+def test_active_segment_left_by_crash_is_recovered(tmp_path):
+    journal_path = str(tmp_path)
+    with open(os.path.join(journal_path, "symbols.txt"), "w") as f:
+        f.write("binance\tBTC_USDT\nkraken\tETH_")
+    records = np.array([(1000.0, 0, 10.0), (1001.0, 0, 11.0)], dtype=TICK_JOURNAL_RECORD_DTYPE)
+    with open(os.path.join(journal_path, "ticks-1000000.active"), "wb") as f:
+        # Last record is not fully written
+        f.write(records.tobytes() + b"\x00" * 7)
+
+    write_ticks(journal_path, [[("kraken", "ETH_USD", 20.0, 1002.0)]])
+
+    assert [(segment.first_timestamp, segment.last_timestamp)
+            for segment in list_tick_journal_segments(journal_path)] == [(1000.0, 1001.0), (1002.0, 1002.0)]
+    reader = TickJournalReader(journal_path)
+    assert reader.get_symbols() == [("binance", "BTC_USDT"), ("kraken", "ETH_USD")]
+    assert reader.read_ticks("binance", "BTC_USDT").rates.tolist() == [10.0, 11.0]
+    assert reader.read_ticks("kraken", "ETH_USD").rates.tolist() == [20.0]
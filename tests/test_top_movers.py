@@ -0,0 +1,53 @@
+import pytest
+from currencyexplorer.core.exchangers_scraping import ScraperStorageBackendPairData
+from currencyexplorer.core.exchangers_scraping.top_movers import TopMoversLeaderboard
+
+
+def store_ticks(leaderboard, timestamp, rates):
+    leaderboard.handle_stored_batch([
+        ScraperStorageBackendPairData("binance", pair_title, currency_rate=rate, last_update=timestamp)
+        for pair_title, rate in rates.items()])
+
+
+def top_changes(leaderboard, now, limit=10):
+    return [(mover.pair_title, round(mover.change, 6)) for mover in leaderboard.top("1m", limit=limit, now=now)]
+
+
+def test_ranking_is_updated_by_each_tick():
+    leaderboard = TopMoversLeaderboard(windows={"1m": 60})
+    store_ticks(leaderboard, 1000.0, {"BTC_USDT": 100.0, "ETH_USDT": 10.0, "SOL_USDT": 1.0})
+    store_ticks(leaderboard, 1010.0, {"BTC_USDT": 101.0, "ETH_USDT": 11.0, "SOL_USDT": 0.95})
+
+    # Sorted by absolute change
+    assert top_changes(leaderboard, now=1010) == [("ETH_USDT", 0.1), ("SOL_USDT", -0.05), ("BTC_USDT", 0.01)]
+
+    store_ticks(leaderboard, 1020.0, {"BTC_USDT": 120.0})
+    assert top_changes(leaderboard, now=1020, limit=2) == [("BTC_USDT", 0.2), ("ETH_USDT", 0.1)]
+    # Outdated tick doesn't change ranking
+    store_ticks(leaderboard, 1015.0, {"BTC_USDT": 100.0})
+    assert top_changes(leaderboard, now=1020, limit=1) == [("BTC_USDT", 0.2)]
+    mover = leaderboard.top("1m", limit=1, now=1020)[0]
+    assert (mover.open_rate, mover.currency_rate, mover.last_update) == (100.0, 120.0, 1020.0)
+
+
+def test_pairs_without_ticks_in_window_are_removed_until_next_tick():
+    leaderboard = TopMoversLeaderboard(windows={"1m": 60})
+    store_ticks(leaderboard, 1000.0, {"AAA_USDT": 100.0, "BBB_USDT": 100.0})
+    store_ticks(leaderboard, 1005.0, {"BBB_USDT": 150.0})
+    store_ticks(leaderboard, 1030.0, {"AAA_USDT": 110.0})
+
+    assert top_changes(leaderboard, now=1030) == [("BBB_USDT", 0.5), ("AAA_USDT", 0.1)]
+    # Last BBB tick is older than window start (1010): pair is skipped and removed from ranking
+    assert top_changes(leaderboard, now=1070) == [("AAA_USDT", 0.1)]
+    assert top_changes(leaderboard, now=1070) == [("AAA_USDT", 0.1)]
+
+    # New tick returns pair to ranking, open rate is last sample at or before window start
+    store_ticks(leaderboard, 1080.0, {"BBB_USDT": 300.0})
+    assert top_changes(leaderboard, now=1080) == [("BBB_USDT", 1.0), ("AAA_USDT", 0.1)]
+    assert leaderboard.pairs_count == 2
+
+
+def test_unknown_window_is_rejected():
+    leaderboard = TopMoversLeaderboard(windows={"1m": 60})
+    with pytest.raises(ValueError):
+        leaderboard.top("5m")